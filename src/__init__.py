@@ -1,8 +1,34 @@
 import bpy
 from bpy.props import PointerProperty
+from .utils import profiler, tree_index, auto_sync, layer_summary, render_stats, resume, staging
 from .operators.connect_viewlayers_to_output import COMPOSITOR_OT_connect_viewlayers_to_output
 from .operators.additional_operators import COMPOSITOR_OT_setup_nodes, COMPOSITOR_OT_clear_viewlayer_outputs
-from .panels.viewlayer_connector_panel import COMPOSITOR_PT_viewlayer_connector, ViewLayerConnectorSettings
+from .panels.viewlayer_connector_panel import (
+    COMPOSITOR_PT_viewlayer_connector,
+    ViewLayerConnectorSettings,
+    PassRoutingRule,
+    OutputBucketSettings,
+    COMPOSITOR_UL_routing_rules,
+    COMPOSITOR_UL_output_buckets,
+    COMPOSITOR_UL_layer_status
+)
+from .operators.output_operators import (
+    COMPOSITOR_OT_estimate_output_size,
+    COMPOSITOR_OT_render_missing_frames,
+    COMPOSITOR_OT_export_output_manifest,
+    COMPOSITOR_OT_verify_outputs
+)
+from .operators.preview_operators import (
+    COMPOSITOR_OT_preview_connection,
+    COMPOSITOR_OT_export_connection_preview
+)
+from .operators.routing_operators import (
+    COMPOSITOR_OT_routing_rule_add,
+    COMPOSITOR_OT_routing_rule_remove,
+    COMPOSITOR_OT_output_bucket_add,
+    COMPOSITOR_OT_output_bucket_remove,
+    COMPOSITOR_OT_routing_reset_defaults
+)
 from .operators.organizational_operators import (
     COMPOSITOR_OT_organize_nodes, 
     COMPOSITOR_OT_group_viewlayer_nodes, 
@@ -21,6 +47,8 @@ bl_info = {
 }
 
 classes = (
+    PassRoutingRule,
+    OutputBucketSettings,
     ViewLayerConnectorSettings,
     COMPOSITOR_OT_connect_viewlayers_to_output,
     COMPOSITOR_OT_setup_nodes,
@@ -29,6 +57,20 @@ classes = (
     COMPOSITOR_OT_group_viewlayer_nodes, 
     COMPOSITOR_OT_connect_sorted_viewlayers,
     COMPOSITOR_OT_group_by_prefix_in_frames,
+    COMPOSITOR_OT_routing_rule_add,
+    COMPOSITOR_OT_routing_rule_remove,
+    COMPOSITOR_OT_output_bucket_add,
+    COMPOSITOR_OT_output_bucket_remove,
+    COMPOSITOR_OT_routing_reset_defaults,
+    COMPOSITOR_OT_estimate_output_size,
+    COMPOSITOR_OT_render_missing_frames,
+    COMPOSITOR_OT_export_output_manifest,
+    COMPOSITOR_OT_verify_outputs,
+    COMPOSITOR_OT_preview_connection,
+    COMPOSITOR_OT_export_connection_preview,
+    COMPOSITOR_UL_routing_rules,
+    COMPOSITOR_UL_output_buckets,
+    COMPOSITOR_UL_layer_status,
     COMPOSITOR_PT_viewlayer_connector,
 )
 
@@ -36,8 +78,21 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.viewlayer_connector_settings = PointerProperty(type=ViewLayerConnectorSettings)
+    profiler.configure_logging()
+    tree_index.register()
+    layer_summary.register()
+    render_stats.register()
+    resume.register()
+    staging.register()
+    auto_sync.register()
 
 def unregister():
+    auto_sync.unregister()
+    staging.unregister()
+    resume.unregister()
+    render_stats.unregister()
+    layer_summary.unregister()
+    tree_index.unregister()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.viewlayer_connector_settings
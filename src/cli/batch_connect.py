@@ -0,0 +1,50 @@
+"""
+Connect ViewLayers to File Output nodes in a .blend file without the UI.
+
+    blender -b shot.blend --python batch_connect.py -- [--profile settings.json] [--no-save]
+
+Runs compositor.connect_viewlayers_to_output with the given settings profile
+and saves the file. Use batch_driver.py to process many files in parallel.
+"""
+import argparse
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cli_common
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="batch_connect", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", help="JSON file with ViewLayerConnectorSettings values")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the file afterwards")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args(cli_common.script_args())
+    result = {'file': bpy.data.filepath, 'status': 'FAILED', 'messages': []}
+    start = time.perf_counter()
+
+    try:
+        settings = cli_common.ensure_addon()
+        cli_common.apply_settings_profile(settings, cli_common.load_profile(args.profile))
+
+        status = bpy.ops.compositor.connect_viewlayers_to_output()
+        result['status'] = 'FINISHED' if 'FINISHED' in status else 'CANCELLED'
+        result['view_layers'] = len(bpy.context.scene.view_layers)
+
+        if result['status'] == 'FINISHED' and not args.no_save:
+            bpy.ops.wm.save_mainfile()
+            result['saved'] = True
+    except Exception as e:
+        result['messages'].append(f"{type(e).__name__}: {e}")
+
+    result['seconds'] = time.perf_counter() - start
+    cli_common.emit_result(result)
+    sys.exit(0 if result['status'] == 'FINISHED' else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Wire File Outputs across many .blend files using parallel background Blenders.
+
+    python batch_driver.py --blender /path/to/blender --jobs 8 \
+        --profile settings.json --summary summary.json shots/*.blend
+
+Every file is processed by batch_connect.py in its own Blender process.
+Per-file timing and exit status are printed and written to the summary.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from process_pool import blender_command, run_pool, script_path, write_summary
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="batch_driver", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help=".blend files to process")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Number of concurrent Blender processes")
+    parser.add_argument("--profile", help="JSON file with ViewLayerConnectorSettings values")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the files")
+    parser.add_argument("--timeout", type=float, help="Per-file timeout in seconds")
+    parser.add_argument("--summary", help="Write a JSON summary to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    script_args = []
+    if args.profile:
+        script_args += ["--profile", os.path.abspath(args.profile)]
+    if args.no_save:
+        script_args.append("--no-save")
+
+    script = script_path("batch_connect.py")
+    commands = [
+        (blend_file, blender_command(args.blender, blend_file, script, script_args))
+        for blend_file in args.files
+    ]
+
+    def report(summary):
+        status = "ok" if summary['ok'] else f"FAILED ({summary['returncode']})"
+        print(f"{summary['seconds']:8.2f}s  {status:12}  {summary['label']}", flush=True)
+
+    start = time.perf_counter()
+    results = run_pool(commands, args.jobs, timeout=args.timeout, on_done=report)
+    failed = [r['label'] for r in results if not r['ok']]
+
+    summary = {
+        'files': len(results),
+        'failed': failed,
+        'jobs': args.jobs,
+        'seconds': time.perf_counter() - start,
+        'results': results,
+    }
+    print(f"Processed {len(results)} files in {summary['seconds']:.2f}s, {len(failed)} failed")
+    if args.summary:
+        write_summary(args.summary, summary)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Time the add-on on synthetic scenes with many view layers.
+
+    blender -b --factory-startup --python benchmark.py -- \
+        --layers 10,100,500,1000,5000 --gp-ratio 0.1 --crypto-levels 6 --output bench.json
+
+For every size a scene is built with that many view layers (a share of them
+grease pencil `.gp.vl` layers), the chosen passes enabled, and each add-on
+operation is timed. Results are written as JSON, including the log-log
+scaling exponent between consecutive sizes so super-linear regressions
+stand out when comparing releases.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cli_common
+
+# Pass toggles enabled on every synthetic view layer, when the property exists
+DEFAULT_PASSES = (
+    'use_pass_z',
+    'use_pass_normal',
+    'use_pass_position',
+    'use_pass_vector',
+    'use_pass_mist',
+    'use_pass_emit',
+    'use_pass_ambient_occlusion',
+    'use_pass_diffuse_direct',
+    'use_pass_diffuse_color',
+    'use_pass_glossy_direct',
+)
+
+CRYPTO_PASSES = ('use_pass_cryptomatte_object', 'use_pass_cryptomatte_material', 'use_pass_cryptomatte_asset')
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="benchmark", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", default="10,50,100,500,1000",
+                        help="Comma separated view layer counts")
+    parser.add_argument("--gp-ratio", type=float, default=0.1,
+                        help="Share of view layers that are grease pencil layers")
+    parser.add_argument("--passes", type=int, default=len(DEFAULT_PASSES),
+                        help="Number of extra passes to enable per layer")
+    parser.add_argument("--crypto-levels", type=int, default=0,
+                        help="Cryptomatte levels, 0 disables Cryptomatte")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per operation, the best is kept")
+    parser.add_argument("--group-limit", type=int, default=100,
+                        help="Maximum number of view layers turned into node groups")
+    parser.add_argument("--output", default="bench_output.json", help="JSON result file")
+    return parser.parse_args(argv)
+
+def build_scene(scene, layer_count, gp_ratio, passes, crypto_levels):
+    """Replace the scene's view layers with layer_count synthetic ones"""
+    gp_count = int(layer_count * gp_ratio)
+    names = [f"PFX{i % 7}_char{i:05d}.vl" for i in range(layer_count - gp_count)]
+    names += [f"PFX{i % 7}_ink{i:05d}.gp.vl" for i in range(gp_count)]
+
+    # A scene always keeps one view layer, rename it instead of removing it
+    while len(scene.view_layers) > 1:
+        scene.view_layers.remove(scene.view_layers[-1])
+    scene.view_layers[0].name = names[0]
+
+    for name in names[1:]:
+        scene.view_layers.new(name)
+
+    for viewlayer in scene.view_layers:
+        for prop in DEFAULT_PASSES[:passes]:
+            if hasattr(viewlayer, prop):
+                setattr(viewlayer, prop, True)
+        if crypto_levels:
+            for prop in CRYPTO_PASSES:
+                setattr(viewlayer, prop, True)
+            viewlayer.pass_cryptomatte_depth = crypto_levels
+
+    return gp_count
+
+def clear_tree(tree):
+    """Remove every node, frame and group left by a previous run"""
+    tree.nodes.clear()
+    for group in [g for g in bpy.data.node_groups if g.users == 0]:
+        bpy.data.node_groups.remove(group)
+
+def timed(repeat, setup, func):
+    """Best wall time in seconds of func over repeat runs, setup runs untimed before each"""
+    best = None
+    for _ in range(max(1, repeat)):
+        setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_size(scene, args, layer_count):
+    """Time every operation for one scene size, returns a list of records"""
+    node_utils = cli_common.addon_module("utils.node_utils")
+    settings = scene.viewlayer_connector_settings
+    tree = scene.node_tree
+    gp_count = build_scene(scene, layer_count, args.gp_ratio, args.passes, args.crypto_levels)
+
+    def connect():
+        clear_tree(tree)
+        bpy.ops.compositor.connect_viewlayers_to_output()
+
+    def nothing():
+        pass
+
+    # Layout steps run on whatever connect left behind
+    settings.auto_frame_by_prefix = False
+    settings.auto_organize = False
+    settings.clear_existing = True
+
+    ops = [
+        ("connect_viewlayers_to_output", lambda: clear_tree(tree),
+         lambda: bpy.ops.compositor.connect_viewlayers_to_output()),
+        ("connect_sorted_viewlayers", lambda: clear_tree(tree),
+         lambda: bpy.ops.compositor.connect_sorted_viewlayers()),
+        ("arrange_nodes_GRID", connect, lambda: node_utils.arrange_nodes(tree, 'GRID')),
+        ("arrange_nodes_FLOW", nothing, lambda: node_utils.arrange_nodes(tree, 'FLOW')),
+        ("arrange_nodes_HIERARCHY", nothing, lambda: node_utils.arrange_nodes(tree, 'HIERARCHY')),
+        ("group_nodes_by_prefix_in_frames", connect, lambda: node_utils.group_nodes_by_prefix_in_frames(tree)),
+        ("create_node_group", connect, lambda: group_layers(tree, node_utils, args.group_limit)),
+        ("clear_all_viewlayer_nodes", connect, lambda: node_utils.clear_all_viewlayer_nodes(tree)),
+    ]
+
+    records = []
+    for name, setup, func in ops:
+        seconds = timed(args.repeat, setup, func)
+        records.append({
+            'operation': name,
+            'layers': layer_count,
+            'gp_layers': gp_count,
+            'passes': args.passes,
+            'crypto_levels': args.crypto_levels,
+            'nodes': len(tree.nodes),
+            'seconds': seconds,
+        })
+        print(f"{layer_count:6d} layers  {name:34} {seconds:9.4f}s", flush=True)
+    return records
+
+def group_layers(tree, node_utils, limit):
+    """Turn up to limit RL nodes and their outputs into node groups"""
+    link_index = cli_common.addon_module("utils.link_index").LinkIndex
+    rl_nodes = [n for n in tree.nodes if n.type == 'R_LAYERS'][:limit]
+    for rl_node in rl_nodes:
+        # Grease pencil layers share one output node, which the first of them
+        # moves into its group, so each call needs the links as they are now
+        index = link_index.from_tree(tree)
+        nodes = [rl_node] + index.downstream(rl_node)
+        node_utils.create_node_group(tree, nodes, f"Group_{rl_node.name}", index=index)
+
+def scaling_exponents(records):
+    """
+    Log-log slope of time against layer count between consecutive sizes, per operation.
+    1.0 is linear, 2.0 quadratic.
+    """
+    by_op = {}
+    for record in records:
+        by_op.setdefault(record['operation'], []).append(record)
+
+    exponents = {}
+    for op, rows in by_op.items():
+        rows.sort(key=lambda r: r['layers'])
+        slopes = []
+        for a, b in zip(rows, rows[1:]):
+            if a['seconds'] > 0 and b['seconds'] > 0 and b['layers'] > a['layers']:
+                slopes.append(math.log(b['seconds'] / a['seconds']) / math.log(b['layers'] / a['layers']))
+        exponents[op] = slopes
+    return exponents
+
+def main():
+    args = parse_args(cli_common.script_args())
+    cli_common.ensure_addon()
+
+    scene = bpy.context.scene
+    scene.use_nodes = True
+
+    # The connect operator needs a saved file to derive output names
+    if not bpy.data.is_saved:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.join(tempfile.mkdtemp(), "benchmark.blend"))
+
+    records = []
+    for layer_count in sorted(int(n) for n in args.layers.split(",") if n.strip()):
+        records.extend(run_size(scene, args, layer_count))
+
+    result = {
+        'blender': bpy.app.version_string,
+        'addon_version': list(cli_common.addon_module().bl_info['version']),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'records': records,
+        'scaling_exponents': scaling_exponents(records),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"Wrote {len(records)} results to {args.output}")
+
+if __name__ == "__main__":
+    main()
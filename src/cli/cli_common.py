@@ -0,0 +1,59 @@
+"""
+Helpers shared by the scripts Blender runs with `blender -b file.blend --python <script> -- <args>`.
+
+Scripts run as __main__ outside the add-on package, so they import this
+module by path and use ensure_addon() to make the operators available.
+"""
+import importlib
+import json
+import os
+import sys
+
+import bpy
+
+RESULT_MARKER = "AUTO_NODE_OUTPUTS_RESULT "
+
+def script_args():
+    """Arguments after the `--` separator on Blender's command line"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return []
+
+def ensure_addon():
+    """
+    Register the add-on unless it is already enabled in this Blender session.
+    Returns the scene settings property group.
+    """
+    if 'viewlayer_connector_settings' not in bpy.types.Scene.bl_rna.properties:
+        addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        sys.path.insert(0, os.path.dirname(addon_dir))
+        addon = importlib.import_module(os.path.basename(addon_dir))
+        addon.register()
+    return bpy.context.scene.viewlayer_connector_settings
+
+def addon_module(submodule=""):
+    """Import the registered add-on package, or one of its submodules such as 'utils.node_utils'"""
+    package = bpy.types.COMPOSITOR_OT_connect_viewlayers_to_output.__module__.rsplit(".operators", 1)[0]
+    return importlib.import_module(f"{package}.{submodule}" if submodule else package)
+
+def load_profile(path):
+    """Read a settings profile: a JSON object of ViewLayerConnectorSettings values"""
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    if not isinstance(profile, dict):
+        raise ValueError(f"Settings profile {path} must be a JSON object")
+    return profile
+
+def apply_settings_profile(settings, profile):
+    """Assign every profile value to settings, rejecting unknown names"""
+    known = settings.bl_rna.properties.keys()
+    for key, value in profile.items():
+        if key not in known:
+            raise KeyError(f"Unknown setting in profile: {key}")
+        setattr(settings, key, value)
+
+def emit_result(result):
+    """Print a result line that the process-pool driver picks up from stdout"""
+    print(RESULT_MARKER + json.dumps(result), flush=True)
@@ -0,0 +1,62 @@
+"""
+Transfer files left in a staging scratch directory to their final location.
+
+    python flush_staging.py /local/scratch /mnt/nas/renders [--copy] [--workers 4] [--no-verify]
+
+Used after a render was killed before the add-on could flush its staged
+frames, or to try the staging transfer between any two local directories.
+The scratch layout mirrors the final one; files are written through a
+temporary name and checked with a checksum before the source is removed.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.transfer_queue import PART_SUFFIX, TransferQueue
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="flush_staging", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scratch", help="Staging scratch directory")
+    parser.add_argument("final", help="Final output directory")
+    parser.add_argument("--copy", action="store_true", help="Keep the scratch files instead of moving them")
+    parser.add_argument("--workers", "-j", type=int, default=4, help="Concurrent transfers")
+    parser.add_argument("--max-pending", type=int, default=64, help="Queued transfers before scanning waits")
+    parser.add_argument("--no-verify", action="store_true", help="Skip re-reading copies to compare checksums")
+    return parser.parse_args(argv)
+
+def staged_files(scratch):
+    """Every finished file below scratch, depth first"""
+    pending = [scratch]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file() and not entry.name.endswith(PART_SUFFIX):
+                    yield entry.path
+
+def main(argv=None):
+    args = parse_args(argv)
+    scratch = os.path.abspath(args.scratch)
+    final = os.path.abspath(args.final)
+
+    started = time.perf_counter()
+    transfers = TransferQueue(args.workers, args.max_pending, move=not args.copy, verify=not args.no_verify)
+    for source in staged_files(scratch):
+        transfers.submit(source, os.path.join(final, os.path.relpath(source, scratch)))
+    transfers.close()
+
+    result = transfers.summary()
+    seconds = time.perf_counter() - started
+    print(f"Transferred {result['transferred']} files ({result['bytes']} bytes) in {seconds:.2f}s, "
+          f"{len(result['failed'])} failed")
+    for failure in result['failed']:
+        print(f"  {failure['source']}: {failure['error']}")
+    return 1 if result['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
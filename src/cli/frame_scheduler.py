@@ -0,0 +1,177 @@
+"""
+Render a frame range in chunks across a pool of local background Blenders.
+
+    python frame_scheduler.py shot.blend --blender /path/to/blender \
+        --workers 4 --chunk-size 10 [--frames 1-240] [--retries 2] [--summary summary.json]
+
+Frames whose files from the add-on's File Output nodes already exist and
+are non-empty are skipped, so a rerun resumes where the last one stopped.
+The remaining frames are cut into chunks that idle workers pull from a
+shared queue; failed chunks are queued again up to --retries times.
+Progress is kept in a state file next to the .blend.
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from process_pool import blender_command, parse_frame_range, run_blender, script_path, write_summary
+from render_orchestrator import inspect
+from utils.output_paths import OutputIndex, completed_frames, frame_range
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="frame_scheduler", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("blend_file", help=".blend file to render")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--workers", "-j", type=int, default=2, help="Number of concurrent Blender processes")
+    parser.add_argument("--threads", "-t", type=int, default=0,
+                        help="Render threads per process, 0 splits the CPUs evenly")
+    parser.add_argument("--chunk-size", type=int, default=10, help="Frames per chunk")
+    parser.add_argument("--frames", help="Frame range start-end, defaults to the scene range")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed chunk")
+    parser.add_argument("--state", help="State file, defaults to <blend>.frames.json")
+    parser.add_argument("--timeout", type=float, help="Per-chunk timeout in seconds")
+    parser.add_argument("--summary", help="Write a JSON summary to this path")
+    return parser.parse_args(argv)
+
+def split_chunks(frames, chunk_size, step=1):
+    """
+    Cut a sorted list of frames into chunks of consecutive frames.
+    Returns [(start, end), ...]; a gap always starts a new chunk.
+    """
+    chunks = []
+    run = []
+    for frame in frames:
+        if run and (frame != run[-1] + step or len(run) >= chunk_size):
+            chunks.append((run[0], run[-1]))
+            run = []
+        run.append(frame)
+    if run:
+        chunks.append((run[0], run[-1]))
+    return chunks
+
+def load_state(path):
+    """Previously recorded state, or an empty one"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'done': [], 'failed': []}
+
+class ChunkScheduler:
+    """Hands chunks to idle workers from a shared queue and requeues failures"""
+
+    def __init__(self, chunks, retries, run_chunk, on_done=None):
+        self.queue = queue.Queue()
+        for chunk in chunks:
+            self.queue.put((chunk, 0))
+        self.retries = retries
+        self.run_chunk = run_chunk
+        self.on_done = on_done
+        self.results = []
+        self.failed = []
+        self._lock = threading.Lock()
+
+    def _worker(self):
+        while True:
+            try:
+                chunk, attempt = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            summary = self.run_chunk(chunk)
+            summary['chunk'] = list(chunk)
+            summary['attempt'] = attempt + 1
+            with self._lock:
+                self.results.append(summary)
+                if not summary['ok']:
+                    if attempt < self.retries:
+                        self.queue.put((chunk, attempt + 1))
+                    else:
+                        self.failed.append(list(chunk))
+                if self.on_done is not None:
+                    self.on_done(summary)
+
+    def run(self, workers):
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.results
+
+def main(argv=None):
+    args = parse_args(argv)
+    blend_file = os.path.abspath(args.blend_file)
+    state_path = args.state or os.path.splitext(blend_file)[0] + ".frames.json"
+
+    info = inspect(args.blender, blend_file, args.timeout)
+    if args.frames:
+        start, end = parse_frame_range(args.frames)
+    else:
+        start, end = info['frame_start'], info['frame_end']
+    step = max(1, info.get('frame_step', 1))
+    frames = list(frame_range(start, end, step))
+
+    # Frames are done when every add-on output file exists on disk
+    nodes = [SimpleNamespace(name=o['name'], base_path=o['base_path'], file_format=o['file_format'],
+                             slots=[SimpleNamespace(path=p) for p in o['slots']])
+             for o in info['outputs']]
+    if nodes:
+        done = completed_frames(nodes, frames, info['blend_dir'], info['use_extension'], OutputIndex())
+    else:
+        # Without add-on outputs only the state file knows what finished
+        done = set(load_state(state_path)['done'])
+    todo = [frame for frame in frames if frame not in done]
+    chunks = split_chunks(todo, max(1, args.chunk_size), step)
+    print(f"{len(done)} of {len(frames)} frames already rendered, {len(chunks)} chunks to go", flush=True)
+
+    threads = args.threads or max(1, (os.cpu_count() or 1) // max(1, args.workers))
+    state = {'done': sorted(done), 'failed': []}
+    state_lock = threading.Lock()
+
+    def run_chunk(chunk):
+        command = blender_command(args.blender, blend_file, script_path("render_layers_worker.py"),
+                                  ["--frames", f"{chunk[0]}-{chunk[1]}"], extra_args=["-t", str(threads)])
+        return run_blender(command, timeout=args.timeout, label=f"{chunk[0]}-{chunk[1]}")
+
+    def report(summary):
+        status = "ok" if summary['ok'] else f"FAILED ({summary['returncode']}), attempt {summary['attempt']}"
+        print(f"{summary['seconds']:8.2f}s  frames {summary['label']:>12}  {status}", flush=True)
+        if summary['ok']:
+            with state_lock:
+                state['done'] = sorted(set(state['done']) | set(range(summary['chunk'][0], summary['chunk'][1] + 1, step)))
+                write_summary(state_path, state)
+
+    started = time.perf_counter()
+    scheduler = ChunkScheduler(chunks, args.retries, run_chunk, on_done=report)
+    results = scheduler.run(args.workers)
+    state['failed'] = scheduler.failed
+    write_summary(state_path, state)
+
+    summary = {
+        'file': blend_file,
+        'frames': len(frames),
+        'skipped': len(done),
+        'chunks': len(chunks),
+        'workers': args.workers,
+        'threads': threads,
+        'failed': scheduler.failed,
+        'seconds': time.perf_counter() - started,
+        'results': results,
+    }
+    print(f"Rendered {len(chunks) - len(scheduler.failed)} of {len(chunks)} chunks "
+          f"in {summary['seconds']:.2f}s")
+    if args.summary:
+        write_summary(args.summary, summary)
+    return 1 if scheduler.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Report the view layers of a .blend file for the render orchestrator.
+
+    blender -b shot.blend --python inspect_layers.py
+
+Emits one result with every enabled view layer, whether it is a grease
+pencil layer, its cleaned name, and a unit index: layers that feed a shared
+File Output node (the grease pencil node, consolidated EXRs) share a unit
+and must be rendered by the same process. It also lists the unmuted
+File Output nodes the add-on created, so drivers can tell which frames
+are already on disk.
+"""
+import os
+import sys
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cli_common
+
+def layer_units(layer_names, index):
+    """Union layers that write into the same output node, returns {layer: unit index}"""
+    parent = {name: name for name in layer_names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for layers in index.layer_by_output.values():
+        known = [name for name in layers if name in parent]
+        for other in known[1:]:
+            parent[find(other)] = find(known[0])
+
+    roots = {}
+    return {name: roots.setdefault(find(name), len(roots)) for name in layer_names}
+
+def output_specs(scene):
+    """Unmuted add-on File Output nodes as JSON friendly dicts"""
+    if scene.node_tree is None:
+        return []
+    estimator = cli_common.addon_module("utils.output_estimator")
+    applier = cli_common.addon_module("utils.plan_applier")
+    base_filename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0]
+    owned = {node.name for node in applier.owned_output_nodes(scene.node_tree, base_filename)
+             if not node.mute}
+    return [
+        {'name': spec.name, 'base_path': spec.base_path, 'file_format': spec.file_format,
+         'slots': [slot.path for slot in spec.slots]}
+        for spec in estimator.specs_from_tree(scene.node_tree) if spec.name in owned
+    ]
+
+def main():
+    cli_common.ensure_addon()
+    planner = cli_common.addon_module("utils.connection_planner")
+    tree_index = cli_common.addon_module("utils.tree_index")
+
+    scene = bpy.context.scene
+    names = [vl.name for vl in scene.view_layers if vl.use]
+    units = {}
+    if scene.node_tree is not None:
+        units = layer_units(names, tree_index.get_tree_index(scene.node_tree))
+
+    layers = []
+    for name in names:
+        gp = planner.is_gp_layer(name)
+        layers.append({
+            'name': name,
+            'gp': gp,
+            'cleaned': planner.clean_gp_layer_name(name) if gp else planner.clean_viewlayer_name(name),
+            'unit': units.get(name, len(names) + len(layers)),
+        })
+
+    cli_common.emit_result({
+        'file': bpy.data.filepath,
+        'blend_dir': os.path.dirname(bpy.data.filepath),
+        'use_extension': scene.render.use_file_extension,
+        'outputs': output_specs(scene),
+        'scene': scene.name,
+        'frame_start': scene.frame_start,
+        'frame_end': scene.frame_end,
+        'frame_step': scene.frame_step,
+        'layers': layers,
+    })
+
+if __name__ == "__main__":
+    main()
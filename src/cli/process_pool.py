@@ -0,0 +1,95 @@
+"""
+Run background Blender processes concurrently and collect their results.
+
+Pure Python, no bpy: this runs in a regular interpreter and drives
+`blender -b` subprocesses that report back through cli_common.emit_result.
+"""
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+RESULT_MARKER = "AUTO_NODE_OUTPUTS_RESULT "
+CLI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def script_path(name):
+    """Absolute path of a script in this directory"""
+    return os.path.join(CLI_DIR, name)
+
+def blender_command(blender, blend_file, script, script_args=(), extra_args=()):
+    """Command line for running script inside a background Blender on blend_file"""
+    command = [blender, "-b"]
+    if blend_file:
+        command.append(blend_file)
+    command.extend(extra_args)
+    command.extend(["--python-exit-code", "1", "--python", script, "--"])
+    command.extend(script_args)
+    return command
+
+def parse_results(stdout):
+    """All result objects a script printed with emit_result"""
+    results = []
+    for line in stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            try:
+                results.append(json.loads(line[len(RESULT_MARKER):]))
+            except ValueError:
+                pass
+    return results
+
+def run_blender(command, timeout=None, env=None, label=None):
+    """
+    Run one Blender command and return a summary dict with the exit status,
+    wall time, the last result the script emitted and the tail of stderr.
+    """
+    start = time.perf_counter()
+    summary = {'label': label, 'command': command}
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True,
+                              timeout=timeout, env=env)
+        summary['returncode'] = proc.returncode
+        results = parse_results(proc.stdout)
+        summary['result'] = results[-1] if results else None
+        summary['stderr'] = proc.stderr[-2000:]
+    except subprocess.TimeoutExpired:
+        summary['returncode'] = None
+        summary['result'] = None
+        summary['stderr'] = f"Timed out after {timeout} seconds"
+    except OSError as e:
+        summary['returncode'] = None
+        summary['result'] = None
+        summary['stderr'] = str(e)
+    summary['seconds'] = time.perf_counter() - start
+    summary['ok'] = summary['returncode'] == 0
+    return summary
+
+def run_pool(commands, workers, timeout=None, env=None, on_done=None):
+    """
+    Run (label, command) pairs with at most `workers` processes at a time.
+    on_done is called with each summary as it finishes. Returns the summaries
+    in input order.
+    """
+    summaries = [None] * len(commands)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(run_blender, command, timeout, env, label): idx
+            for idx, (label, command) in enumerate(commands)
+        }
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries[futures[future]] = summary
+            if on_done is not None:
+                on_done(summary)
+    return summaries
+
+def write_summary(path, summary):
+    """Write a JSON summary file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+def parse_frame_range(text):
+    """Parse 'start-end' or a single frame into an inclusive (start, end) tuple"""
+    start, _, end = text.partition("-")
+    start = int(start)
+    return start, int(end) if end else start
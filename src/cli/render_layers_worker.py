@@ -0,0 +1,96 @@
+"""
+Render a subset of view layers of a .blend file.
+
+    blender -b shot.blend -t 8 --python render_layers_worker.py -- \
+        [--layers "charA.vl,charB.vl"] [--frames 1-100] [--main-output /tmp/worker_0/]
+
+With --layers, only the listed view layers are enabled and only the File
+Output nodes fed by them are unmuted, so several workers can render
+disjoint layer sets of the same file at once; --main-output then keeps
+their regular render output apart. Without --layers the file renders as
+set up, which is how frame chunks are rendered. The file is not saved.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cli_common
+from process_pool import parse_frame_range
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="render_layers_worker", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", help="JSON list or comma separated view layer names")
+    parser.add_argument("--frames", help="Frame range start-end, defaults to the scene range")
+    parser.add_argument("--main-output", help="Directory for the regular render output")
+    return parser.parse_args(argv)
+
+def parse_layers(text):
+    if text.startswith("["):
+        return json.loads(text)
+    return [name for name in text.split(",") if name]
+
+def isolate_layers(scene, layer_names):
+    """Enable only layer_names and unmute only the File Output nodes they feed"""
+    tree_index = cli_common.addon_module("utils.tree_index")
+    wanted = set(layer_names)
+
+    for viewlayer in scene.view_layers:
+        viewlayer.use = viewlayer.name in wanted
+
+    tree = scene.node_tree
+    if tree is None:
+        return 0
+    index = tree_index.get_tree_index(tree)
+    unmuted = 0
+    for node in tree.nodes:
+        if node.type == 'R_LAYERS':
+            node.mute = node.layer not in wanted
+        elif node.type == 'OUTPUT_FILE':
+            feeds = index.layer_by_output.get(node.name, [])
+            node.mute = not any(name in wanted for name in feeds)
+            unmuted += not node.mute
+    return unmuted
+
+def main():
+    args = parse_args(cli_common.script_args())
+    scene = bpy.context.scene
+    layer_names = parse_layers(args.layers) if args.layers else []
+    result = {'file': bpy.data.filepath, 'layers': layer_names, 'status': 'FAILED', 'messages': []}
+    frames_done = []
+
+    def count_frame(scene, *_):
+        frames_done.append(scene.frame_current)
+
+    start = time.perf_counter()
+    try:
+        cli_common.ensure_addon()
+        missing = [name for name in layer_names if name not in scene.view_layers]
+        if missing:
+            raise KeyError(f"Unknown view layers: {', '.join(missing)}")
+
+        if layer_names:
+            result['output_nodes'] = isolate_layers(scene, layer_names)
+        if args.frames:
+            scene.frame_start, scene.frame_end = parse_frame_range(args.frames)
+        if args.main_output:
+            scene.render.filepath = os.path.join(args.main_output, "")
+
+        bpy.app.handlers.render_post.append(count_frame)
+        bpy.ops.render.render(animation=True)
+        result['status'] = 'FINISHED'
+    except Exception as e:
+        result['messages'].append(f"{type(e).__name__}: {e}")
+
+    result['frames'] = frames_done
+    result['seconds'] = time.perf_counter() - start
+    cli_common.emit_result(result)
+    sys.exit(0 if result['status'] == 'FINISHED' else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Render the view layers of one .blend file in parallel local Blender processes.
+
+    python render_orchestrator.py shot.blend --blender /path/to/blender \
+        --workers 8 --threads 8 [--frames 1-100] [--summary summary.json]
+
+The file is inspected once (inspect_layers.py), its enabled view layers are
+split into jobs and each job renders its layers in a background Blender
+with only those layers enabled and only their File Output nodes unmuted
+(render_layers_worker.py). Layers that share an output node, such as all
+grease pencil layers, always stay in the same job. Heavier jobs start
+first; grease pencil layers count as light.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from process_pool import blender_command, run_blender, run_pool, script_path, write_summary
+
+GP_LAYER_WEIGHT = 0.25
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="render_orchestrator", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("blend_file", help=".blend file to render")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--workers", "-j", type=int, default=4,
+                        help="Number of concurrent Blender processes")
+    parser.add_argument("--threads", "-t", type=int, default=0,
+                        help="Render threads per process, 0 splits the CPUs evenly")
+    parser.add_argument("--layers-per-job", type=int, default=1,
+                        help="Units of view layers rendered by each job")
+    parser.add_argument("--weights", help="JSON file mapping view layer names to relative render cost")
+    parser.add_argument("--frames", help="Frame range start-end, defaults to the scene range")
+    parser.add_argument("--main-output", help="Directory for the regular render output of the workers")
+    parser.add_argument("--timeout", type=float, help="Per-job timeout in seconds")
+    parser.add_argument("--summary", help="Write a JSON summary to this path")
+    return parser.parse_args(argv)
+
+def layer_weight(layer, weights):
+    """Relative cost of rendering a layer"""
+    if layer['name'] in weights:
+        return float(weights[layer['name']])
+    return GP_LAYER_WEIGHT if layer['gp'] else 1.0
+
+def plan_jobs(layers, layers_per_job=1, weights=None):
+    """
+    Group layers into jobs. Layers sharing a unit stay together, every job
+    holds up to layers_per_job units, and jobs are ordered heaviest first so
+    long renders start early.
+    Returns [{'layers': [...], 'weight': float, 'label': str}, ...].
+    """
+    weights = weights or {}
+    units = {}
+    for layer in layers:
+        units.setdefault(layer['unit'], []).append(layer)
+
+    ordered = sorted(units.values(), key=lambda unit: sum(layer_weight(l, weights) for l in unit), reverse=True)
+    size = max(1, layers_per_job)
+    jobs = []
+    for start in range(0, len(ordered), size):
+        members = [layer for unit in ordered[start:start + size] for layer in unit]
+        jobs.append({
+            'layers': [layer['name'] for layer in members],
+            'weight': sum(layer_weight(layer, weights) for layer in members),
+            'label': ",".join(layer['cleaned'] for layer in members),
+        })
+    jobs.sort(key=lambda job: job['weight'], reverse=True)
+    return jobs
+
+def inspect(blender, blend_file, timeout=None):
+    """Run inspect_layers.py on blend_file and return its result"""
+    command = blender_command(blender, blend_file, script_path("inspect_layers.py"))
+    summary = run_blender(command, timeout=timeout, label=blend_file)
+    if not summary['ok'] or summary['result'] is None:
+        raise RuntimeError(f"Could not inspect {blend_file}: {summary['stderr']}")
+    return summary['result']
+
+def main(argv=None):
+    args = parse_args(argv)
+    weights = {}
+    if args.weights:
+        with open(args.weights, 'r', encoding='utf-8') as f:
+            weights = json.load(f)
+
+    info = inspect(args.blender, args.blend_file, args.timeout)
+    jobs = plan_jobs(info['layers'], args.layers_per_job, weights)
+    if not jobs:
+        print("No enabled view layers to render")
+        return 1
+
+    threads = args.threads or max(1, (os.cpu_count() or 1) // max(1, args.workers))
+    main_output = args.main_output or tempfile.mkdtemp(prefix="layer_render_")
+
+    commands = []
+    for idx, job in enumerate(jobs):
+        script_args = ["--layers", json.dumps(job['layers']),
+                       "--main-output", os.path.join(main_output, f"job_{idx:03d}")]
+        if args.frames:
+            script_args += ["--frames", args.frames]
+        commands.append((job['label'], blender_command(
+            args.blender, args.blend_file, script_path("render_layers_worker.py"),
+            script_args, extra_args=["-t", str(threads)])))
+
+    done = []
+
+    def report(summary):
+        done.append(summary)
+        status = "ok" if summary['ok'] else f"FAILED ({summary['returncode']})"
+        frames = len((summary['result'] or {}).get('frames', []))
+        print(f"[{len(done)}/{len(commands)}] {summary['seconds']:8.2f}s  {frames:5d} frames  "
+              f"{status:12}  {summary['label']}", flush=True)
+
+    print(f"Rendering {len(info['layers'])} view layers in {len(jobs)} jobs, "
+          f"{args.workers} processes x {threads} threads", flush=True)
+    start = time.perf_counter()
+    results = run_pool(commands, args.workers, timeout=args.timeout, on_done=report)
+    failed = [r['label'] for r in results if not r['ok']]
+
+    summary = {
+        'file': args.blend_file,
+        'jobs': len(jobs),
+        'workers': args.workers,
+        'threads': threads,
+        'failed': failed,
+        'seconds': time.perf_counter() - start,
+        'results': results,
+    }
+    print(f"Finished {len(jobs)} jobs in {summary['seconds']:.2f}s, {len(failed)} failed")
+    if args.summary:
+        write_summary(args.summary, summary)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Check a render directory against an expected-output manifest.
+
+    python verify_outputs.py shot.manifest.json [--render-dir /mnt/nas/shot] \
+        [--workers 16] [--no-headers] [--summary report.json]
+
+The manifest is written by the add-on's Export Output Manifest operator.
+Files are found with parallel os.scandir calls and EXR headers are parsed
+from memory maps without decoding pixels. Exits with 1 when any file is
+missing, truncated or mis-encoded.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from process_pool import write_summary
+from utils.output_manifest import load_manifest, verify_manifest
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="verify_outputs", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="Manifest JSON file")
+    parser.add_argument("--render-dir", help="Directory holding the renders, defaults to the manifest's output root")
+    parser.add_argument("--workers", "-j", type=int, default=16, help="Number of scanning threads")
+    parser.add_argument("--no-headers", action="store_true", help="Only check that files exist and are not empty")
+    parser.add_argument("--min-size", type=int, default=1, help="Smallest accepted file size in bytes")
+    parser.add_argument("--summary", help="Write the full report as JSON to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    manifest = load_manifest(args.manifest)
+    report = verify_manifest(manifest, args.render_dir, args.workers, not args.no_headers, args.min_size)
+
+    for kind in ('missing', 'truncated', 'mis_encoded'):
+        for item in report[kind][:20]:
+            reason = f"  ({item['reason']})" if 'reason' in item else ""
+            print(f"{kind:12} frame {item['frame']:6d}  {item['path']}{reason}")
+        if len(report[kind]) > 20:
+            print(f"{kind:12} ... {len(report[kind]) - 20} more")
+
+    print(f"{report['ok']} of {report['files']} files ok in {report['directories']} directories, "
+          f"{len(report['missing'])} missing, {len(report['truncated'])} truncated, "
+          f"{len(report['mis_encoded'])} mis-encoded, {len(report['incomplete_frames'])} frames incomplete "
+          f"({report['seconds']:.2f}s)")
+    if args.summary:
+        write_summary(args.summary, report)
+    return 0 if report['ok'] == report['files'] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import bpy
 from bpy.types import Operator
+from bpy.props import EnumProperty
+from ..utils.ownership import remove_owned
+from .profiling import profiled
 
 class COMPOSITOR_OT_setup_nodes(Operator):
     """Enable compositor nodes"""
@@ -13,24 +16,40 @@ class COMPOSITOR_OT_setup_nodes(Operator):
         return {'FINISHED'}
 
 class COMPOSITOR_OT_clear_viewlayer_outputs(Operator):
-    """Clear previously created ViewLayer output nodes"""
+    """Clear the nodes, frames and groups previously created by the add-on"""
     bl_idname = "compositor.clear_viewlayer_outputs"
     bl_label = "Clear ViewLayer Outputs"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def execute(self, context):
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('ALL', "All", "Remove everything the add-on created"),
+            ('LAST_RUN', "Last Run", "Remove only what the last Connect run created or updated")
+        ],
+        default='ALL'
+    )
+    
+    @profiled
+    def execute(self, context, profiler):
         if not context.scene.use_nodes:
             self.report({'WARNING'}, "Compositor nodes are not enabled")
             return {'CANCELLED'}
         
         tree = context.scene.node_tree
-        nodes_removed = 0
+        run_id = None
+        if self.scope == 'LAST_RUN':
+            run_id = context.scene.viewlayer_connector_settings.last_run_id
+            if not run_id:
+                self.report({'WARNING'}, "No connect run recorded")
+                return {'CANCELLED'}
         
-        # Remove ViewLayer nodes
-        for node in tree.nodes:
-            if node.name.startswith("ViewLayer_") or node.name.startswith("Output_"):
-                tree.nodes.remove(node)
-                nodes_removed += 1
+        with profiler.phase('nodes'):
+            nodes_removed, groups_removed = remove_owned(tree, run_id=run_id)
+        profiler.count(removed=nodes_removed, groups_removed=groups_removed)
         
-        self.report({'INFO'}, f"Removed {nodes_removed} nodes")
+        message = f"Removed {nodes_removed} nodes"
+        if groups_removed:
+            message += f" and {groups_removed} node groups"
+        self.report({'INFO'}, message)
         return {'FINISHED'}
\ No newline at end of file
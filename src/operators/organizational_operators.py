@@ -1,12 +1,17 @@
 import bpy
+import os
 from bpy.types import Operator
 from bpy.props import EnumProperty
 from ..utils.node_utils import (
     arrange_nodes, 
     clear_all_viewlayer_nodes, 
+    frame_options,
     group_nodes_by_prefix_in_frames, 
     sort_viewlayers
 )
+from ..utils.plan_applier import link_file_slots, new_apply_stats, size_file_slots
+from ..utils.ownership import new_run_id, tag
+from .profiling import profiled
 
 class COMPOSITOR_OT_organize_nodes(Operator):
     """Organize nodes in the compositor"""
@@ -19,18 +24,21 @@ class COMPOSITOR_OT_organize_nodes(Operator):
         items=[
             ('GRID', "Grid", "Arrange nodes in a grid pattern"),
             ('FLOW', "Flow", "Arrange nodes in a left-to-right flow"),
-            ('HIERARCHY', "Hierarchy", "Arrange nodes in a hierarchical layout")
+            ('HIERARCHY', "Hierarchy", "Lay out the add-on's nodes and the outputs they feed by link depth, leaving other nodes in place")
         ],
         default='HIERARCHY'
     )
     
-    def execute(self, context):
+    @profiled
+    def execute(self, context, profiler):
         if not context.scene.use_nodes:
             self.report({'WARNING'}, "Compositor nodes are not enabled")
             return {'CANCELLED'}
         
         tree = context.scene.node_tree
-        arrange_nodes(tree, self.organize_type)
+        with profiler.phase('arranging'):
+            arrange_nodes(tree, self.organize_type, spacing=context.scene.viewlayer_connector_settings.node_spacing)
+        profiler.count(nodes=len(tree.nodes))
         
         self.report({'INFO'}, f"Organized nodes using {self.organize_type} layout")
         return {'FINISHED'}
@@ -41,13 +49,15 @@ class COMPOSITOR_OT_group_viewlayer_nodes(Operator):
     bl_label = "Group ViewLayer Nodes"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def execute(self, context):
+    @profiled
+    def execute(self, context, profiler):
         if not context.scene.use_nodes:
             self.report({'WARNING'}, "Compositor nodes are not enabled")
             return {'CANCELLED'}
         
         tree = context.scene.node_tree
-        frames_created = group_nodes_by_prefix_in_frames(tree)
+        frames_created = group_nodes_by_prefix_in_frames(
+            tree, profiler=profiler, **frame_options(context.scene.viewlayer_connector_settings))
         
         if frames_created > 0:
             self.report({'INFO'}, f"Created {frames_created} frame groups")
@@ -71,7 +81,8 @@ class COMPOSITOR_OT_connect_sorted_viewlayers(Operator):
         default='ALPHABETICAL'
     )
     
-    def execute(self, context):
+    @profiled
+    def execute(self, context, profiler):
         if not context.scene.use_nodes:
             context.scene.use_nodes = True
         
@@ -79,7 +90,8 @@ class COMPOSITOR_OT_connect_sorted_viewlayers(Operator):
         tree = context.scene.node_tree
         
         # Sort the viewlayers
-        sorted_viewlayers = sort_viewlayers(context.scene, self.sort_type)
+        with profiler.phase('classify'):
+            sorted_viewlayers = sort_viewlayers(context.scene, self.sort_type)
         
         if not sorted_viewlayers:
             self.report({'WARNING'}, "No ViewLayers found in the scene")
@@ -87,7 +99,8 @@ class COMPOSITOR_OT_connect_sorted_viewlayers(Operator):
         
         # Clear existing nodes if the option is enabled
         if settings.clear_existing:
-            clear_all_viewlayer_nodes(tree)
+            with profiler.phase('nodes'):
+                clear_all_viewlayer_nodes(tree)
         
         # Now connect the sorted viewlayers
         # This is similar to the connect_viewlayers_to_output operator
@@ -96,42 +109,50 @@ class COMPOSITOR_OT_connect_sorted_viewlayers(Operator):
         start_x = 0
         start_y = 0
         spacing_y = -300
+        stats = new_apply_stats()
+        owner = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] or "untitled"
+        run_id = new_run_id()
         
         for idx, viewlayer in enumerate(sorted_viewlayers):
             viewlayer_name = viewlayer.name
-            rl_node = tree.nodes.new('CompositorNodeRLayers')
-            rl_node.name = f"ViewLayer_{viewlayer_name}"
-            rl_node.label = viewlayer_name
-            rl_node.layer = viewlayer_name
-            rl_node.location = (start_x, start_y + (idx * spacing_y))
+            with profiler.phase('nodes'):
+                rl_node = tree.nodes.new('CompositorNodeRLayers')
+                rl_node.name = f"ViewLayer_{viewlayer_name}"
+                rl_node.label = viewlayer_name
+                rl_node.layer = viewlayer_name
+                rl_node.location = (start_x, start_y + (idx * spacing_y))
+                tag(rl_node, owner, run_id)
+                
+                output_node = tree.nodes.new('CompositorNodeOutputFile')
+                output_node.name = f"Output_{viewlayer_name}"
+                output_node.label = f"Output {viewlayer_name}"
+                output_node.location = (rl_node.location.x + 400, rl_node.location.y)
+                tag(output_node, owner, run_id)
+                
+                # Use settings from the panel
+                output_node.format.file_format = settings.file_format
+                output_node.base_path = settings.custom_output_path
+                stats['created'] += 2
             
-            output_node = tree.nodes.new('CompositorNodeOutputFile')
-            output_node.name = f"Output_{viewlayer_name}"
-            output_node.label = f"Output {viewlayer_name}"
-            output_node.location = (rl_node.location.x + 400, rl_node.location.y)
-            
-            # Use settings from the panel
-            output_node.format.file_format = settings.file_format
-            output_node.base_path = settings.custom_output_path
-            
-            # Connect the nodes
-            first_connection = True
-            for output in rl_node.outputs:
-                if output.enabled and (settings.include_all_passes or output.name == 'Image'):
-                    if first_connection:
-                        output_node.file_slots[0].path = output.name
-                        tree.links.new(output, output_node.inputs[0])
-                        first_connection = False
-                    else:
-                        output_node.file_slots.new(output.name)
-                        tree.links.new(output, output_node.inputs[-1])
+            # Connect the nodes, creating all slots before linking them
+            sources = [(output.name, output) for output in rl_node.outputs
+                       if output.enabled and (settings.include_all_passes or output.name == 'Image')]
+            with profiler.phase('slots'):
+                size_file_slots(output_node, [path for path, _ in sources], stats)
+            with profiler.phase('links'):
+                link_file_slots(tree, output_node, [socket for _, socket in sources], {}, stats)
+        profiler.count(layers=len(sorted_viewlayers), **stats)
+        
+        settings.last_run_id = run_id
         
         # Group the nodes by prefix in frames
         if settings.auto_frame_by_prefix:
-            group_nodes_by_prefix_in_frames(tree)
+            group_nodes_by_prefix_in_frames(tree, owner=owner, run_id=run_id, profiler=profiler,
+                                            **frame_options(settings))
         # Organize the nodes if that option is enabled
         elif settings.auto_organize:
-            arrange_nodes(tree, 'HIERARCHY')
+            with profiler.phase('arranging'):
+                arrange_nodes(tree, 'HIERARCHY', spacing=settings.node_spacing)
         
         self.report({'INFO'}, f"Connected {len(sorted_viewlayers)} ViewLayers in {self.sort_type} order")
         return {'FINISHED'}
@@ -143,13 +164,15 @@ class COMPOSITOR_OT_group_by_prefix_in_frames(Operator):
     bl_label = "Group by Prefix in Frames"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def execute(self, context):
+    @profiled
+    def execute(self, context, profiler):
         if not context.scene.use_nodes:
             self.report({'WARNING'}, "Compositor nodes are not enabled")
             return {'CANCELLED'}
         
         tree = context.scene.node_tree
-        frames_created = group_nodes_by_prefix_in_frames(tree)
+        frames_created = group_nodes_by_prefix_in_frames(
+            tree, profiler=profiler, **frame_options(context.scene.viewlayer_connector_settings))
         
         if frames_created > 0:
             self.report({'INFO'}, f"Created {frames_created} frames for prefix groups")
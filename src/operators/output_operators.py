@@ -0,0 +1,173 @@
+import bpy
+import os
+from bpy.types import Operator
+from bpy.props import EnumProperty, StringProperty
+from ..utils.connection_planner import SettingsSnapshot, plan_connections
+from ..utils.plan_applier import snapshot_layers
+from ..utils.output_estimator import (
+    estimate_outputs,
+    format_bytes,
+    format_seconds,
+    preflight_disk,
+    specs_from_plan,
+    specs_from_tree,
+)
+from ..utils.output_manifest import build_manifest, verify_manifest, write_manifest
+from ..utils.output_paths import frame_range
+from ..utils.resume import missing_runs, owned_specs
+
+# Last estimate per scene name, shown by the panel
+ESTIMATES = {}
+# Last verification report per scene name, shown by the panel
+VERIFICATIONS = {}
+
+def render_size(scene):
+    """Output resolution in pixels, including the resolution percentage"""
+    scale = scene.render.resolution_percentage / 100.0
+    return int(scene.render.resolution_x * scale), int(scene.render.resolution_y * scale)
+
+def frame_count(scene):
+    """Number of frames rendered for the scene's frame range"""
+    return max(0, (scene.frame_end - scene.frame_start) // max(1, scene.frame_step) + 1)
+
+class COMPOSITOR_OT_estimate_output_size(Operator):
+    """Estimate bytes and files written per frame and for the frame range, and check free disk space"""
+    bl_idname = "compositor.estimate_output_size"
+    bl_label = "Estimate Output Size"
+    
+    source: EnumProperty(
+        name="Source",
+        items=[
+            ('EXISTING', "Existing Nodes", "Estimate the File Output nodes already in the tree"),
+            ('PLANNED', "Planned Nodes", "Estimate the nodes Connect All ViewLayers would create")
+        ],
+        default='EXISTING'
+    )
+    
+    def execute(self, context):
+        scene = context.scene
+        if not scene.use_nodes or scene.node_tree is None:
+            self.report({'WARNING'}, "Compositor nodes are not enabled")
+            return {'CANCELLED'}
+        
+        settings = scene.viewlayer_connector_settings
+        tree = scene.node_tree
+        
+        if self.source == 'PLANNED':
+            base_filename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] or "untitled"
+            try:
+                plan = plan_connections(snapshot_layers(scene, tree),
+                                        SettingsSnapshot.from_settings(settings), base_filename)
+            except ValueError as e:
+                self.report({'ERROR'}, str(e))
+                return {'CANCELLED'}
+            specs = specs_from_plan(plan)
+        else:
+            specs = specs_from_tree(tree)
+        
+        width, height = render_size(scene)
+        estimate = estimate_outputs(specs, width, height, frame_count(scene), settings.write_throughput)
+        
+        output_dir = bpy.path.abspath(settings.custom_output_path)
+        estimate['disk'] = preflight_disk(output_dir, estimate['bytes_total'])
+        estimate['source'] = self.source
+        ESTIMATES[scene.name] = estimate
+        
+        message = (f"{format_bytes(estimate['bytes_per_frame'])} and {estimate['files_per_frame']} files per frame, "
+                   f"{format_bytes(estimate['bytes_total'])} for {estimate['frames']} frames")
+        if estimate['write_seconds_total'] is not None:
+            message += f", about {format_seconds(estimate['write_seconds_total'])} to write"
+        disk = estimate['disk']
+        if not disk['fits']:
+            self.report({'WARNING'}, f"{message}. Only {format_bytes(disk['free'])} free at {output_dir}")
+        else:
+            self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_render_missing_frames(Operator):
+    """Render only the frames whose File Output files are missing or incomplete, skipping the rest entirely"""
+    bl_idname = "compositor.render_missing_frames"
+    bl_label = "Render Missing Frames"
+    
+    def execute(self, context):
+        scene = context.scene
+        if not scene.use_nodes or scene.node_tree is None:
+            self.report({'WARNING'}, "Compositor nodes are not enabled")
+            return {'CANCELLED'}
+        
+        runs, done = missing_runs(scene)
+        if not runs:
+            self.report({'INFO'}, f"All {done} frames already rendered")
+            return {'FINISHED'}
+        
+        # Render each run of missing frames as its own animation, then restore the range
+        frame_start, frame_end = scene.frame_start, scene.frame_end
+        try:
+            for start, end in runs:
+                scene.frame_start, scene.frame_end = start, end
+                bpy.ops.render.render(animation=True, scene=scene.name)
+        finally:
+            scene.frame_start, scene.frame_end = frame_start, frame_end
+        
+        self.report({'INFO'}, f"Rendered {len(runs)} frame ranges, skipped {done} finished frames")
+        return {'FINISHED'}
+
+def scene_manifest(scene, settings):
+    """Expected-output manifest for the add-on's File Output nodes over the scene's frame range"""
+    _, specs = owned_specs(scene)
+    frames = frame_range(scene.frame_start, scene.frame_end, scene.frame_step)
+    return build_manifest(specs, frames,
+                          output_root=bpy.path.abspath(settings.custom_output_path),
+                          blend_dir=os.path.dirname(bpy.data.filepath),
+                          use_extension=scene.render.use_file_extension,
+                          resolution=render_size(scene),
+                          blend_file=bpy.data.filepath)
+
+class COMPOSITOR_OT_export_output_manifest(Operator):
+    """Write a JSON manifest of every file the add-on's File Output nodes should write over the frame range"""
+    bl_idname = "compositor.export_output_manifest"
+    bl_label = "Export Output Manifest"
+    
+    filepath: StringProperty(subtype='FILE_PATH')
+    
+    def invoke(self, context, event):
+        if not self.filepath:
+            blend = bpy.data.filepath or os.path.join(bpy.path.abspath("//"), "untitled.blend")
+            self.filepath = os.path.splitext(blend)[0] + ".manifest.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        scene = context.scene
+        if not scene.use_nodes or scene.node_tree is None:
+            self.report({'WARNING'}, "Compositor nodes are not enabled")
+            return {'CANCELLED'}
+        
+        manifest = scene_manifest(scene, scene.viewlayer_connector_settings)
+        try:
+            write_manifest(manifest, bpy.path.abspath(self.filepath))
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write manifest: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Wrote {len(manifest['files'])} expected files to {self.filepath}")
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_verify_outputs(Operator):
+    """Check the rendered files against the expected outputs: missing, truncated or wrongly encoded frames"""
+    bl_idname = "compositor.verify_outputs"
+    bl_label = "Verify Outputs"
+    
+    def execute(self, context):
+        scene = context.scene
+        if not scene.use_nodes or scene.node_tree is None:
+            self.report({'WARNING'}, "Compositor nodes are not enabled")
+            return {'CANCELLED'}
+        
+        report = verify_manifest(scene_manifest(scene, scene.viewlayer_connector_settings))
+        VERIFICATIONS[scene.name] = report
+        
+        bad = len(report['missing']) + len(report['truncated']) + len(report['mis_encoded'])
+        message = (f"{report['ok']} of {report['files']} files ok, {len(report['incomplete_frames'])} frames incomplete "
+                   f"({report['seconds']:.2f}s)")
+        self.report({'WARNING'} if bad else {'INFO'}, message)
+        return {'FINISHED'}
@@ -0,0 +1,81 @@
+import bpy
+import json
+import os
+from bpy.types import Operator
+from bpy.props import StringProperty
+from ..utils.connection_planner import SettingsSnapshot, plan_connections
+from ..utils.dry_run import plan_from_tree, preview_report
+from ..utils.plan_applier import snapshot_layers
+
+# Last dry-run report per scene name, shown by the panel
+PREVIEWS = {}
+
+def build_preview(scene):
+    """Plan the connection for scene and diff it against the tree, without creating any node"""
+    tree = scene.node_tree
+    base_filename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] or "untitled"
+    settings = scene.viewlayer_connector_settings
+    plan = plan_connections(snapshot_layers(scene, tree, probe=False),
+                            SettingsSnapshot.from_settings(settings), base_filename)
+    current = plan_from_tree(tree, base_filename)
+    return preview_report(plan, current)
+
+class COMPOSITOR_OT_preview_connection(Operator):
+    """Show the nodes, slots and links Connect All ViewLayers would produce and how they differ from the tree, without changing it"""
+    bl_idname = "compositor.preview_connection"
+    bl_label = "Dry Run"
+    
+    def execute(self, context):
+        scene = context.scene
+        if not scene.use_nodes or scene.node_tree is None:
+            self.report({'WARNING'}, "Compositor nodes are not enabled")
+            return {'CANCELLED'}
+        
+        try:
+            report = build_preview(scene)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        PREVIEWS[scene.name] = report
+        
+        summary = report['summary']
+        self.report({'INFO'}, (f"Would write {summary['outputs']} File Outputs with {summary['slots']} slots: "
+                               f"{summary['added']} added, {summary['changed']} changed, "
+                               f"{summary['removed']} removed nodes"))
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_export_connection_preview(Operator):
+    """Export the dry-run plan and its diff against the current tree as JSON"""
+    bl_idname = "compositor.export_connection_preview"
+    bl_label = "Export Dry Run"
+    
+    filepath: StringProperty(subtype='FILE_PATH')
+    
+    def invoke(self, context, event):
+        if not self.filepath:
+            blend = bpy.data.filepath or os.path.join(bpy.path.abspath("//"), "untitled.blend")
+            self.filepath = os.path.splitext(blend)[0] + ".plan.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        scene = context.scene
+        if not scene.use_nodes or scene.node_tree is None:
+            self.report({'WARNING'}, "Compositor nodes are not enabled")
+            return {'CANCELLED'}
+        
+        try:
+            report = build_preview(scene)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        PREVIEWS[scene.name] = report
+        
+        try:
+            with open(bpy.path.abspath(self.filepath), 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=1)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write plan: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Wrote plan for {report['summary']['outputs']} File Outputs to {self.filepath}")
+        return {'FINISHED'}
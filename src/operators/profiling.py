@@ -0,0 +1,31 @@
+import bpy
+import functools
+import os
+import time
+from ..utils.profiler import Profiler
+
+# Last profile per scene name, shown by the panel
+PROFILES = {}
+
+def operator_profiler(bl_idname, scene):
+    """Profiler for one operator run, enabled and pointed at files by the scene settings"""
+    settings = scene.viewlayer_connector_settings
+    if not settings.use_profiling:
+        return Profiler(bl_idname, enabled=False)
+    directory = bpy.path.abspath(settings.profile_path)
+    stem = os.path.join(directory, f"{bl_idname.replace('.', '_')}_{time.strftime('%Y%m%d-%H%M%S')}")
+    return Profiler(bl_idname, capture_path=stem + ".prof" if settings.profile_capture else None,
+                    json_path=stem + ".json")
+
+def profiled(execute):
+    """Decorate an operator's execute(self, context, profiler) to run inside a profiler and report it"""
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        profiler = operator_profiler(self.bl_idname, context.scene)
+        with profiler:
+            result = execute(self, context, profiler)
+        if profiler.enabled:
+            PROFILES[context.scene.name] = profiler.as_dict()
+            self.report({'INFO'}, profiler.summary())
+        return result
+    return wrapper
@@ -0,0 +1,88 @@
+from bpy.types import Operator
+from ..utils.pass_routing import DEFAULT_RULES
+
+class COMPOSITOR_OT_routing_rule_add(Operator):
+    """Add a pass routing rule"""
+    bl_idname = "compositor.routing_rule_add"
+    bl_label = "Add Routing Rule"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        settings = context.scene.viewlayer_connector_settings
+        rule = settings.routing_rules.add()
+        if settings.output_buckets:
+            rule.bucket = settings.output_buckets[0].name
+        settings.active_routing_rule_index = len(settings.routing_rules) - 1
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_routing_rule_remove(Operator):
+    """Remove the active pass routing rule"""
+    bl_idname = "compositor.routing_rule_remove"
+    bl_label = "Remove Routing Rule"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        settings = context.scene.viewlayer_connector_settings
+        index = settings.active_routing_rule_index
+        if not 0 <= index < len(settings.routing_rules):
+            return {'CANCELLED'}
+        settings.routing_rules.remove(index)
+        settings.active_routing_rule_index = min(index, len(settings.routing_rules) - 1)
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_output_bucket_add(Operator):
+    """Add an output bucket"""
+    bl_idname = "compositor.output_bucket_add"
+    bl_label = "Add Output Bucket"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        settings = context.scene.viewlayer_connector_settings
+        bucket = settings.output_buckets.add()
+        bucket.name = f"bucket{len(settings.output_buckets)}"
+        settings.active_output_bucket_index = len(settings.output_buckets) - 1
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_output_bucket_remove(Operator):
+    """Remove the active output bucket"""
+    bl_idname = "compositor.output_bucket_remove"
+    bl_label = "Remove Output Bucket"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        settings = context.scene.viewlayer_connector_settings
+        index = settings.active_output_bucket_index
+        if not 0 <= index < len(settings.output_buckets):
+            return {'CANCELLED'}
+        settings.output_buckets.remove(index)
+        settings.active_output_bucket_index = min(index, len(settings.output_buckets) - 1)
+        return {'FINISHED'}
+
+class COMPOSITOR_OT_routing_reset_defaults(Operator):
+    """Fill the rule table with the classic main/secondary routing"""
+    bl_idname = "compositor.routing_reset_defaults"
+    bl_label = "Reset Routing Rules"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        settings = context.scene.viewlayer_connector_settings
+        
+        settings.output_buckets.clear()
+        for name, prefix in (("main", "main"), ("secondary", "secondary")):
+            bucket = settings.output_buckets.add()
+            bucket.name = name
+            bucket.file_format = getattr(settings, f"{prefix}_output_format")
+            bucket.exr_codec = getattr(settings, f"{prefix}_exr_codec")
+            bucket.color_depth = getattr(settings, f"{prefix}_exr_bitdepth")
+        
+        settings.routing_rules.clear()
+        for default in DEFAULT_RULES:
+            rule = settings.routing_rules.add()
+            rule.match_type = default.match_type
+            rule.pattern = default.pattern
+            rule.bucket = default.bucket
+        
+        settings.active_routing_rule_index = 0
+        settings.active_output_bucket_index = 0
+        self.report({'INFO'}, "Routing rules reset to defaults")
+        return {'FINISHED'}
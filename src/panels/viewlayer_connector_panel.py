@@ -1,7 +1,175 @@
 import bpy
-import os  # Add this import
-from bpy.types import PropertyGroup, Panel  # Add Panel here
-from bpy.props import BoolProperty, EnumProperty, StringProperty, FloatProperty
+from bpy.types import PropertyGroup, Panel, UIList  # Add Panel here
+from bpy.props import BoolProperty, EnumProperty, StringProperty, FloatProperty, CollectionProperty, IntProperty
+from ..utils.output_estimator import format_bytes, format_seconds
+from ..operators.output_operators import ESTIMATES, VERIFICATIONS
+from ..operators.preview_operators import PREVIEWS
+from ..operators.profiling import PROFILES
+from ..utils import auto_sync, render_stats, staging
+from ..utils.layer_summary import get_summary
+
+FILE_FORMAT_ITEMS = [
+    ('OPEN_EXR_MULTILAYER', "OpenEXR MultiLayer", "Save as multilayer OpenEXR file"),
+    ('OPEN_EXR', "OpenEXR", "Save as OpenEXR file"),
+    ('PNG', "PNG", "Save as PNG file"),
+    ('JPEG', "JPEG", "Save as JPEG file")
+]
+
+EXR_CODEC_ITEMS = [
+    ('NONE', "None", "No compression"),
+    ('ZIPS', "ZIPS", "Lossless ZIP compression, one scanline at a time"),
+    ('ZIP', "ZIP", "Lossless ZIP compression, in blocks of 16 scanlines"),
+    ('PIZ', "PIZ", "Lossless wavelet compression"),
+    ('PXR24', "PXR24", "Lossy compression with 24-bit float precision"),
+    ('DWAA', "DWAA", "Lossy compression with adjustable quality, one scanline at a time"),
+    ('DWAB', "DWAB", "Lossy compression with adjustable quality, in blocks of 32 scanlines")
+]
+
+EXR_BITDEPTH_ITEMS = [
+    ('16', "Half Float (16-bit)", "Half precision floating point (faster, smaller files)"),
+    ('32', "Full Float (32-bit)", "Full precision floating point (slower, but higher quality)")
+]
+
+def update_auto_sync(self, context):
+    """Start or stop following view layer edits for the scene owning these settings"""
+    if self.use_auto_sync:
+        auto_sync.start(self.id_data)
+    else:
+        auto_sync.stop(self.id_data)
+
+class PassRoutingRule(PropertyGroup):
+    """Send passes matching a pattern to an output bucket"""
+    match_type: EnumProperty(
+        name="Match",
+        description="How the pattern is matched against pass names",
+        items=[
+            ('GLOB', "Glob", "Shell style wildcards, e.g. Crypto*"),
+            ('REGEX', "Regex", "Regular expression matching the whole pass name"),
+            ('PASS_TYPE', "Pass Type", "Comma separated pass types: CRYPTOMATTE, AOV, LIGHTGROUP, DATA, IMAGE, LIGHT, OTHER")
+        ],
+        default='GLOB'
+    )
+    
+    pattern: StringProperty(
+        name="Pattern",
+        description="Glob, regular expression or pass types to match",
+        default="*"
+    )
+    
+    bucket: StringProperty(
+        name="Bucket",
+        description="Name of the output bucket matching passes go to",
+        default="main"
+    )
+
+class OutputBucketSettings(PropertyGroup):
+    """A named File Output node setup passes can be routed to"""
+    name: StringProperty(
+        name="Name",
+        description="Bucket name, used in rules and in output node names",
+        default="main"
+    )
+    
+    file_format: EnumProperty(
+        name="File Format",
+        description="File format for this bucket's output node",
+        items=FILE_FORMAT_ITEMS,
+        default='OPEN_EXR_MULTILAYER'
+    )
+    
+    exr_codec: EnumProperty(
+        name="EXR Compression",
+        description="Compression codec for this bucket's EXR files",
+        items=EXR_CODEC_ITEMS,
+        default='ZIP'
+    )
+    
+    color_depth: EnumProperty(
+        name="EXR Bit Depth",
+        description="Bit depth for this bucket's EXR files",
+        items=EXR_BITDEPTH_ITEMS,
+        default='16'
+    )
+
+class COMPOSITOR_UL_routing_rules(UIList):
+    """List of pass routing rules, first match wins"""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "match_type", text="")
+        row.prop(item, "pattern", text="", emboss=False)
+        # Without custom buckets the main/secondary defaults are used
+        known = item.bucket in ([bucket.name for bucket in data.output_buckets] or ('main', 'secondary'))
+        row.alert = not known
+        row.label(text=item.bucket, icon='FORWARD' if known else 'ERROR')
+
+class COMPOSITOR_UL_output_buckets(UIList):
+    """List of output buckets"""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "name", text="", emboss=False, icon='OUTPUT')
+        row.label(text=f"{item.exr_codec} {item.color_depth}")
+
+class COMPOSITOR_UL_layer_status(UIList):
+    """View layers with their cached pass, output, format and size status"""
+    sort_key: EnumProperty(
+        name="Sort By",
+        items=[
+            ('INDEX', "Order", "Scene order"),
+            ('NAME', "Name", "View layer name"),
+            ('PASSES', "Passes", "Enabled pass count"),
+            ('OUTPUTS', "Outputs", "Wired File Output nodes"),
+            ('BYTES', "Size", "Estimated bytes per frame"),
+        ],
+        default='INDEX'
+    )
+    unwired_only: BoolProperty(
+        name="Unwired Only",
+        description="Only show view layers with no File Output node",
+        default=False
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        status = get_summary(context.scene).layers.get(item.name)
+        row = layout.row(align=True)
+        row.prop(item, "use", text="")
+        row.label(text=item.name, icon='RENDERLAYERS' if status and status.outputs else 'ERROR')
+        if status is None:
+            return
+        row.label(text=f"{status.passes} passes")
+        row.label(text=f"{status.outputs} out")
+        row.label(text=", ".join(status.formats) or "-")
+        row.label(text=format_bytes(status.bytes_per_frame) if status.bytes_per_frame else "-")
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+        row = layout.row(align=True)
+        row.prop(self, "sort_key", text="")
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC')
+        row.prop(self, "unwired_only", toggle=True)
+
+    def filter_items(self, context, data, propname):
+        layers = getattr(data, propname)
+        statuses = get_summary(context.scene).layers
+        helpers = bpy.types.UI_UL_list
+        flags = helpers.filter_items_by_name(self.filter_name, self.bitflag_filter_item, layers, "name")
+        if not flags:
+            flags = [self.bitflag_filter_item] * len(layers)
+        if self.unwired_only:
+            for idx, layer in enumerate(layers):
+                status = statuses.get(layer.name)
+                if status is not None and status.outputs:
+                    flags[idx] &= ~self.bitflag_filter_item
+
+        if self.sort_key == 'INDEX':
+            return flags, []
+        if self.sort_key == 'NAME':
+            return flags, helpers.sort_items_by_name(layers, "name")
+        attribute = {'PASSES': "passes", 'OUTPUTS': "outputs", 'BYTES': "bytes_per_frame"}[self.sort_key]
+        keys = [(idx, getattr(statuses[layer.name], attribute) if layer.name in statuses else 0)
+                for idx, layer in enumerate(layers)]
+        return flags, helpers.sort_items_helper(keys, lambda item: item[1], reverse=True)
 
 class ViewLayerConnectorSettings(PropertyGroup):
     include_all_passes: BoolProperty(
@@ -116,6 +284,208 @@ class ViewLayerConnectorSettings(PropertyGroup):
         subtype='DIR_PATH'
     )
     
+    use_routing_rules: BoolProperty(
+        name="Use Routing Rules",
+        description="Route passes to output buckets with the rule table instead of the main/secondary split",
+        default=False
+    )
+    
+    routing_rules: CollectionProperty(type=PassRoutingRule)
+    active_routing_rule_index: IntProperty(default=0)
+    
+    output_buckets: CollectionProperty(type=OutputBucketSettings)
+    active_output_bucket_index: IntProperty(default=0)
+    
+    consolidate_outputs: BoolProperty(
+        name="Consolidate Layers",
+        description="Pack all regular ViewLayers into shared multilayer EXR files with layer-prefixed slots, instead of files per layer",
+        default=False
+    )
+    
+    consolidation_shards: IntProperty(
+        name="Shards",
+        description="Number of multilayer EXR files per output bucket to spread the consolidated layers over",
+        default=1,
+        min=1,
+        max=256
+    )
+    
+    use_io_instrumentation: BoolProperty(
+        name="Record Render I/O",
+        description="Log per-frame compositing and write time, bytes and files written by the add-on's File Output nodes",
+        default=False
+    )
+    
+    io_log_format: EnumProperty(
+        name="Log Format",
+        description="Format of the I/O log written next to the renders",
+        items=[
+            ('JSONL', "JSON Lines", "One JSON record per frame"),
+            ('CSV', "CSV", "One CSV row per frame")
+        ],
+        default='JSONL'
+    )
+    
+    use_profiling: BoolProperty(
+        name="Profile Operators",
+        description="Time every phase of the add-on's operators, log the result and write it as JSON",
+        default=False
+    )
+    
+    profile_capture: BoolProperty(
+        name="cProfile Capture",
+        description="Also record a cProfile .prof file of each operator run (slows it down)",
+        default=False
+    )
+    
+    profile_path: StringProperty(
+        name="Profile Directory",
+        description="Where profile JSON and .prof files are written",
+        default="//profiles/",
+        subtype='DIR_PATH'
+    )
+    
+    use_auto_sync: BoolProperty(
+        name="Auto-Sync",
+        description="Reconcile the nodes of a view layer shortly after it is added, renamed, removed or has passes toggled",
+        default=False,
+        update=update_auto_sync
+    )
+    
+    auto_sync_delay: FloatProperty(
+        name="Delay",
+        description="Seconds without further edits before changes are applied",
+        default=0.5,
+        min=0.1,
+        max=10.0,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE'
+    )
+    
+    use_resume: BoolProperty(
+        name="Resume Mode",
+        description="While rendering, mute the add-on's File Output nodes on frames whose files already exist on disk",
+        default=False
+    )
+    
+    resume_check: EnumProperty(
+        name="Check",
+        description="How existing files are checked before a frame counts as done",
+        items=[
+            ('EXISTS', "Exists", "Files exist and are not empty"),
+            ('SIZE', "Size", "Files are at least the minimum size"),
+            ('HEADER', "Header", "Files are at least the minimum size and start with a valid file header")
+        ],
+        default='EXISTS'
+    )
+    
+    resume_min_size: IntProperty(
+        name="Min Size",
+        description="Smallest file size in bytes accepted as a finished write",
+        default=1024,
+        min=1
+    )
+    
+    use_staging: BoolProperty(
+        name="Stage on Scratch Disk",
+        description="While rendering, write File Outputs to a local scratch directory and transfer finished frames to the output path in the background",
+        default=False
+    )
+    
+    scratch_path: StringProperty(
+        name="Scratch Path",
+        description="Fast local directory the File Output nodes write to while rendering",
+        default="",
+        subtype='DIR_PATH'
+    )
+    
+    staging_mode: EnumProperty(
+        name="Transfer",
+        description="How staged files reach the output path",
+        items=[
+            ('MOVE', "Move", "Remove scratch files once they are safely copied"),
+            ('COPY', "Copy", "Keep a copy on the scratch disk")
+        ],
+        default='MOVE'
+    )
+    
+    staging_workers: IntProperty(
+        name="Transfers",
+        description="Concurrent background transfers",
+        default=2,
+        min=1,
+        max=32
+    )
+    
+    staging_max_pending: IntProperty(
+        name="Queue Size",
+        description="Queued files before the render waits for transfers to catch up",
+        default=64,
+        min=1
+    )
+    
+    staging_verify: BoolProperty(
+        name="Verify Checksums",
+        description="Re-read every copy and compare its checksum before removing the scratch file",
+        default=True
+    )
+    
+    show_layer_status: BoolProperty(
+        name="Show Layers",
+        description="List every view layer with its passes, outputs, formats and estimated size",
+        default=False
+    )
+    
+    layer_status_index: IntProperty(
+        name="Active Layer",
+        default=0
+    )
+    
+    show_dry_run: BoolProperty(
+        name="Show Dry Run",
+        description="Show the nodes the last dry run planned",
+        default=True
+    )
+    
+    dry_run_filter: EnumProperty(
+        name="Show",
+        description="Which planned nodes to list",
+        items=[
+            ('CHANGES', "Changes", "Only nodes that would be added, changed or removed"),
+            ('ALL', "All", "Every planned node")
+        ],
+        default='CHANGES'
+    )
+    
+    write_throughput: FloatProperty(
+        name="Write Throughput",
+        description="Sustained write speed of the output storage in MB/s, used to estimate write time (0 to skip)",
+        default=200.0,
+        min=0.0
+    )
+    
+    show_estimate_details: BoolProperty(
+        name="Show Details",
+        description="Show the estimate per output node and per ViewLayer",
+        default=False
+    )
+    
+    last_run_id: StringProperty(
+        name="Last Run",
+        description="ID of the last Connect run, stored on every node it created or updated",
+        default=""
+    )
+    
+    connect_mode: EnumProperty(
+        name="Connect Mode",
+        description="How Connect All ViewLayers treats nodes that already exist",
+        items=[
+            ('REBUILD', "Rebuild", "Create a fresh set of nodes for every ViewLayer"),
+            ('RECONCILE', "Reconcile", "Only create, update or remove the nodes, slots and links that changed")
+        ],
+        default='REBUILD'
+    )
+    
     # New organizational settings
     clear_existing: BoolProperty(
         name="Clear Existing Nodes",
@@ -142,9 +512,39 @@ class ViewLayerConnectorSettings(PropertyGroup):
         default=True
     )
     
+    frame_group_depth: IntProperty(
+        name="Frame Depth",
+        description="How many leading name tokens nest into frames, e.g. 2 gives EP01 > EP01_SQ010",
+        default=2,
+        min=1,
+        max=6
+    )
+    
+    frame_separators: StringProperty(
+        name="Separators",
+        description="Characters that split view layer names into prefix tokens",
+        default="_.- "
+    )
+    
+    frame_min_layers: IntProperty(
+        name="Min Layers",
+        description="Fewest view layers a prefix needs to get its own frame, 1 frames every prefix",
+        default=1,
+        min=1,
+        max=100
+    )
+    
+    frame_pack_columns: IntProperty(
+        name="Frame Columns",
+        description="Columns to pack frames into, 0 picks about the square root of the frame count",
+        default=0,
+        min=0,
+        max=64
+    )
+    
     node_spacing: FloatProperty(
         name="Node Spacing",
-        description="Spacing between nodes",
+        description="Gap between node columns when organizing; nodes in a column are stacked a fifth of this apart",
         default=300.0,
         min=100.0,
         max=1000.0
@@ -192,15 +592,26 @@ class COMPOSITOR_PT_viewlayer_connector(Panel):
             row.operator("compositor.setup_nodes", text="Enable Nodes", icon='NODETREE')
             return
             
+        # Counts come from the cached summary, rebuilt only when the tree or view layers change
+        summary = get_summary(context.scene)
+        row = box.row()
+        row.label(text=f"ViewLayers: {summary.enabled_count}/{summary.layer_count}", icon='RENDERLAYERS')
+        row.label(text=f"Wired: {summary.wired_count}", icon='LINKED')
+        if summary.bytes_per_frame:
+            row = box.row()
+            row.label(text=f"Per frame: {format_bytes(summary.bytes_per_frame)}", icon='DISK_DRIVE')
+        
         row = box.row()
-        viewlayer_count = len(context.scene.view_layers)
-        row.label(text=f"ViewLayers: {viewlayer_count}", icon='RENDERLAYERS')
+        row.prop(settings, "show_layer_status", text="Layers",
+                 icon='TRIA_DOWN' if settings.show_layer_status else 'TRIA_RIGHT', emboss=False)
+        if settings.show_layer_status:
+            box.template_list("COMPOSITOR_UL_layer_status", "", context.scene, "view_layers",
+                              settings, "layer_status_index", rows=8)
         
         # Show current file path status
         row = box.row()
-        if bpy.data.is_saved:
-            basename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0]
-            row.label(text=f"File: {basename}", icon='FILE_BLEND')
+        if summary.file_name:
+            row.label(text=f"File: {summary.file_name}", icon='FILE_BLEND')
         else:
             row.label(text="File not saved", icon='ERROR')
             row = box.row()
@@ -248,6 +659,20 @@ class COMPOSITOR_PT_viewlayer_connector(Panel):
             row = box.row()
             row.label(text="Contains only Depth, Position, Normal, and Cryptomatte passes")
         
+        # Rule based routing to any number of output buckets
+        box.separator()
+        row = box.row()
+        row.prop(settings, "use_routing_rules")
+        if settings.use_routing_rules:
+            self.draw_routing_rules(box, settings)
+        
+        # Cross-layer consolidation into shared multilayer EXRs
+        box.separator()
+        row = box.row()
+        row.prop(settings, "consolidate_outputs")
+        if settings.consolidate_outputs:
+            row.prop(settings, "consolidation_shards")
+        
         box.separator()
         row = box.row()
         row.prop(settings, "include_all_passes")
@@ -257,6 +682,9 @@ class COMPOSITOR_PT_viewlayer_connector(Panel):
         
         # Action buttons section
         layout.separator()
+        row = layout.row()
+        row.prop(settings, "connect_mode", expand=True)
+        
         row = layout.row(align=True)
         connect_op = row.operator("compositor.connect_viewlayers_to_output", 
                                  text="Connect All ViewLayers", 
@@ -266,6 +694,33 @@ class COMPOSITOR_PT_viewlayer_connector(Panel):
         clear_op = row.operator("compositor.clear_viewlayer_outputs", 
                                text="Clear Existing Nodes", 
                                icon='TRASH')
+        clear_op.scope = 'ALL'
+        if settings.last_run_id:
+            row.operator("compositor.clear_viewlayer_outputs", text="Last Run").scope = 'LAST_RUN'
+        
+        # Follow view layer edits as they happen
+        self.draw_auto_sync(layout, context, settings)
+        
+        # Plan preview without touching the tree
+        self.draw_dry_run(layout, context, settings)
+
+        # Output size estimate and disk pre-flight
+        self.draw_estimate(layout, context, settings)
+        
+        # Render-time I/O statistics
+        self.draw_io_stats(layout, settings)
+        
+        # Skip frames already on disk
+        self.draw_resume(layout, settings)
+        
+        # Local scratch staging
+        self.draw_staging(layout, settings)
+        
+        # Manifest export and verification of rendered files
+        self.draw_verification(layout, context)
+        
+        # Phase timings of the last operator run
+        self.draw_profiling(layout, context, settings)
 
         # Organizational options
         box = layout.box()
@@ -280,6 +735,12 @@ class COMPOSITOR_PT_viewlayer_connector(Panel):
         # New option for frame grouping by prefix
         row = box.row()
         row.prop(settings, "auto_frame_by_prefix")
+        if settings.auto_frame_by_prefix:
+            col = box.column(align=True)
+            col.prop(settings, "frame_group_depth")
+            col.prop(settings, "frame_separators")
+            col.prop(settings, "frame_min_layers")
+            col.prop(settings, "frame_pack_columns")
 
         row = box.row()
         row.prop(settings, "auto_organize")
@@ -302,4 +763,217 @@ class COMPOSITOR_PT_viewlayer_connector(Panel):
         row.operator("compositor.group_by_prefix_in_frames", text="Group by Prefix in Frames", icon='SEQUENCE')
         
         row = layout.row(align=True)
-        row.operator("compositor.connect_sorted_viewlayers", text="Connect Sorted ViewLayers", icon='SORTSIZE')
\ No newline at end of file
+        row.operator("compositor.connect_sorted_viewlayers", text="Connect Sorted ViewLayers", icon='SORTSIZE')
+    
+    def draw_routing_rules(self, layout, settings):
+        row = layout.row()
+        row.label(text="Rules (first match wins):")
+        row = layout.row()
+        row.template_list("COMPOSITOR_UL_routing_rules", "", settings, "routing_rules",
+                          settings, "active_routing_rule_index", rows=3)
+        col = row.column(align=True)
+        col.operator("compositor.routing_rule_add", text="", icon='ADD')
+        col.operator("compositor.routing_rule_remove", text="", icon='REMOVE')
+        
+        if 0 <= settings.active_routing_rule_index < len(settings.routing_rules):
+            rule = settings.routing_rules[settings.active_routing_rule_index]
+            col = layout.column(align=True)
+            col.prop(rule, "match_type")
+            col.prop(rule, "pattern")
+            col.prop_search(rule, "bucket", settings, "output_buckets")
+        
+        row = layout.row()
+        row.label(text="Output Buckets:")
+        row = layout.row()
+        row.template_list("COMPOSITOR_UL_output_buckets", "", settings, "output_buckets",
+                          settings, "active_output_bucket_index", rows=3)
+        col = row.column(align=True)
+        col.operator("compositor.output_bucket_add", text="", icon='ADD')
+        col.operator("compositor.output_bucket_remove", text="", icon='REMOVE')
+        
+        if 0 <= settings.active_output_bucket_index < len(settings.output_buckets):
+            bucket = settings.output_buckets[settings.active_output_bucket_index]
+            col = layout.column(align=True)
+            col.prop(bucket, "file_format")
+            if bucket.file_format in ['OPEN_EXR', 'OPEN_EXR_MULTILAYER']:
+                col.prop(bucket, "color_depth")
+                col.prop(bucket, "exr_codec")
+        
+        row = layout.row()
+        row.operator("compositor.routing_reset_defaults", text="Reset to Defaults", icon='LOOP_BACK')
+        if not settings.routing_rules or not settings.output_buckets:
+            row = layout.row()
+            row.label(text="Empty tables use the main/secondary defaults", icon='INFO')
+    
+    def draw_estimate(self, layout, context, settings):
+        box = layout.box()
+        box.label(text="Output Estimate", icon='DISK_DRIVE')
+        row = box.row(align=True)
+        row.operator("compositor.estimate_output_size", text="Existing").source = 'EXISTING'
+        row.operator("compositor.estimate_output_size", text="Planned").source = 'PLANNED'
+        box.prop(settings, "write_throughput")
+        
+        estimate = ESTIMATES.get(context.scene.name)
+        if estimate is None:
+            return
+        
+        col = box.column(align=True)
+        col.label(text=f"Per frame: {format_bytes(estimate['bytes_per_frame'])}, {estimate['files_per_frame']} files")
+        col.label(text=f"{estimate['frames']} frames: {format_bytes(estimate['bytes_total'])}, {estimate['files_total']} files")
+        if estimate['write_seconds_total'] is not None:
+            col.label(text=f"Write time: {format_seconds(estimate['write_seconds_per_frame'])} per frame, "
+                           f"{format_seconds(estimate['write_seconds_total'])} in total", icon='TIME')
+        disk = estimate['disk']
+        if disk['free'] is None:
+            col.label(text="Free space unknown", icon='QUESTION')
+        elif disk['fits']:
+            col.label(text=f"Free: {format_bytes(disk['free'])}", icon='CHECKMARK')
+        else:
+            col.label(text=f"Not enough space: {format_bytes(disk['free'])} free", icon='ERROR')
+        
+        box.prop(settings, "show_estimate_details")
+        if settings.show_estimate_details:
+            col = box.column(align=True)
+            col.label(text="Per node:")
+            for node in estimate['nodes'][:20]:
+                col.label(text=f"{node['name']}: {format_bytes(node['bytes_per_frame'])}")
+            col.label(text="Per ViewLayer:")
+            for layer, size in list(estimate['layers'].items())[:20]:
+                col.label(text=f"{layer or '(unlinked)'}: {format_bytes(size)}")
+    
+    def draw_io_stats(self, layout, settings):
+        box = layout.box()
+        row = box.row()
+        row.prop(settings, "use_io_instrumentation")
+        if not settings.use_io_instrumentation:
+            return
+        row.prop(settings, "io_log_format", text="")
+        
+        stats = render_stats.summary()
+        if stats is None:
+            box.label(text="No frames recorded yet", icon='INFO')
+            return
+        
+        col = box.column(align=True)
+        col.label(text=f"Last {stats['frames']} frames (average):")
+        col.label(text=f"Render: {stats['render_seconds']:.2f}s")
+        if stats['composite_seconds'] is not None:
+            col.label(text=f"Compositing: {stats['composite_seconds']:.2f}s")
+        if stats['output_write_seconds'] is not None:
+            col.label(text=f"File Outputs written: {stats['output_write_seconds']:.2f}s into compositing")
+        if stats['image_save_seconds'] is not None:
+            col.label(text=f"Main image save: {stats['image_save_seconds']:.2f}s")
+        col.label(text=f"Written: {format_bytes(stats['bytes'])} in {stats['files']:.0f} files")
+        if stats['missing']:
+            col.label(text=f"{stats['missing']} expected files missing", icon='ERROR')
+
+    def draw_profiling(self, layout, context, settings):
+        box = layout.box()
+        row = box.row()
+        row.prop(settings, "use_profiling")
+        if not settings.use_profiling:
+            return
+        row.prop(settings, "profile_capture")
+        box.prop(settings, "profile_path")
+        profile = PROFILES.get(context.scene.name)
+        if profile is None:
+            return
+        col = box.column(align=True)
+        col.label(text=f"{profile['operator']}: {profile['total_ms']:.1f} ms", icon='TIME')
+        for name, phase in profile['phases'].items():
+            col.label(text=f"    {name}: {phase['ms']:.1f} ms ({phase['calls']} calls)")
+
+    def draw_auto_sync(self, layout, context, settings):
+        box = layout.box()
+        row = box.row()
+        row.prop(settings, "use_auto_sync")
+        row.prop(settings, "auto_sync_delay")
+        if settings.use_auto_sync and not bpy.data.is_saved:
+            box.label(text="Save the file to start syncing", icon='ERROR')
+        stats = auto_sync.LAST_SYNC.get(context.scene.name)
+        if settings.use_auto_sync and stats is not None:
+            box.label(text=(f"Last sync: {stats['created']} created, {stats['updated']} updated, "
+                            f"{stats['removed']} removed"), icon='FILE_REFRESH')
+
+    def draw_resume(self, layout, settings):
+        box = layout.box()
+        row = box.row()
+        row.prop(settings, "use_resume")
+        row.prop(settings, "resume_check", text="")
+        if settings.resume_check in ('SIZE', 'HEADER'):
+            box.prop(settings, "resume_min_size")
+        box.operator("compositor.render_missing_frames", icon='RENDER_ANIMATION')
+
+    def draw_staging(self, layout, settings):
+        box = layout.box()
+        box.prop(settings, "use_staging")
+        if not settings.use_staging:
+            return
+        box.prop(settings, "scratch_path")
+        row = box.row(align=True)
+        row.prop(settings, "staging_mode", expand=True)
+        row = box.row(align=True)
+        row.prop(settings, "staging_workers")
+        row.prop(settings, "staging_max_pending")
+        box.prop(settings, "staging_verify")
+        
+        result = staging.status()
+        if result is not None:
+            col = box.column(align=True)
+            col.label(text=f"Transferred {result['transferred']} files, {format_bytes(result['bytes'])}")
+            if result['pending']:
+                col.label(text=f"{result['pending']} queued")
+            if result['failed']:
+                col.label(text=f"{len(result['failed'])} transfers failed", icon='ERROR')
+
+    def draw_verification(self, layout, context):
+        box = layout.box()
+        box.label(text="Output Verification", icon='CHECKMARK')
+        row = box.row(align=True)
+        row.operator("compositor.export_output_manifest", icon='EXPORT')
+        row.operator("compositor.verify_outputs", icon='CHECKMARK')
+        report = VERIFICATIONS.get(context.scene.name)
+        if report is not None:
+            col = box.column(align=True)
+            col.label(text=f"{report['ok']} of {report['files']} files ok")
+            for kind, label in (('missing', "missing"), ('truncated', "truncated"), ('mis_encoded', "mis-encoded")):
+                if report[kind]:
+                    col.label(text=f"{len(report[kind])} {label}", icon='ERROR')
+            frames = report['incomplete_frames']
+            if frames:
+                shown = ", ".join(str(f) for f in frames[:10])
+                col.label(text=f"Incomplete frames: {shown}{' ...' if len(frames) > 10 else ''}")
+
+    def draw_dry_run(self, layout, context, settings):
+        box = layout.box()
+        row = box.row(align=True)
+        report = PREVIEWS.get(context.scene.name)
+        if report is not None:
+            row.prop(settings, "show_dry_run", text="",
+                     icon='TRIA_DOWN' if settings.show_dry_run else 'TRIA_RIGHT', emboss=False)
+        row.operator("compositor.preview_connection", icon='VIEWZOOM')
+        row.operator("compositor.export_connection_preview", text="", icon='EXPORT')
+        if report is None:
+            return
+        
+        summary = report['summary']
+        col = box.column(align=True)
+        col.label(text=(f"{summary['render_layers']} Render Layers, {summary['outputs']} File Outputs, "
+                        f"{summary['slots']} slots"))
+        col.label(text=f"{summary['added']} added, {summary['changed']} changed, {summary['removed']} removed")
+        if not settings.show_dry_run:
+            return
+        
+        box.prop(settings, "dry_run_filter", expand=True)
+        icons = {'ADDED': 'ADD', 'CHANGED': 'MODIFIER', 'UNCHANGED': 'CHECKMARK'}
+        rows = [node for node in report['outputs']
+                if settings.dry_run_filter == 'ALL' or node['status'] != 'UNCHANGED']
+        col = box.column(align=True)
+        for node in rows[:50]:
+            col.label(text=f"{node['name']}  ({len(node['slots'])} slots, {node['file_format']})",
+                      icon=icons[node['status']])
+            col.label(text=f"    {node['base_path']}")
+        if len(rows) > 50:
+            col.label(text=f"... {len(rows) - 50} more, export for the full list")
+        for name in report['diff']['removed'][:20]:
+            col.label(text=name, icon='REMOVE')
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Live auto-sync: keep the add-on's nodes in step with view layer edits.
+
+Each view layer of a scene with use_auto_sync is subscribed to through
+msgbus, so renames and pass toggles report which layer changed, and the
+scene's view_layers collection reports layers being added or removed.
+Notifications only collect the changed layers; a timer restarted on every
+notification applies them once the burst is over. Only the changed layers
+are snapshotted again, the plan is rebuilt from cached snapshots in pure
+Python, and just the nodes whose plan differs are reconciled, so an edit
+costs about the same in a 10 or a 1000 layer scene.
+"""
+import os
+
+import bpy
+from bpy.app.handlers import persistent
+from .connection_planner import SettingsSnapshot, diff_plans, plan_connections, plan_subset, rl_node_name
+from .plan_applier import apply_plan, layer_snapshot, snapshot_layers
+from .ownership import new_run_id
+from .profiler import logger
+from . import tree_index
+
+# scene pointer -> {'layers': {view layer pointer: LayerSnapshot}, 'plan': ConnectionPlan}
+_states = {}
+# scene pointer -> {'layers': set of changed view layer pointers, 'structural': bool}
+_pending = {}
+_msgbus_owner = object()
+# Stats of the last sync per scene name, for the panel
+LAST_SYNC = {}
+
+def _enabled(scene):
+    settings = getattr(scene, "viewlayer_connector_settings", None)
+    return settings is not None and settings.use_auto_sync
+
+def _base_filename():
+    return os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] if bpy.data.is_saved else ""
+
+def _scene(pointer):
+    for scene in bpy.data.scenes:
+        if scene.as_pointer() == pointer:
+            return scene
+    return None
+
+def _rl_node(tree, viewlayer):
+    """The add-on's Render Layers node for viewlayer, found by name rather than through the tree index"""
+    node = tree.nodes.get(rl_node_name(viewlayer.name))
+    if node is not None and node.type == 'R_LAYERS' and node.layer == viewlayer.name:
+        return node
+    return None
+
+def _plan(scene, snapshots):
+    settings = SettingsSnapshot.from_settings(scene.viewlayer_connector_settings)
+    return plan_connections(snapshots, settings, _base_filename())
+
+def start(scene):
+    """Reconcile the whole scene once, remember its state and start following edits"""
+    if not bpy.data.is_saved or not scene.view_layers:
+        return None
+    scene.use_nodes = True
+    tree = scene.node_tree
+    snapshots = snapshot_layers(scene, tree)
+    plan = _plan(scene, snapshots)
+    stats = apply_plan(tree, plan, 'RECONCILE', run_id=new_run_id())
+    _states[scene.as_pointer()] = {
+        'layers': {vl.as_pointer(): snapshot for vl, snapshot in zip(scene.view_layers, snapshots)},
+        'plan': plan,
+    }
+    subscribe_msgbus()
+    return stats
+
+def stop(scene):
+    """Forget the scene's state and drop its subscriptions"""
+    _states.pop(scene.as_pointer(), None)
+    _pending.pop(scene.as_pointer(), None)
+    subscribe_msgbus()
+
+def sync(scene, changed, structural=False):
+    """
+    Reconcile the nodes of the view layers in changed (a set of view layer
+    pointers), plus layers added or removed when structural is True.
+    Returns the apply stats, or None when there was nothing to do.
+    """
+    state = _states.get(scene.as_pointer())
+    if state is None:
+        return start(scene)
+    tree = scene.node_tree
+    if tree is None or not bpy.data.is_saved:
+        return None
+
+    cached = state['layers']
+    layers = {}
+    snapshots = []
+    for viewlayer in scene.view_layers:
+        pointer = viewlayer.as_pointer()
+        snapshot = cached.get(pointer)
+        # A reused pointer or a rename missed by msgbus shows up as a different name
+        if snapshot is None or pointer in changed or (structural and snapshot.name != viewlayer.name):
+            snapshot = layer_snapshot(viewlayer, _rl_node(tree, viewlayer))
+        layers[pointer] = snapshot
+        snapshots.append(snapshot)
+    if structural and layers.keys() != cached.keys():
+        subscribe_msgbus()
+
+    plan = _plan(scene, snapshots)
+    diff = diff_plans(state['plan'], plan)
+    state['layers'] = layers
+    state['plan'] = plan
+    names = set(diff['added']) | set(diff['changed'])
+    if not names and not diff['removed']:
+        return None
+
+    subset = plan_subset(plan, names)
+    wanted = names | {slot.source_node for node in subset.outputs for slot in node.slots}
+    existing = {}
+    for name in wanted:
+        node = tree.nodes.get(name)
+        if node is not None:
+            existing[name] = node
+    stats = apply_plan(tree, subset, 'RECONCILE', run_id=new_run_id(), existing=existing, prune=False)
+    for name in diff['removed']:
+        node = tree.nodes.get(name)
+        if node is not None:
+            tree.nodes.remove(node)
+            stats['removed'] += 1
+    tree_index.invalidate(tree)
+    return stats
+
+def _render_running():
+    return hasattr(bpy.app, "is_job_running") and bpy.app.is_job_running('RENDER')
+
+def _flush():
+    if _render_running():
+        return 1.0
+    pending = dict(_pending)
+    _pending.clear()
+    for pointer, change in pending.items():
+        scene = _scene(pointer)
+        if scene is None or not _enabled(scene):
+            continue
+        try:
+            stats = sync(scene, change['layers'], change['structural'])
+        except ValueError as e:
+            # An invalid routing rule table, reported until the rules are fixed
+            logger.error("auto-sync %s: %s", scene.name, e)
+            continue
+        if stats is not None:
+            LAST_SYNC[scene.name] = stats
+            logger.info("auto-sync %s: %d created, %d updated, %d removed nodes",
+                        scene.name, stats['created'], stats['updated'], stats['removed'])
+    return None
+
+def _schedule(scene_pointer, layer_pointer=None, structural=False):
+    change = _pending.setdefault(scene_pointer, {'layers': set(), 'structural': False})
+    if layer_pointer is not None:
+        change['layers'].add(layer_pointer)
+    change['structural'] |= structural
+    scene = _scene(scene_pointer)
+    delay = scene.viewlayer_connector_settings.auto_sync_delay if scene is not None else 0.5
+    # Restart the timer so a burst of edits is applied once, after the last one
+    if bpy.app.timers.is_registered(_flush):
+        bpy.app.timers.unregister(_flush)
+    bpy.app.timers.register(_flush, first_interval=delay)
+
+def _on_layer_changed(scene_pointer, layer_pointer):
+    _schedule(scene_pointer, layer_pointer)
+
+def _on_layers_changed(scene_pointer):
+    _schedule(scene_pointer, structural=True)
+
+def subscribe_msgbus():
+    """Subscribe to every view layer of the scenes being followed"""
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for scene in bpy.data.scenes:
+        if scene.as_pointer() not in _states:
+            continue
+        scene_pointer = scene.as_pointer()
+        bpy.msgbus.subscribe_rna(key=scene.path_resolve("view_layers", False), owner=_msgbus_owner,
+                                 args=(scene_pointer,), notify=_on_layers_changed)
+        for viewlayer in scene.view_layers:
+            args = (scene_pointer, viewlayer.as_pointer())
+            # Any property of the layer, which covers its name and the pass toggles
+            bpy.msgbus.subscribe_rna(key=viewlayer, owner=_msgbus_owner, args=args, notify=_on_layer_changed)
+            cycles = getattr(viewlayer, "cycles", None)
+            if cycles is not None:
+                bpy.msgbus.subscribe_rna(key=cycles, owner=_msgbus_owner, args=args, notify=_on_layer_changed)
+
+def _reset():
+    """Pointers are stale after undo or a file load: rebuild the cached state without touching the tree"""
+    _states.clear()
+    _pending.clear()
+    for scene in bpy.data.scenes:
+        if _enabled(scene) and scene.node_tree is not None and bpy.data.is_saved:
+            snapshots = snapshot_layers(scene, scene.node_tree, probe=False)
+            _states[scene.as_pointer()] = {
+                'layers': {vl.as_pointer(): snapshot for vl, snapshot in zip(scene.view_layers, snapshots)},
+                'plan': _plan(scene, snapshots),
+            }
+    subscribe_msgbus()
+
+@persistent
+def _on_reset(*args):
+    _reset()
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    # Adding or removing a layer does not always reach msgbus, a count check is cheap
+    state = _states.get(scene.as_pointer())
+    if state is not None and len(scene.view_layers) != len(state['layers']):
+        if scene.as_pointer() not in _pending:
+            _schedule(scene.as_pointer(), structural=True)
+
+_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+    (bpy.app.handlers.undo_post, _on_reset),
+    (bpy.app.handlers.redo_post, _on_reset),
+    (bpy.app.handlers.load_post, _on_reset),
+)
+
+def register():
+    for handlers, func in _HANDLERS:
+        if func not in handlers:
+            handlers.append(func)
+
+def unregister():
+    if bpy.app.timers.is_registered(_flush):
+        bpy.app.timers.unregister(_flush)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for handlers, func in _HANDLERS:
+        if func in handlers:
+            handlers.remove(func)
+    _states.clear()
+    _pending.clear()
@@ -0,0 +1,458 @@
+"""
+Pure Python planning of ViewLayer to File Output connections.
+
+Nothing in here imports bpy: the planner works on plain snapshots of the
+view layers and settings and returns an immutable ConnectionPlan, which
+plan_applier.py materializes in the compositor tree. This keeps all routing
+decisions cheap, cacheable and testable outside of Blender.
+"""
+import os
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from .pass_routing import DEFAULT_RULES, OutputBucket, buckets_from, compile_router, rules_from
+
+# Passes that go to the secondary output node when it is enabled
+SECONDARY_PASSES = ('Depth', 'Position', 'Normal', 'Vector')
+EXR_FORMATS = ('OPEN_EXR', 'OPEN_EXR_MULTILAYER')
+GP_OUTPUT_NAME = "GREASE_PENCIL_OUTPUTS"
+CONSOLIDATED_PREFIX = "CONSOLIDATED"
+
+# Settings the planner depends on, in ViewLayerConnectorSettings naming
+PLANNER_SETTINGS = (
+    'main_output_format',
+    'main_exr_codec',
+    'main_exr_bitdepth',
+    'use_secondary_output',
+    'secondary_output_format',
+    'secondary_exr_codec',
+    'secondary_exr_bitdepth',
+    'custom_output_path',
+    'use_routing_rules',
+    'routing_rules',
+    'output_buckets',
+    'consolidate_outputs',
+    'consolidation_shards',
+)
+
+# Default node placement
+START_X = 0
+START_Y = 0
+SPACING_Y = -300
+
+def clean_viewlayer_name(name):
+    """
+    Clean the viewlayer name:
+    1. Replace dots with underscores
+    2. Remove the final .vl suffix if present
+    3. Remove the last underscores
+    """
+    # Remove .vl suffix if present
+    if name.endswith(".vl"):
+        name = name[:-3]
+
+    # Replace dots with underscores
+    cleaned_name = name.replace('.', '_')
+
+    return cleaned_name
+
+def clean_gp_layer_name(name):
+    """
+    Clean the grease pencil layer name:
+    1. Remove the .gp.vl suffix
+    2. Replace dots with underscores
+    """
+    # Remove .gp.vl suffix if present
+    if name.endswith(".gp.vl"):
+        name = name[:-6]
+    elif name.endswith(".gp"):  # Also handle just .gp suffix
+        name = name[:-3]
+
+    # Replace dots with underscores
+    cleaned_name = name.replace('.', '_')
+
+    return cleaned_name
+
+def is_gp_layer(name):
+    """Return True for grease pencil view layers (.gp.vl or .gp suffix)"""
+    return name.endswith(".gp.vl") or name.endswith(".gp")
+
+def is_secondary_pass(pass_name):
+    """Return True if the pass belongs on the secondary output node"""
+    return pass_name in SECONDARY_PASSES or pass_name.startswith('Crypto')
+
+def bit_depth_suffix(bitdepth):
+    """Name suffix used for output nodes of the given EXR bit depth"""
+    return "EXR16" if bitdepth == '16' else "EXR32"
+
+def rl_node_name(layer_name):
+    """Name of the Render Layers node for a view layer"""
+    return f"ViewLayer_{layer_name}"
+
+def normalize_output_path(path):
+    """Make sure the output directory ends with a separator"""
+    if not path.endswith(os.sep):
+        path += os.sep
+    return path
+
+@dataclass(frozen=True)
+class LayerSnapshot:
+    """A view layer name and the names of its enabled Render Layers outputs, in socket order"""
+    name: str
+    passes: tuple
+    aovs: tuple = ()
+    lightgroups: tuple = ()
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """The subset of ViewLayerConnectorSettings the planner reads"""
+    main_output_format: str = 'OPEN_EXR_MULTILAYER'
+    main_exr_codec: str = 'PXR24'
+    main_exr_bitdepth: str = '16'
+    use_secondary_output: bool = True
+    secondary_output_format: str = 'OPEN_EXR_MULTILAYER'
+    secondary_exr_codec: str = 'ZIP'
+    secondary_exr_bitdepth: str = '32'
+    custom_output_path: str = "//renders/"
+    use_routing_rules: bool = False
+    routing_rules: tuple = ()
+    output_buckets: tuple = ()
+    consolidate_outputs: bool = False
+    consolidation_shards: int = 1
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Read every planner setting once from a settings object or mapping"""
+        if isinstance(settings, dict):
+            values = {key: settings[key] for key in PLANNER_SETTINGS if key in settings}
+        else:
+            values = {key: getattr(settings, key) for key in PLANNER_SETTINGS}
+        values['routing_rules'] = rules_from(values.get('routing_rules', ()))
+        values['output_buckets'] = buckets_from(values.get('output_buckets', ()))
+        return cls(**values)
+
+    def router(self):
+        """
+        The compiled pass router for these settings. Without custom buckets the
+        main and secondary output settings act as the 'main' and 'secondary' buckets.
+        Without rules the default rules apply, minus those naming a bucket the
+        custom buckets do not define. Raises ValueError for an invalid rule table.
+        """
+        buckets = self.output_buckets or (
+            OutputBucket('main', self.main_output_format, self.main_exr_codec, self.main_exr_bitdepth),
+            OutputBucket('secondary', self.secondary_output_format, self.secondary_exr_codec,
+                         self.secondary_exr_bitdepth),
+        )
+        rules = self.routing_rules
+        if not rules:
+            names = {bucket.name for bucket in buckets}
+            rules = tuple(rule for rule in DEFAULT_RULES if rule.bucket in names)
+        return compile_router(rules, buckets)
+
+@dataclass(frozen=True)
+class SlotPlan:
+    """One file slot and the Render Layers socket linked into it"""
+    path: str
+    source_node: str
+    source_socket: str
+
+@dataclass(frozen=True)
+class RenderLayerPlan:
+    """A Render Layers node"""
+    name: str
+    label: str
+    layer: str
+    location: tuple
+
+@dataclass(frozen=True)
+class OutputNodePlan:
+    """A File Output node with its format and slots"""
+    name: str
+    label: str
+    base_path: str
+    file_format: str
+    exr_codec: str
+    color_depth: str
+    slots: tuple
+    location: tuple
+    layer: str = ""
+
+@dataclass(frozen=True)
+class ConnectionPlan:
+    """Everything Connect All ViewLayers would create, in creation order"""
+    base_filename: str
+    render_layers: tuple
+    outputs: tuple
+    gp_layer_count: int = 0
+    regular_layer_count: int = 0
+
+    def node_names(self):
+        """Names of all nodes in the plan"""
+        return {n.name for n in self.render_layers} | {n.name for n in self.outputs}
+
+    def slot_count(self):
+        """Total number of file slots in the plan"""
+        return sum(len(n.slots) for n in self.outputs)
+
+def plan_gp_outputs(gp_layers, output_path):
+    """Plan the shared grease pencil output node, fed by the Image pass of every GP layer"""
+    slots = tuple(
+        SlotPlan(clean_gp_layer_name(layer.name), rl_node_name(layer.name), "Image")
+        for layer in gp_layers if "Image" in layer.passes
+    )
+    return OutputNodePlan(
+        name=GP_OUTPUT_NAME,
+        label=GP_OUTPUT_NAME,
+        base_path=output_path + GP_OUTPUT_NAME + "/",
+        # Fixed file format for GP output: 16-bit EXR with PXR24 compression
+        file_format='OPEN_EXR',
+        exr_codec='PXR24',
+        color_depth='16',
+        slots=slots,
+        location=(START_X + 600, START_Y - 400),
+    )
+
+class RoutingCache:
+    """
+    Bounded LRU cache of routing results keyed by pass signature.
+    Most view layers share the same enabled passes, so routing is computed
+    once per distinct signature instead of once per layer.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() on a miss"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+# Shared across planner runs, routing only depends on the signature
+ROUTING_CACHE = RoutingCache()
+
+def _route_passes(passes, use_secondary):
+    main = [p for p in passes if not is_secondary_pass(p)]
+    secondary = [p for p in passes if is_secondary_pass(p)]
+    if not use_secondary:
+        return tuple(main + secondary), ()
+    return tuple(main), tuple(secondary)
+
+def route_passes(passes, use_secondary, cache=ROUTING_CACHE):
+    """
+    Split enabled pass names into (main, secondary) tuples.
+    If the secondary output is disabled, secondary passes stay on the main node.
+    Results are memoized in cache by (passes, use_secondary); pass cache=None to skip it.
+    """
+    passes = tuple(passes)
+    if cache is None:
+        return _route_passes(passes, use_secondary)
+    return cache.get_or_compute((passes, use_secondary),
+                                lambda: _route_passes(passes, use_secondary))
+
+def layer_routes(layer, settings, cache=ROUTING_CACHE):
+    """
+    Route a regular layer's passes.
+    Returns [(bucket_name, OutputBucket, passes), ...] for every non-empty bucket,
+    using the rule table or the classic main/secondary split.
+    """
+    if settings.use_routing_rules:
+        router = settings.router()
+        if cache is None:
+            routed = router.route(layer.passes, layer.aovs, layer.lightgroups)
+        else:
+            key = ('RULES', tuple(layer.passes), layer.aovs, layer.lightgroups, router)
+            routed = cache.get_or_compute(key, lambda: router.route(layer.passes, layer.aovs, layer.lightgroups))
+        buckets = {b.name: b for b in router.buckets}
+        return [(name, buckets[name], passes) for name, passes in routed]
+
+    main_passes, secondary_passes = route_passes(layer.passes, settings.use_secondary_output, cache)
+    routes = []
+    if main_passes:
+        routes.append(('main', OutputBucket('main', settings.main_output_format,
+                                            settings.main_exr_codec, settings.main_exr_bitdepth), main_passes))
+    if secondary_passes:
+        routes.append(('secondary', OutputBucket('secondary', settings.secondary_output_format,
+                                                 settings.secondary_exr_codec, settings.secondary_exr_bitdepth),
+                       secondary_passes))
+    return routes
+
+def plan_layer_outputs(layer, settings, base_filename, output_path, location, cache=ROUTING_CACHE):
+    """Plan the main and secondary (or rule bucket) output nodes of one regular view layer"""
+    cleaned = clean_viewlayer_name(layer.name)
+    source = rl_node_name(layer.name)
+
+    outputs = []
+    for column, (bucket_name, bucket, passes) in enumerate(layer_routes(layer, settings, cache)):
+        if settings.use_routing_rules:
+            name = f"{base_filename}_{cleaned}_{bucket_name}_{bit_depth_suffix(bucket.color_depth)}_"
+        else:
+            name = f"{base_filename}_{cleaned}_{bit_depth_suffix(bucket.color_depth)}_"
+            # Main and secondary share a name when their bit depths match; the
+            # suffix keeps them apart, where both used to write to one path
+            if outputs and outputs[0].name == name:
+                name += "DATA"
+        outputs.append(OutputNodePlan(
+            name=name,
+            label=name,
+            base_path=output_path + f"{cleaned}\\{name}",
+            file_format=bucket.file_format,
+            exr_codec=bucket.exr_codec,
+            color_depth=bucket.color_depth,
+            slots=tuple(SlotPlan(p, source, p) for p in passes),
+            location=(location[0] + 400 * (column + 1), location[1]),
+            layer=layer.name,
+        ))
+
+    return outputs
+
+def shard_of(idx, count, shards):
+    """Contiguous shard index of item idx out of count items split into shards"""
+    return idx * max(1, min(shards, count)) // max(1, count)
+
+def plan_consolidated_outputs(layers, settings, base_filename, output_path, cache=ROUTING_CACHE):
+    """
+    Pack every regular layer into shared multilayer EXR nodes: one node per
+    routing bucket and shard, with slots prefixed by the cleaned layer name.
+    """
+    shards = max(1, settings.consolidation_shards)
+    grouped = {}   # (bucket_name, shard) -> [slots]
+    buckets = {}   # bucket_name -> OutputBucket, in first-seen order
+
+    for idx, layer in enumerate(layers):
+        cleaned = clean_viewlayer_name(layer.name)
+        source = rl_node_name(layer.name)
+        shard = shard_of(idx, len(layers), shards)
+        for bucket_name, bucket, passes in layer_routes(layer, settings, cache):
+            buckets.setdefault(bucket_name, bucket)
+            grouped.setdefault((bucket_name, shard), []).extend(
+                SlotPlan(f"{cleaned}_{p}", source, p) for p in passes)
+
+    outputs = []
+    bucket_columns = {name: column for column, name in enumerate(buckets)}
+    for (bucket_name, shard), slots in sorted(grouped.items(), key=lambda item: (bucket_columns[item[0][0]], item[0][1])):
+        bucket = buckets[bucket_name]
+        name = f"{base_filename}_{CONSOLIDATED_PREFIX}_{bucket_name}_{shard:02d}_{bit_depth_suffix(bucket.color_depth)}_"
+        outputs.append(OutputNodePlan(
+            name=name,
+            label=name,
+            base_path=output_path + f"{CONSOLIDATED_PREFIX}\\{name}",
+            # Only multilayer EXR can hold many layers in one file
+            file_format='OPEN_EXR_MULTILAYER',
+            exr_codec=bucket.exr_codec,
+            color_depth=bucket.color_depth,
+            slots=tuple(slots),
+            location=(START_X + 400 * (bucket_columns[bucket_name] + 1), START_Y + shard * SPACING_Y),
+        ))
+    return outputs
+
+def plan_connections(layers, settings, base_filename, cache=ROUTING_CACHE):
+    """
+    Build the ConnectionPlan for a sequence of LayerSnapshot objects.
+    settings is a SettingsSnapshot (or anything SettingsSnapshot.from_settings accepts).
+    Routing is memoized per pass signature in cache.
+    """
+    if not isinstance(settings, SettingsSnapshot):
+        settings = SettingsSnapshot.from_settings(settings)
+    output_path = normalize_output_path(settings.custom_output_path)
+
+    gp_layers = [layer for layer in layers if is_gp_layer(layer.name)]
+    regular_layers = [layer for layer in layers if not is_gp_layer(layer.name)]
+
+    render_layers = []
+    outputs = []
+
+    if gp_layers:
+        outputs.append(plan_gp_outputs(gp_layers, output_path))
+
+    # Grease pencil layers are placed below the regular ones
+    for idx, layer in enumerate(gp_layers):
+        render_layers.append(RenderLayerPlan(
+            rl_node_name(layer.name), layer.name, layer.name,
+            (START_X, START_Y - 800 + (idx * SPACING_Y))))
+
+    for idx, layer in enumerate(regular_layers):
+        location = (START_X, START_Y + (idx * SPACING_Y))
+        render_layers.append(RenderLayerPlan(
+            rl_node_name(layer.name), layer.name, layer.name, location))
+        if not settings.consolidate_outputs:
+            outputs.extend(plan_layer_outputs(layer, settings, base_filename, output_path, location, cache))
+
+    if settings.consolidate_outputs and regular_layers:
+        outputs.extend(plan_consolidated_outputs(regular_layers, settings, base_filename, output_path, cache))
+
+    return ConnectionPlan(
+        base_filename=base_filename,
+        render_layers=tuple(render_layers),
+        outputs=tuple(outputs),
+        gp_layer_count=len(gp_layers),
+        regular_layer_count=len(regular_layers),
+    )
+
+def plan_subset(plan, names):
+    """The nodes of plan whose names are in names, as a ConnectionPlan of their own"""
+    return ConnectionPlan(
+        base_filename=plan.base_filename,
+        render_layers=tuple(n for n in plan.render_layers if n.name in names),
+        outputs=tuple(n for n in plan.outputs if n.name in names),
+        gp_layer_count=plan.gp_layer_count,
+        regular_layer_count=plan.regular_layer_count,
+    )
+
+def is_planned_output_name(name, base_filename):
+    """Return True if name looks like an output node created from a plan for base_filename"""
+    if name == GP_OUTPUT_NAME:
+        return True
+    return name.startswith(f"{base_filename}_") and name.endswith(
+        ("_EXR16_", "_EXR32_", "_EXR16_DATA", "_EXR32_DATA"))
+
+def diff_plans(old, new, ordered=True):
+    """
+    Compare two plans by node name.
+    With ordered=False file slots count as the same when only their order differs.
+    Returns a dict of sorted name lists: 'added', 'removed' and 'changed'.
+    """
+    old_nodes = {n.name: n for n in old.render_layers + old.outputs}
+    new_nodes = {n.name: n for n in new.render_layers + new.outputs}
+
+    def slots(node):
+        return node.slots if ordered else Counter(node.slots)
+
+    def same(a, b):
+        # Locations are only defaults, they never count as a change
+        if isinstance(a, OutputNodePlan) and isinstance(b, OutputNodePlan):
+            # Codec and depth are only applied to EXR outputs
+            if a.file_format in EXR_FORMATS or b.file_format in EXR_FORMATS:
+                return (a.label, a.base_path, a.file_format, a.exr_codec, a.color_depth, slots(a)) == \
+                       (b.label, b.base_path, b.file_format, b.exr_codec, b.color_depth, slots(b))
+            return (a.label, a.base_path, a.file_format, slots(a)) == (b.label, b.base_path, b.file_format, slots(b))
+        return type(a) is type(b) and (a.label, a.layer) == (b.label, b.layer)
+
+    return {
+        'added': sorted(new_nodes.keys() - old_nodes.keys()),
+        'removed': sorted(old_nodes.keys() - new_nodes.keys()),
+        'changed': sorted(name for name in old_nodes.keys() & new_nodes.keys()
+                          if not same(old_nodes[name], new_nodes[name])),
+    }
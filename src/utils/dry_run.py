@@ -0,0 +1,101 @@
+"""
+Describe what Connect All ViewLayers would do, without doing it.
+
+plan_from_tree reads the add-on's current nodes back into a ConnectionPlan
+so it can be diffed against a fresh plan with diff_plans, and
+preview_report turns both into a JSON-ready dict of nodes, slots, links,
+base paths and formats. Nothing here creates or changes nodes.
+"""
+import time
+from dataclasses import asdict
+from .connection_planner import (
+    ConnectionPlan,
+    OutputNodePlan,
+    RenderLayerPlan,
+    SlotPlan,
+    diff_plans,
+)
+from .link_index import LinkIndex
+from .ownership import owned_nodes
+
+def plan_from_tree(tree, base_filename, index=None):
+    """ConnectionPlan equivalent of the add-on's Render Layers and File Output nodes in tree"""
+    if index is None:
+        index = LinkIndex.from_tree(tree)
+    render_layers = []
+    outputs = []
+    for node in owned_nodes(tree, base_filename):
+        if node.type == 'R_LAYERS':
+            render_layers.append(RenderLayerPlan(node.name, node.label, node.layer, tuple(node.location)))
+        elif node.type == 'OUTPUT_FILE':
+            slots = []
+            for slot, socket in zip(node.file_slots, node.inputs):
+                links = index.input_links(socket)
+                source = links[0] if links else None
+                slots.append(SlotPlan(slot.path,
+                                      source.from_node.name if source else "",
+                                      source.from_socket.name if source else ""))
+            outputs.append(OutputNodePlan(
+                name=node.name,
+                label=node.label,
+                base_path=node.base_path,
+                file_format=node.format.file_format,
+                exr_codec=node.format.exr_codec,
+                color_depth=node.format.color_depth,
+                slots=tuple(slots),
+                location=tuple(node.location),
+            ))
+    return ConnectionPlan(base_filename, tuple(render_layers), tuple(outputs))
+
+def output_entry(node, status):
+    """JSON-ready description of one planned File Output node"""
+    entry = asdict(node)
+    entry['slots'] = [asdict(slot) for slot in node.slots]
+    entry['location'] = list(node.location)
+    entry['status'] = status
+    return entry
+
+def preview_report(plan, current):
+    """
+    Everything plan would create and how it differs from current.
+    Returns a dict with 'summary', 'render_layers', 'outputs', 'links',
+    'diff' and, for changed nodes, their 'current' state.
+    """
+    # Slot order only decides the layer order inside a file, it is not a change worth reviewing
+    diff = diff_plans(current, plan, ordered=False)
+    added = set(diff['added'])
+    changed = set(diff['changed'])
+
+    def status(name):
+        if name in added:
+            return 'ADDED'
+        return 'CHANGED' if name in changed else 'UNCHANGED'
+
+    links = [{'from_node': slot.source_node, 'from_socket': slot.source_socket,
+              'to_node': node.name, 'to_slot': idx}
+             for node in plan.outputs for idx, slot in enumerate(node.slots)]
+    current_nodes = {n.name: n for n in current.render_layers + current.outputs}
+
+    return {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'base_filename': plan.base_filename,
+        'summary': {
+            'render_layers': len(plan.render_layers),
+            'outputs': len(plan.outputs),
+            'slots': plan.slot_count(),
+            'links': len(links),
+            'gp_layers': plan.gp_layer_count,
+            'added': len(diff['added']),
+            'removed': len(diff['removed']),
+            'changed': len(diff['changed']),
+        },
+        'render_layers': [dict(asdict(rl), location=list(rl.location), status=status(rl.name))
+                          for rl in plan.render_layers],
+        'outputs': [output_entry(node, status(node.name)) for node in plan.outputs],
+        'links': links,
+        'diff': diff,
+        'current': {name: (output_entry(current_nodes[name], 'CURRENT')
+                           if isinstance(current_nodes[name], OutputNodePlan)
+                           else dict(asdict(current_nodes[name]), location=list(current_nodes[name].location)))
+                    for name in diff['changed']},
+    }
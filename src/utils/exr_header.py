@@ -0,0 +1,150 @@
+"""
+Read OpenEXR headers without decoding pixels.
+
+The file is memory mapped and only the header attributes and the chunk
+offset table are parsed: channel list, compression, data window and
+whether every chunk the offset table points at lies inside the file, which
+catches renders that were cut off mid-write. Pure Python, no bpy.
+"""
+import mmap
+import struct
+
+EXR_MAGIC = 20000630
+MAGIC_BYTES = struct.pack('<i', EXR_MAGIC)
+
+COMPRESSION_NAMES = ('NONE', 'RLE', 'ZIPS', 'ZIP', 'PIZ', 'PXR24', 'B44', 'B44A', 'DWAA', 'DWAB')
+# Scanlines stored per chunk, per compression
+SCANLINES_PER_CHUNK = {
+    'NONE': 1, 'RLE': 1, 'ZIPS': 1, 'ZIP': 16, 'PXR24': 16,
+    'PIZ': 32, 'B44': 32, 'B44A': 32, 'DWAA': 32, 'DWAB': 256,
+}
+PIXEL_TYPES = ('UINT', 'HALF', 'FLOAT')
+
+TILED_FLAG = 0x200
+MULTIPART_FLAG = 0x1000
+DEEP_FLAG = 0x800
+
+class ExrError(ValueError):
+    """The file is not a readable OpenEXR file"""
+
+class TruncatedExr(ExrError):
+    """The file ends before its header or pixel data does"""
+
+def _cstring(buf, pos):
+    end = buf.find(b"\0", pos)
+    if end < 0:
+        raise TruncatedExr("Header string runs past the end of the file")
+    return buf[pos:end].decode('latin-1'), end + 1
+
+def _channels(value):
+    channels = []
+    pos = 0
+    while pos < len(value) and value[pos] != 0:
+        end = value.find(b"\0", pos)
+        if end < 0 or end + 17 > len(value):
+            raise ExrError("Malformed channel list")
+        name = value[pos:end].decode('latin-1')
+        pixel_type = struct.unpack_from('<i', value, end + 1)[0]
+        channels.append((name, PIXEL_TYPES[pixel_type] if 0 <= pixel_type < 3 else str(pixel_type)))
+        pos = end + 17
+    return channels
+
+def _attributes(buf, pos):
+    """Parse attributes from pos up to the terminating null byte. Returns (attrs, next_pos)"""
+    attrs = {}
+    while True:
+        if pos >= len(buf):
+            raise TruncatedExr("Header runs past the end of the file")
+        if buf[pos] == 0:
+            return attrs, pos + 1
+        name, pos = _cstring(buf, pos)
+        kind, pos = _cstring(buf, pos)
+        if pos + 4 > len(buf):
+            raise TruncatedExr("Header runs past the end of the file")
+        size = struct.unpack_from('<i', buf, pos)[0]
+        pos += 4
+        if size < 0 or pos + size > len(buf):
+            raise TruncatedExr(f"Attribute {name!r} runs past the end of the file")
+        value = bytes(buf[pos:pos + size])
+        pos += size
+        if kind == 'chlist':
+            attrs[name] = _channels(value)
+        elif kind == 'compression':
+            code = value[0] if value else 0
+            attrs[name] = COMPRESSION_NAMES[code] if code < len(COMPRESSION_NAMES) else str(code)
+        elif kind == 'box2i' and size == 16:
+            attrs[name] = struct.unpack('<4i', value)
+        elif kind == 'string':
+            attrs[name] = value.decode('latin-1')
+        else:
+            attrs[name] = value
+
+def _check_chunks(buf, pos, header):
+    """Validate the scanline offset table of a single part image that starts at pos"""
+    xmin, ymin, xmax, ymax = header['dataWindow']
+    lines = SCANLINES_PER_CHUNK.get(header['compression'], 1)
+    count = (ymax - ymin + lines) // lines
+    table_end = pos + count * 8
+    if table_end > len(buf):
+        raise TruncatedExr("Offset table runs past the end of the file")
+    offsets = struct.unpack_from(f'<{count}Q', buf, pos)
+    for offset in offsets:
+        if offset < table_end or offset + 8 > len(buf):
+            raise TruncatedExr("Chunk offset points outside the file")
+    last = max(offsets)
+    data_size = struct.unpack_from('<i', buf, last + 4)[0]
+    if data_size < 0 or last + 8 + data_size > len(buf):
+        raise TruncatedExr("Last chunk runs past the end of the file")
+
+def parse_exr_header(buf, check_chunks=True):
+    """
+    Parse the header of an EXR file held in buf (bytes or mmap).
+    Returns {'channels', 'compression', 'data_window', 'tiled', 'multipart', 'parts'};
+    raises ExrError for files that are not EXR and TruncatedExr for cut off files.
+    """
+    if len(buf) < 8:
+        raise TruncatedExr("File is shorter than the EXR preamble")
+    if buf[:4] != MAGIC_BYTES:
+        raise ExrError("Bad magic number")
+    flags = struct.unpack_from('<i', buf, 4)[0]
+    multipart = bool(flags & MULTIPART_FLAG)
+
+    parts = []
+    pos = 8
+    while True:
+        attrs, pos = _attributes(buf, pos)
+        if not attrs:
+            break
+        parts.append(attrs)
+        if not multipart:
+            break
+    if not parts:
+        raise ExrError("No header")
+    header = parts[0]
+    if 'channels' not in header or 'dataWindow' not in header:
+        raise ExrError("Header is missing channels or dataWindow")
+    header.setdefault('compression', 'NONE')
+
+    tiled = bool(flags & (TILED_FLAG | DEEP_FLAG))
+    if check_chunks and not multipart and not tiled:
+        _check_chunks(buf, pos, header)
+
+    return {
+        'channels': [channel for part in parts for channel in part.get('channels', [])],
+        'compression': header['compression'],
+        'data_window': tuple(header['dataWindow']),
+        'tiled': tiled,
+        'multipart': multipart,
+        'parts': len(parts),
+    }
+
+def read_exr_header(path, check_chunks=True):
+    """parse_exr_header on a file, memory mapped so only the touched pages are read"""
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            raise TruncatedExr("File is empty")
+        with buf:
+            return parse_exr_header(buf, check_chunks)
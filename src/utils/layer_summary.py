@@ -0,0 +1,149 @@
+"""
+Cached per view layer status for the ViewLayer Export panel.
+
+The panel redraws many times a second; walking every view layer, node and
+link on each redraw does not scale to scenes with a thousand layers. The
+summary is built once and reused until the tree index reports a change to
+the scene's own tree, a view layer is added, removed or edited, the render
+resolution changes or the file is saved under a new name.
+"""
+import os
+from dataclasses import dataclass
+
+import bpy
+from bpy.app.handlers import persistent
+from .link_index import LinkIndex
+from .output_estimator import estimate_outputs, specs_from_tree
+from .plan_applier import read_enabled_passes, viewlayer_passes
+from . import tree_index
+
+# scene pointer -> (key, Summary)
+_summaries = {}
+_msgbus_owner = object()
+# Bumped by msgbus and save handlers, on top of the tree index generation
+_stamp = 0
+
+@dataclass(frozen=True)
+class LayerStatus:
+    """What the panel shows for one view layer"""
+    name: str
+    enabled: bool
+    passes: int
+    outputs: int
+    formats: tuple
+    bytes_per_frame: int
+
+@dataclass(frozen=True)
+class Summary:
+    """Scene totals and LayerStatus by view layer name"""
+    layer_count: int
+    enabled_count: int
+    wired_count: int
+    bytes_per_frame: int
+    file_name: str
+    layers: dict
+
+def output_format(node):
+    """Short format label of a File Output node, such as EXR_ML 16 DWAB"""
+    fmt = node.format
+    if fmt.file_format in ('OPEN_EXR', 'OPEN_EXR_MULTILAYER'):
+        label = "EXR_ML" if fmt.file_format == 'OPEN_EXR_MULTILAYER' else "EXR"
+        return f"{label} {fmt.color_depth} {fmt.exr_codec}"
+    return fmt.file_format
+
+def build_summary(scene):
+    """Walk the scene's view layers and tree once and return a Summary"""
+    tree = scene.node_tree if scene.use_nodes else None
+    render = scene.render
+    scale = render.resolution_percentage / 100
+    layer_bytes = {}
+    index = None
+    if tree is not None:
+        index = tree_index.get_tree_index(tree)
+        estimate = estimate_outputs(specs_from_tree(tree, LinkIndex.from_tree(tree)),
+                                    int(render.resolution_x * scale), int(render.resolution_y * scale), 1)
+        layer_bytes = estimate['layers']
+
+    layers = {}
+    for viewlayer in scene.view_layers:
+        rl_node = index.rl_node(viewlayer.name) if index is not None else None
+        if rl_node is not None:
+            passes = len(read_enabled_passes(rl_node))
+            outputs = [node for nodes in index.outputs_for_layer(viewlayer.name).values() for node in nodes]
+        else:
+            passes = len(viewlayer_passes(viewlayer))
+            outputs = []
+        layers[viewlayer.name] = LayerStatus(
+            name=viewlayer.name,
+            enabled=viewlayer.use,
+            passes=passes,
+            outputs=len(outputs),
+            formats=tuple(sorted({output_format(node) for node in outputs})),
+            bytes_per_frame=layer_bytes.get(viewlayer.name, 0),
+        )
+
+    return Summary(
+        layer_count=len(layers),
+        enabled_count=sum(1 for status in layers.values() if status.enabled),
+        wired_count=sum(1 for status in layers.values() if status.outputs),
+        bytes_per_frame=sum(status.bytes_per_frame for status in layers.values()),
+        file_name=os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] if bpy.data.is_saved else "",
+        layers=layers,
+    )
+
+def get_summary(scene):
+    """Summary of scene, rebuilt only when something it depends on changed"""
+    render = scene.render
+    tree = scene.node_tree if scene.use_nodes else None
+    key = (tree_index.generation(tree) if tree is not None else None, _stamp, scene.use_nodes,
+           len(scene.view_layers), render.resolution_x, render.resolution_y, render.resolution_percentage)
+    cached = _summaries.get(scene.as_pointer())
+    if cached is None or cached[0] != key:
+        cached = (key, build_summary(scene))
+        _summaries[scene.as_pointer()] = cached
+    return cached[1]
+
+def invalidate():
+    """Mark every summary as stale"""
+    global _stamp
+    _stamp += 1
+
+def clear():
+    _summaries.clear()
+    invalidate()
+
+@persistent
+def _on_file_changed(*args):
+    clear()
+    subscribe_msgbus()
+
+def _on_msgbus_notify():
+    invalidate()
+
+def subscribe_msgbus():
+    """Invalidate on any view layer property, which covers pass toggles and enabling layers"""
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    keys = [bpy.types.ViewLayer]
+    cycles = getattr(bpy.types, "CyclesRenderLayerSettings", None)
+    if cycles is not None:
+        keys.append(cycles)
+    for key in keys:
+        bpy.msgbus.subscribe_rna(key=key, owner=_msgbus_owner, args=(), notify=_on_msgbus_notify)
+
+_HANDLERS = (
+    (bpy.app.handlers.load_post, _on_file_changed),
+    (bpy.app.handlers.save_post, _on_file_changed),
+)
+
+def register():
+    for handlers, func in _HANDLERS:
+        if func not in handlers:
+            handlers.append(func)
+    subscribe_msgbus()
+
+def unregister():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for handlers, func in _HANDLERS:
+        if func in handlers:
+            handlers.remove(func)
+    clear()
@@ -0,0 +1,67 @@
+"""
+Adjacency index over the links of a node tree.
+
+Built in one pass over tree.links so layout and grouping code can ask
+"what is connected to this node/socket" without rescanning every link.
+"""
+
+class LinkIndex:
+    """Node and socket level adjacency maps for a node tree's links"""
+
+    def __init__(self, links):
+        self.to_nodes = {}     # from_node -> [to_node, ...] without duplicates
+        self.from_nodes = {}   # to_node -> [from_node, ...] without duplicates
+        self.links_from = {}   # from_socket -> [link, ...]
+        self.links_to = {}     # to_socket -> [link, ...]
+        self._seen_pairs = set()
+
+        for link in links:
+            self.add(link)
+
+    @classmethod
+    def from_tree(cls, tree):
+        """Build the index for all links of tree"""
+        return cls(tree.links)
+
+    def add(self, link):
+        """Add a single link to the index"""
+        from_node = link.from_node
+        to_node = link.to_node
+        self.links_from.setdefault(link.from_socket, []).append(link)
+        self.links_to.setdefault(link.to_socket, []).append(link)
+
+        pair = (from_node, to_node)
+        if pair not in self._seen_pairs:
+            self._seen_pairs.add(pair)
+            self.to_nodes.setdefault(from_node, []).append(to_node)
+            self.from_nodes.setdefault(to_node, []).append(from_node)
+
+    def downstream(self, node, node_type=None):
+        """Nodes fed by node, optionally only those of node_type"""
+        nodes = self.to_nodes.get(node, [])
+        if node_type is None:
+            return list(nodes)
+        return [n for n in nodes if n.type == node_type]
+
+    def upstream(self, node, node_type=None):
+        """Nodes feeding node, optionally only those of node_type"""
+        nodes = self.from_nodes.get(node, [])
+        if node_type is None:
+            return list(nodes)
+        return [n for n in nodes if n.type == node_type]
+
+    def output_links(self, socket):
+        """Links leaving an output socket"""
+        return self.links_from.get(socket, [])
+
+    def input_links(self, socket):
+        """Links entering an input socket"""
+        return self.links_to.get(socket, [])
+
+    def connected(self, from_node, to_node):
+        """Return True if any link goes from from_node to to_node"""
+        return (from_node, to_node) in self._seen_pairs
+
+    def connected_outputs(self, node):
+        """File Output nodes fed by node"""
+        return self.downstream(node, 'OUTPUT_FILE')
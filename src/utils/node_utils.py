@@ -1,11 +1,64 @@
 import bpy
+import hashlib
 import math
 import re
+from .link_index import LinkIndex
+from .plan_applier import size_file_slots
+from .ownership import is_tagged, owned_nodes, remove_owned, tag
+from .dag_layout import layered_layout
+from .prefix_trie import DEFAULT_SEPARATORS, build_trie, compress, pack_grid
+from .profiler import NULL_PROFILER
+from . import tree_index
 
-def create_node_group(tree, nodes, name):
-    """Create a group node containing the specified nodes"""
+# Fallback node size estimate for nodes that were never drawn
+NODE_HEADER_HEIGHT = 60.0
+SOCKET_HEIGHT = 22.0
+OUTPUT_FILE_EXTRA_HEIGHT = 90.0
+# Space inside frames around their content, and above it for the label
+FRAME_MARGIN = 30.0
+FRAME_LABEL_HEIGHT = 40.0
+
+def new_interface_socket(group, name, in_out, socket_type):
+    """Add a group input or output socket, using the interface API on Blender 4.0+"""
+    if hasattr(group, "interface"):
+        group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    elif in_out == 'INPUT':
+        group.inputs.new(socket_type, name)
+    else:
+        group.outputs.new(socket_type, name)
+
+def interface_socket_type(socket):
+    """Interface socket type for a node socket, without subtypes such as NodeSocketFloatFactor"""
+    for base in ('NodeSocketColor', 'NodeSocketVector', 'NodeSocketFloat', 'NodeSocketInt', 'NodeSocketBool'):
+        if socket.bl_idname.startswith(base):
+            return base
+    return 'NodeSocketColor'
+
+def copy_node_settings(node, new_node):
+    """Copy the properties the add-on sets on Render Layers and File Output nodes"""
+    new_node.name = node.name
+    new_node.label = node.label
+    new_node.location = node.location
+    if node.type == 'R_LAYERS':
+        new_node.layer = node.layer
+    elif node.type == 'OUTPUT_FILE':
+        new_node.base_path = node.base_path
+        new_node.format.file_format = node.format.file_format
+        if node.format.file_format in ('OPEN_EXR', 'OPEN_EXR_MULTILAYER'):
+            new_node.format.exr_codec = node.format.exr_codec
+            new_node.format.color_depth = node.format.color_depth
+        # Copy file slots, reusing the default one
+        size_file_slots(new_node, [slot.path for slot in node.file_slots])
+
+def create_node_group(tree, nodes, name, index=None, owner=None, run_id=None):
+    """Create a group node containing the specified nodes, tagged as the add-on's along with its node group"""
+    if index is None:
+        index = LinkIndex.from_tree(tree)
+    node_set = set(nodes)
+    
     # Create a new node group
     group = bpy.data.node_groups.new(name, 'CompositorNodeTree')
+    tag(group, owner, run_id)
     
     # Create input/output interfaces
     group_inputs = group.nodes.new('NodeGroupInput')
@@ -13,99 +66,54 @@ def create_node_group(tree, nodes, name):
     group_outputs = group.nodes.new('NodeGroupOutput')
     group_outputs.location = (400, 0)
     
-    # Track external connections and node mapping
-    external_inputs = {}  # {(to_node, to_socket_name): (from_node, from_socket)}
-    external_outputs = {}  # {(from_node, from_socket_name): [(to_node, to_socket)]}
-    old_to_new_nodes = {}  # Map original nodes to their copies in the group
-    
-    # First pass: identify all external connections
-    for node in nodes:
-        for input_idx, input_socket in enumerate(node.inputs):
-            for link in input_socket.links:
-                if link.from_node not in nodes:  # External input
-                    key = (node, input_socket.name)
-                    external_inputs[key] = (link.from_node, link.from_socket)
-        
-        for output_idx, output_socket in enumerate(node.outputs):
-            for link in output_socket.links:
-                if link.to_node not in nodes:  # External output
-                    key = (node, output_socket.name)
-                    if key not in external_outputs:
-                        external_outputs[key] = []
-                    external_outputs[key].append((link.to_node, link.to_socket))
-    
-    # Second pass: copy nodes to the group
+    # Copy nodes, remembering sockets by position so no lookup scans names
+    copies = {}       # original node -> (new inputs, new outputs)
+    input_pos = {}    # original input socket -> (node, position)
+    output_pos = {}   # original output socket -> (node, position)
     for node in nodes:
-        # Create a new node in the group
         new_node = group.nodes.new(node.bl_idname)
-        old_to_new_nodes[node] = new_node
-        
-        # Copy basic properties
-        new_node.name = node.name
-        new_node.label = node.label
-        new_node.location = node.location
-        
-        # Copy specific properties based on node type
-        if node.type == 'R_LAYERS':
-            new_node.layer = node.layer
-        elif node.type == 'OUTPUT_FILE':
-            new_node.base_path = node.base_path
-            new_node.format.file_format = node.format.file_format
-            # Copy file slots
-            while len(new_node.file_slots) > 0:
-                new_node.file_slots.remove(new_node.file_slots[0])
-            for slot in node.file_slots:
-                new_slot = new_node.file_slots.new(slot.path)
-    
-    # Third pass: create interface sockets and internal connections
-    input_map = {}  # Map (node, socket_name) to group input index
-    output_map = {}  # Map (node, socket_name) to group output index
-    
-    # Create group input sockets
-    for (node, socket_name), (from_node, from_socket) in external_inputs.items():
-        new_socket = group.inputs.new(from_socket.bl_idname, socket_name)
-        input_map[(node, socket_name)] = len(group.inputs) - 1
-    
-    # Create group output sockets
-    for (node, socket_name), to_links in external_outputs.items():
-        for to_node, to_socket in to_links:
-            new_socket = group.outputs.new(to_socket.bl_idname, socket_name)
-            output_map[(node, socket_name)] = len(group.outputs) - 1
-    
-    # Create internal links
-    for link in tree.links:
-        if link.from_node in nodes and link.to_node in nodes:
-            from_node = old_to_new_nodes[link.from_node]
-            to_node = old_to_new_nodes[link.to_node]
-            # Find the matching sockets by name
-            from_socket = None
-            to_socket = None
-            for s in from_node.outputs:
-                if s.name == link.from_socket.name:
-                    from_socket = s
-                    break
-            for s in to_node.inputs:
-                if s.name == link.to_socket.name:
-                    to_socket = s
-                    break
-            if from_socket and to_socket:
-                group.links.new(from_socket, to_socket)
-    
-    # Connect group inputs to node inputs
-    for (node, socket_name), idx in input_map.items():
-        new_node = old_to_new_nodes[node]
-        for socket in new_node.inputs:
-            if socket.name == socket_name:
-                group.links.new(group_inputs.outputs[idx], socket)
-                break
-    
-    # Connect node outputs to group outputs
-    for (node, socket_name), idx in output_map.items():
-        new_node = old_to_new_nodes[node]
-        for socket in new_node.outputs:
-            if socket.name == socket_name:
-                group.links.new(socket, group_outputs.inputs[idx])
-                break
+        copy_node_settings(node, new_node)
+        copies[node] = (list(new_node.inputs), list(new_node.outputs))
+        for idx, socket in enumerate(node.inputs):
+            input_pos[socket] = (node, idx)
+        for idx, socket in enumerate(node.outputs):
+            output_pos[socket] = (node, idx)
+    
+    def copied_input(socket):
+        node, idx = input_pos[socket]
+        return copies[node][0][idx]
+    
+    def copied_output(socket):
+        node, idx = output_pos[socket]
+        return copies[node][1][idx]
+    
+    # One pass over the links touching the grouped nodes
+    external_inputs = {}   # original input socket -> outside output socket feeding it
+    external_outputs = {}  # original output socket -> [outside input sockets it feeds]
+    for node in nodes:
+        for socket in node.inputs:
+            for link in index.input_links(socket):
+                if link.from_node not in node_set:
+                    external_inputs[socket] = link.from_socket
+        for socket in node.outputs:
+            for link in index.output_links(socket):
+                if link.to_node in node_set:
+                    group.links.new(copied_output(socket), copied_input(link.to_socket))
+                else:
+                    external_outputs.setdefault(socket, []).append(link.to_socket)
+    
+    # Interface sockets, in the order group node sockets will appear
+    for socket in external_inputs:
+        new_interface_socket(group, socket.name, 'INPUT', interface_socket_type(socket))
+    for socket in external_outputs:
+        new_interface_socket(group, socket.name, 'OUTPUT', interface_socket_type(socket))
+    
+    group_in = list(group_inputs.outputs)
+    group_out = list(group_outputs.inputs)
+    for idx, socket in enumerate(external_inputs):
+        group.links.new(group_in[idx], copied_input(socket))
+    for idx, socket in enumerate(external_outputs):
+        group.links.new(copied_output(socket), group_out[idx])
     
     # Create the group node in the original tree
     group_node = tree.nodes.new('CompositorNodeGroup')
@@ -113,25 +121,118 @@ def create_node_group(tree, nodes, name):
     group_node.name = name
     group_node.label = name
     group_node.location = (nodes[0].location.x + 100, nodes[0].location.y)
+    tag(group_node, owner, run_id)
     
-    # Connect external inputs to the group node
-    for (node, socket_name), (from_node, from_socket) in external_inputs.items():
-        idx = input_map[(node, socket_name)]
-        tree.links.new(from_socket, group_node.inputs[idx])
-    
-    # Connect the group node to external outputs
-    for (node, socket_name), to_links in external_outputs.items():
-        idx = output_map[(node, socket_name)]
-        for to_node, to_socket in to_links:
-            tree.links.new(group_node.outputs[idx], to_socket)
+    node_inputs = list(group_node.inputs)
+    node_outputs = list(group_node.outputs)
+    for idx, from_socket in enumerate(external_inputs.values()):
+        tree.links.new(from_socket, node_inputs[idx])
+    for idx, to_sockets in enumerate(external_outputs.values()):
+        for to_socket in to_sockets:
+            tree.links.new(node_outputs[idx], to_socket)
     
     # Remove original nodes
     for node in nodes:
         tree.nodes.remove(node)
+    tree_index.invalidate(tree)
     
     return group_node
 
-def arrange_nodes(tree, organize_type='GRID'):
+def node_size(node, ui_scale=1.0):
+    """(width, height) of a node in tree units, estimated from its sockets if it was never drawn"""
+    width, height = node.dimensions
+    if width > 0 and height > 0:
+        return width / ui_scale, height / ui_scale
+    sockets = sum(1 for s in node.inputs if s.enabled and not s.hide)
+    sockets += sum(1 for s in node.outputs if s.enabled and not s.hide)
+    height = NODE_HEADER_HEIGHT + sockets * SOCKET_HEIGHT
+    if node.type == 'OUTPUT_FILE':
+        height += OUTPUT_FILE_EXTRA_HEIGHT
+    return node.width, height
+
+def _ancestors(node):
+    """node's parent chain from the outermost frame down to node itself"""
+    chain = [node]
+    while chain[-1].parent is not None:
+        chain.append(chain[-1].parent)
+    chain.reverse()
+    return chain
+
+def _block_edges(links):
+    """
+    Group links by the frame that holds both ends (None for the top level),
+    as edges between that frame's direct children.
+    """
+    edges = {}
+    for link in links:
+        chain_a = _ancestors(link.from_node)
+        chain_b = _ancestors(link.to_node)
+        depth = 0
+        while depth < len(chain_a) and depth < len(chain_b) and chain_a[depth] == chain_b[depth]:
+            depth += 1
+        if depth == len(chain_a) or depth == len(chain_b):
+            continue
+        block = chain_a[depth - 1] if depth else None
+        edges.setdefault(block, []).append((chain_a[depth], chain_b[depth]))
+    return edges
+
+def _layout_block(items, block, children, edges, ui_scale, x_gap, y_gap, columns=0):
+    """
+    Lay out items, the direct children of block, framing nested frames first.
+    Linked items get a layered layout; frames with no links in this block are
+    packed into a grid of columns below it. Returns positions and size.
+    """
+    sizes = {}
+    for item in items:
+        if item.type == 'FRAME' and children.get(item):
+            inner, (width, height) = _layout_block(children[item], item, children, edges,
+                                                   ui_scale, x_gap, y_gap, columns)
+            for child, (x, y) in inner.items():
+                child.location = (x + FRAME_MARGIN, -(y + FRAME_LABEL_HEIGHT))
+            sizes[item] = (width + 2 * FRAME_MARGIN, height + FRAME_LABEL_HEIGHT + FRAME_MARGIN)
+        else:
+            sizes[item] = node_size(item, ui_scale)
+
+    block_edges = edges.get(block, ())
+    linked = {key for edge in block_edges for key in edge}
+    packed = [item for item in items if item.type == 'FRAME' and item in children and item not in linked]
+    packed_set = set(packed)
+    rest = [item for item in items if item not in packed_set]
+
+    positions, (width, height) = layered_layout(rest, sizes, block_edges, x_gap, y_gap)
+    if packed:
+        top = height + y_gap if rest else 0.0
+        for item, (x, y) in zip(packed, pack_grid([sizes[item] for item in packed], columns, y_gap)):
+            positions[item] = (x, top + y)
+            width = max(width, x + sizes[item][0])
+            height = max(height, top + y + sizes[item][1])
+    return positions, (width, height)
+
+def layout_nodes(tree, items=None, spacing=300.0, origin=(0.0, 0.0), columns=0):
+    """
+    Layered layout of a compositor tree using the nodes' real sizes.
+    items are the top level nodes and frames to place (default: every node
+    without a parent); frame contents are laid out inside their frames and
+    the frames then placed by their bounding boxes. Unlinked frames are
+    packed into columns (0 picks about the square root of their count).
+    spacing is the gap between columns, nodes in a column are stacked a
+    fifth of it apart. Returns the (width, height) of the layout.
+    """
+    ui_scale = bpy.context.preferences.system.ui_scale if bpy.context.preferences else 1.0
+    if items is None:
+        items = [node for node in tree.nodes if node.parent is None]
+    children = {}
+    for node in tree.nodes:
+        if node.parent is not None:
+            children.setdefault(node.parent, []).append(node)
+
+    positions, size = _layout_block(list(items), None, children, _block_edges(tree.links),
+                                    ui_scale, spacing, spacing / 5, columns)
+    for item, (x, y) in positions.items():
+        item.location = (origin[0] + x, origin[1] - y)
+    return size
+
+def arrange_nodes(tree, organize_type='GRID', index=None, spacing=300.0):
     """Arrange nodes in the compositor tree"""
     # Get all nodes
     nodes = list(tree.nodes)
@@ -165,49 +266,44 @@ def arrange_nodes(tree, organize_type='GRID'):
                 node.location = (0, -i * 300)
     
     elif organize_type == 'HIERARCHY':
-        # Find render layer and output nodes
-        rl_nodes = [n for n in nodes if n.type == 'R_LAYERS']
-        output_nodes = [n for n in nodes if n.type == 'OUTPUT_FILE']
-        
-        # If no render layer or output nodes, fallback to grid
-        if not rl_nodes or not output_nodes:
-            grid_size = max(1, math.ceil(math.sqrt(len(nodes))))
-            for i, node in enumerate(nodes):
-                row = i // grid_size
-                col = i % grid_size
-                node.location = (col * 300, -row * 300)
-        else:
-            # Attempt to match render layer nodes with output nodes
-            for i, rl_node in enumerate(rl_nodes):
-                # Find matching output nodes connected to this render layer
-                # Fixed: Check link validity properly without accessing is_valid on sockets
-                connected_outputs = []
-                for out_node in output_nodes:
-                    for link in tree.links:
-                        # Check if this link connects the render layer node to this output node
-                        if link.from_node == rl_node and link.to_node == out_node:
-                            if out_node not in connected_outputs:
-                                connected_outputs.append(out_node)
-                                break
-                
-                # Position render layer node
-                start_x = 0
-                rl_node.location = (start_x, -i * 300)
-                
-                # Position output nodes
-                x_spacing = 300
-                for j, output_node in enumerate(connected_outputs):
-                    output_node.location = (start_x + (j + 1) * x_spacing, -i * 300)
+        # Layered by link depth, sized by the real node and frame dimensions
+        items = layout_items(tree, index)
+        if items:
+            origin = (min(item.location.x for item in items), max(item.location.y for item in items))
+            layout_nodes(tree, items, spacing=spacing, origin=origin)
     
     return {'FINISHED'}
 
-def get_connected_output(tree, node):
+def layout_items(tree, index=None):
+    """
+    Top level items the hierarchy layout may move: the add-on's nodes and
+    frames, and the outputs its Render Layers nodes feed. Nodes inside a frame are placed with it; a hand-made frame is left
+    where it is, along with everything in it.
+    """
+    if index is None:
+        index = LinkIndex.from_tree(tree)
+    nodes = []
+    for node in owned_nodes(tree):
+        nodes.append(node)
+        if node.type == 'R_LAYERS':
+            nodes.extend(index.connected_outputs(node))
+    items = {}
+    for node in nodes:
+        top = _ancestors(node)[0]
+        if top is node or is_tagged(top):
+            items[top] = None
+    return list(items)
+
+def get_connected_output(tree, node, index=None):
     """Find the output node connected to the given node"""
+    if index is None:
+        index = LinkIndex.from_tree(tree)
     for output in node.outputs:
-        for link in output.links:
+        for link in index.output_links(output):
             if link.to_node.type == 'OUTPUT_FILE':
                 return link.to_node
     return None
+
 def sort_viewlayers(scene, sort_type='ALPHABETICAL'):
     """Sort viewlayers by the specified method"""
     viewlayers = list(scene.view_layers)
@@ -222,19 +318,10 @@ def sort_viewlayers(scene, sort_type='ALPHABETICAL'):
     # Return the sorted list
     return viewlayers
 
-def clear_all_viewlayer_nodes(tree):
-    """Remove all viewlayer and output nodes"""
-    nodes_to_remove = []
-    
-    for node in tree.nodes:
-        if node.type == 'R_LAYERS' or node.type == 'OUTPUT_FILE':
-            nodes_to_remove.append(node)
-    
-    # Remove the nodes
-    for node in nodes_to_remove:
-        tree.nodes.remove(node)
-    
-    return len(nodes_to_remove)
+def clear_all_viewlayer_nodes(tree, run_id=None):
+    """Remove the nodes, frames and groups the add-on created, leaving hand-made nodes alone"""
+    nodes_removed, _ = remove_owned(tree, run_id=run_id)
+    return nodes_removed
 
 def extract_prefix(name):
     """Extract prefix from a name based on common separators"""
@@ -249,77 +336,90 @@ def extract_prefix(name):
     # If no separator is found, use the first 3 characters or the whole name if shorter
     return name[:min(3, len(name))]
 
-def group_nodes_by_prefix_in_frames(tree):
-    """Group nodes by their prefix and place them in frames"""
+def prefix_color(label):
+    """Consistent pseudo-random frame colour for a prefix"""
+    digest = hashlib.md5(label.encode("utf-8")).digest()
+    return tuple(0.2 + 0.6 * byte / 255 for byte in digest[:3])
+
+def frame_options(settings):
+    """Keyword arguments for group_nodes_by_prefix_in_frames from the panel settings"""
+    return {
+        'spacing': settings.node_spacing,
+        'depth': settings.frame_group_depth,
+        'separators': settings.frame_separators,
+        'columns': settings.frame_pack_columns,
+        'min_size': settings.frame_min_layers,
+    }
+
+def group_nodes_by_prefix_in_frames(tree, index=None, owner=None, run_id=None, spacing=300.0,
+                                    depth=2, separators=DEFAULT_SEPARATORS, columns=0, min_size=1,
+                                    profiler=NULL_PROFILER):
+    """
+    Group Render Layers nodes and their outputs into nested frames by the
+    leading tokens of their view layer names, up to depth levels. Prefixes
+    shared by fewer than min_size layers are merged into their parent, as
+    are chains with a single subgroup; the default frames every prefix.
+    Frames are packed into columns and laid out by their real sizes.
+    Returns the number of frames created.
+    """
+    with profiler.phase('framing'):
+        top_level, frames = _frame_by_prefix(tree, index, owner, run_id, depth, separators, min_size)
+    profiler.count(frames=len(frames))
+    
+    # Lay out each frame's content, then pack the frames by their bounding boxes
+    with profiler.phase('arranging'):
+        if top_level:
+            layout_nodes(tree, top_level, spacing, columns=columns)
+    
+    return len(frames)
+
+def _frame_by_prefix(tree, index, owner, run_id, depth, separators, min_size=1):
+    """Create the nested prefix frames and parent nodes to them. Returns (top level items, frames)"""
     viewlayer_nodes = [n for n in tree.nodes if n.type == 'R_LAYERS']
-    
-    # Dictionary to group nodes by their prefix
-    prefix_groups = {}
-    
-    # First, categorize all viewlayer nodes by their prefix
-    for vl_node in viewlayer_nodes:
-        layer_name = vl_node.layer  # Get the original layer name
-        prefix = extract_prefix(layer_name)
-        
-        if prefix not in prefix_groups:
-            prefix_groups[prefix] = []
-            
-        # Find connected output nodes
-        output_nodes = []
-        for out in vl_node.outputs:
-            for link in out.links:
-                if link.to_node.type == 'OUTPUT_FILE' and link.to_node not in output_nodes:
-                    output_nodes.append(link.to_node)
-        
-        # Add the viewlayer node and its outputs to the prefix group
-        prefix_groups[prefix].append((vl_node, output_nodes))
-    
-    # Create frames for each prefix group
-    frames_created = 0
-    vertical_offset = 0
-    frame_spacing = 500  # Space between frames vertically
-    
-    for prefix, node_groups in prefix_groups.items():
-        if not node_groups:  # Skip empty groups
-            continue
-            
-        # Create a frame
+    if index is None:
+        index = LinkIndex.from_tree(tree)
+    
+    root = compress(build_trie(((n.layer, n) for n in viewlayer_nodes), separators, depth), min_size)
+    
+    # Each output is parented once, to the first layer that claims it
+    claimed = set()
+    top_level = []
+    frames = []
+    
+    def place(nodes, parent):
+        for vl_node in nodes:
+            members = [vl_node]
+            for output_node in index.connected_outputs(vl_node):
+                if output_node not in claimed:
+                    claimed.add(output_node)
+                    members.append(output_node)
+            for node in members:
+                node.parent = parent
+                if parent is None:
+                    top_level.append(node)
+    
+    def make_frames(group, parent):
         frame_node = tree.nodes.new('NodeFrame')
-        frame_node.name = f"Frame_{prefix}"
-        frame_node.label = f"Prefix: {prefix}"
+        frame_node.name = f"Frame_{group.label}"
+        frame_node.label = f"Prefix: {group.label}"
+        frame_node.shrink = True
+        tag(frame_node, owner, run_id)
         frame_node.use_custom_color = True
-        
-        # Generate a unique color based on the prefix
-        # This creates a pseudo-random but consistent color for each prefix
-        color_seed = sum(ord(c) for c in prefix)
-        frame_node.color = (
-            (color_seed * 13 % 100) / 100,  # R component
-            (color_seed * 23 % 100) / 100,  # G component
-            (color_seed * 37 % 100) / 100   # B component
-        )
-        
-        # Arrange nodes within the frame
-        horizontal_spacing = 400
-        
-        for i, (vl_node, connected_outputs) in enumerate(node_groups):
-            # Position the viewlayer node within this frame's group
-            vl_node.location = (0, -i * 300)
-            vl_node.parent = frame_node
-            
-            # Position and parent the connected output nodes
-            for j, output_node in enumerate(connected_outputs):
-                output_node.location = ((j + 1) * horizontal_spacing, -i * 300)
-                output_node.parent = frame_node
-        
-        # Adjust the frame position
-        frame_node.location = (0, vertical_offset)
-        vertical_offset -= frame_spacing + len(node_groups) * 300
-        
-        frames_created += 1
-    
-    return frames_created
+        frame_node.color = prefix_color(group.label)
+        frame_node.parent = parent
+        frames.append(frame_node)
+        place(group.items, frame_node)
+        for child in group.children.values():
+            make_frames(child, frame_node)
+        return frame_node
+    
+    # Layers without a prefix, or one used by too few layers, stay outside any frame
+    place(root.items, None)
+    for group in root.children.values():
+        top_level.append(make_frames(group, None))
+    return top_level, frames
 
 def group_viewlayer_nodes(tree):
     """Group ViewLayer nodes by their prefix in frames instead of node groups"""
     # Use frame grouping instead of node groups for RenderLayer nodes
-    return group_nodes_by_prefix_in_frames(tree)
\ No newline at end of file
+    return group_nodes_by_prefix_in_frames(tree)
@@ -0,0 +1,242 @@
+"""
+Estimate how many bytes and files File Output nodes will write.
+
+Works on OutputSpec values, built either from a ConnectionPlan or from the
+File Output nodes already in a tree, so nothing in here needs bpy. Sizes are
+raw pixel data scaled by typical compression ratios per codec; they are
+meant for capacity planning, not byte exact predictions. Write times divide
+those sizes by a sustained storage throughput the user supplies.
+"""
+import os
+import shutil
+from dataclasses import dataclass
+from .link_index import LinkIndex
+
+# Channels per pass when the socket type is unknown, matched by exact name then prefix
+PASS_CHANNELS = {
+    'Image': 4, 'Alpha': 1, 'Depth': 1, 'Mist': 1, 'IndexOB': 1, 'IndexMA': 1,
+    'Normal': 3, 'Position': 3, 'UV': 3, 'Vector': 4,
+}
+PREFIX_CHANNELS = (('Crypto', 4), ('Denoising Depth', 1), ('Shadow Catcher', 3))
+SOCKET_CHANNELS = {'RGBA': 4, 'VECTOR': 3, 'VALUE': 1}
+DEFAULT_CHANNELS = 3
+
+# Typical compressed size / raw size on production renders, per EXR codec and bit depth
+EXR_COMPRESSION_RATIOS = {
+    ('NONE', '16'): 1.0, ('NONE', '32'): 1.0,
+    ('RLE', '16'): 0.8, ('RLE', '32'): 0.9,
+    ('ZIPS', '16'): 0.55, ('ZIPS', '32'): 0.7,
+    ('ZIP', '16'): 0.5, ('ZIP', '32'): 0.65,
+    ('PIZ', '16'): 0.45, ('PIZ', '32'): 0.6,
+    ('PXR24', '16'): 0.5, ('PXR24', '32'): 0.4,
+    ('B44', '16'): 0.45, ('B44A', '16'): 0.4,
+    ('DWAA', '16'): 0.15, ('DWAA', '32'): 0.2,
+    ('DWAB', '16'): 0.13, ('DWAB', '32'): 0.18,
+}
+FORMAT_COMPRESSION_RATIOS = {'PNG': 0.5, 'JPEG': 0.1}
+EXR_HEADER_BYTES = 1024
+EXR_CHANNEL_HEADER_BYTES = 64
+
+@dataclass(frozen=True)
+class SlotSpec:
+    """One file slot: its path, channel count and the view layer feeding it"""
+    path: str
+    channels: int
+    layer: str = ""
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """A File Output node as seen by the estimator"""
+    name: str
+    file_format: str
+    exr_codec: str
+    color_depth: str
+    slots: tuple
+    base_path: str = ""
+
+def channels_for(pass_name, socket_type=None):
+    """Channel count of a pass, from its socket type when known"""
+    if socket_type in SOCKET_CHANNELS:
+        return SOCKET_CHANNELS[socket_type]
+    if pass_name in PASS_CHANNELS:
+        return PASS_CHANNELS[pass_name]
+    for prefix, channels in PREFIX_CHANNELS:
+        if pass_name.startswith(prefix):
+            return channels
+    return DEFAULT_CHANNELS
+
+def specs_from_plan(plan):
+    """OutputSpec for every output node of a ConnectionPlan"""
+    rl_layers = {rl.name: rl.layer for rl in plan.render_layers}
+    return [
+        OutputSpec(
+            name=node.name,
+            file_format=node.file_format,
+            exr_codec=node.exr_codec,
+            color_depth=node.color_depth,
+            slots=tuple(SlotSpec(slot.path, channels_for(slot.source_socket),
+                                 rl_layers.get(slot.source_node, node.layer))
+                        for slot in node.slots),
+            base_path=node.base_path,
+        )
+        for node in plan.outputs
+    ]
+
+def specs_from_tree(tree, index=None):
+    """OutputSpec for every File Output node in a tree, with channels read from the linked sockets"""
+    if index is None:
+        index = LinkIndex.from_tree(tree)
+    specs = []
+    for node in tree.nodes:
+        if node.type != 'OUTPUT_FILE':
+            continue
+        slots = []
+        for slot, socket in zip(node.file_slots, node.inputs):
+            links = index.input_links(socket)
+            if not links:
+                continue
+            source = links[0].from_socket
+            from_node = links[0].from_node
+            layer = from_node.layer if from_node.type == 'R_LAYERS' else ""
+            slots.append(SlotSpec(slot.path, channels_for(source.name, source.type), layer))
+        specs.append(OutputSpec(
+            name=node.name,
+            file_format=node.format.file_format,
+            exr_codec=node.format.exr_codec,
+            color_depth=node.format.color_depth,
+            slots=tuple(slots),
+            base_path=node.base_path,
+        ))
+    return specs
+
+def bytes_per_channel(file_format, color_depth):
+    """Stored bytes per channel sample before compression"""
+    if file_format in ('OPEN_EXR', 'OPEN_EXR_MULTILAYER'):
+        return 4 if color_depth == '32' else 2
+    return 2 if color_depth == '16' else 1
+
+def compression_ratio(file_format, exr_codec, color_depth):
+    """Typical compressed / raw size ratio"""
+    if file_format in ('OPEN_EXR', 'OPEN_EXR_MULTILAYER'):
+        return EXR_COMPRESSION_RATIOS.get((exr_codec, color_depth), 0.5)
+    return FORMAT_COMPRESSION_RATIOS.get(file_format, 1.0)
+
+def estimate_output(spec, width, height):
+    """
+    Bytes and files one output node writes per frame.
+    Returns (bytes_per_frame, files_per_frame, {layer: bytes_per_frame}).
+    """
+    pixels = width * height
+    sample = bytes_per_channel(spec.file_format, spec.color_depth)
+    ratio = compression_ratio(spec.file_format, spec.exr_codec, spec.color_depth)
+    is_exr = spec.file_format in ('OPEN_EXR', 'OPEN_EXR_MULTILAYER')
+
+    per_layer = {}
+    total = 0
+    for slot in spec.slots:
+        # Non-EXR formats store at most RGBA per file
+        channels = slot.channels if is_exr else min(slot.channels, 4)
+        size = pixels * channels * sample * ratio
+        if is_exr:
+            size += channels * EXR_CHANNEL_HEADER_BYTES
+        per_layer[slot.layer] = per_layer.get(slot.layer, 0) + size
+        total += size
+
+    if spec.file_format == 'OPEN_EXR_MULTILAYER':
+        files = 1 if spec.slots else 0
+    else:
+        files = len(spec.slots)
+    if is_exr:
+        total += files * EXR_HEADER_BYTES
+
+    return int(total), files, {layer: int(size) for layer, size in per_layer.items()}
+
+def write_seconds(size, throughput_mb):
+    """Seconds to write size bytes at throughput_mb MB/s, or None without a throughput"""
+    if throughput_mb <= 0:
+        return None
+    return size / (throughput_mb * 1024 * 1024)
+
+def estimate_outputs(specs, width, height, frame_count, throughput_mb=0.0):
+    """
+    Aggregate estimate over output specs for a frame range.
+    Returns a dict with per-frame and per-range totals, plus 'nodes' and 'layers' breakdowns.
+    With a throughput_mb in MB/s the write time per frame and for the range is
+    estimated too, otherwise those entries are None.
+    """
+    nodes = []
+    layers = {}
+    bytes_per_frame = 0
+    files_per_frame = 0
+
+    for spec in specs:
+        node_bytes, node_files, per_layer = estimate_output(spec, width, height)
+        nodes.append({'name': spec.name, 'bytes_per_frame': node_bytes, 'files_per_frame': node_files})
+        bytes_per_frame += node_bytes
+        files_per_frame += node_files
+        for layer, size in per_layer.items():
+            layers[layer] = layers.get(layer, 0) + size
+
+    frame_count = max(0, frame_count)
+    return {
+        'width': width,
+        'height': height,
+        'frames': frame_count,
+        'bytes_per_frame': bytes_per_frame,
+        'files_per_frame': files_per_frame,
+        'bytes_total': bytes_per_frame * frame_count,
+        'files_total': files_per_frame * frame_count,
+        'write_seconds_per_frame': write_seconds(bytes_per_frame, throughput_mb),
+        'write_seconds_total': write_seconds(bytes_per_frame * frame_count, throughput_mb),
+        'nodes': sorted(nodes, key=lambda n: n['bytes_per_frame'], reverse=True),
+        'layers': dict(sorted(layers.items(), key=lambda item: item[1], reverse=True)),
+    }
+
+def free_disk_bytes(path):
+    """Free bytes available to the user on the filesystem holding path, or its nearest existing parent"""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    if hasattr(os, 'statvfs'):
+        stats = os.statvfs(path)
+        return stats.f_bavail * stats.f_frsize
+    return shutil.disk_usage(path).free
+
+def preflight_disk(path, required_bytes, margin=0.05):
+    """
+    Check that required_bytes (plus a safety margin) fit under path.
+    Returns {'path', 'free', 'required', 'fits'}.
+    """
+    try:
+        free = free_disk_bytes(path)
+    except OSError:
+        free = None
+    required = int(required_bytes * (1.0 + margin))
+    return {
+        'path': path,
+        'free': free,
+        'required': required,
+        'fits': free is None or free >= required,
+    }
+
+def format_seconds(seconds):
+    """Human readable duration for write time estimates"""
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+def format_bytes(size):
+    """Human readable byte count"""
+    size = float(size)
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if abs(size) < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} PB"
@@ -0,0 +1,192 @@
+"""
+Manifest of expected render outputs and a verifier for it.
+
+build_manifest lists every file the File Output nodes write over a frame
+range, with the format, codec and layers each one should hold.
+verify_manifest checks a render directory against it: directories are
+listed by a thread pool of os.scandir workers, and EXR files are checked
+by parsing their headers (exr_header) in parallel, without decoding
+pixels. Pure Python, no bpy.
+"""
+import json
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .exr_header import ExrError, TruncatedExr, read_exr_header
+from .output_paths import FILE_EXTENSIONS, frame_path, has_valid_magic, node_file_templates
+
+MANIFEST_VERSION = 1
+EXR_FORMATS = ('OPEN_EXR', 'OPEN_EXR_MULTILAYER')
+
+def _relative(path, root):
+    """path relative to root when it lies inside it, otherwise unchanged"""
+    if root:
+        rel = os.path.relpath(path, root)
+        if not rel.startswith(os.pardir):
+            return rel.replace(os.sep, "/")
+    return path
+
+def build_manifest(specs, frames, output_root="", blend_dir="", use_extension=True, resolution=None, blend_file=""):
+    """
+    Manifest dict for OutputSpec-like nodes over frames. File paths inside
+    output_root are stored relative to it so the manifest can be checked
+    against a copy of the render directory.
+    """
+    output_root = os.path.normpath(output_root) if output_root else ""
+    frames = list(frames)
+    outputs = []
+    files = []
+    for spec in specs:
+        extension = FILE_EXTENSIONS.get(spec.file_format, "")
+        templates = node_file_templates(spec, blend_dir)
+        outputs.append({
+            'name': spec.name,
+            'file_format': spec.file_format,
+            'exr_codec': spec.exr_codec,
+            'color_depth': spec.color_depth,
+            'base_path': spec.base_path,
+            'layers': [slot.path for slot in spec.slots],
+        })
+        for frame in frames:
+            for slot_path, template in templates:
+                files.append({
+                    'path': _relative(frame_path(template, frame, extension, use_extension), output_root),
+                    'frame': frame,
+                    'node': spec.name,
+                    'layer': slot_path,
+                })
+    return {
+        'version': MANIFEST_VERSION,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'blend_file': blend_file,
+        'output_root': output_root,
+        'resolution': list(resolution) if resolution else None,
+        'frames': frames,
+        'outputs': outputs,
+        'files': files,
+    }
+
+def write_manifest(manifest, path):
+    """Write a manifest as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+
+def load_manifest(path):
+    """Read a manifest written by write_manifest"""
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+    return manifest
+
+def _list_directory(directory):
+    entries = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_file():
+                        entries[entry.name] = entry.stat().st_size
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return directory, entries
+
+def check_exr(path, output, resolution=None):
+    """
+    Problems with one EXR file as (kind, reason), or None if it looks right.
+    kind is 'truncated' or 'mis_encoded'.
+    """
+    try:
+        header = read_exr_header(path)
+    except TruncatedExr as e:
+        return 'truncated', str(e)
+    except (ExrError, OSError, struct.error) as e:
+        return 'mis_encoded', str(e)
+
+    if output['file_format'] in EXR_FORMATS and header['compression'] != output['exr_codec']:
+        return 'mis_encoded', f"compression {header['compression']}, expected {output['exr_codec']}"
+    channels = [name for name, _ in header['channels']]
+    if not channels:
+        return 'mis_encoded', "no channels"
+    if output['file_format'] == 'OPEN_EXR_MULTILAYER':
+        layers = {name.rsplit('.', 1)[0] for name in channels if '.' in name}
+        missing = [layer for layer in output['layers'] if layer not in layers]
+        if missing:
+            return 'mis_encoded', f"missing layers {', '.join(missing[:5])}"
+    if resolution:
+        xmin, ymin, xmax, ymax = header['data_window']
+        width, height = xmax - xmin + 1, ymax - ymin + 1
+        if (width, height) != tuple(resolution):
+            return 'mis_encoded', f"data window {width}x{height}, expected {resolution[0]}x{resolution[1]}"
+    return None
+
+def verify_manifest(manifest, render_dir=None, workers=8, check_headers=True, min_size=1):
+    """
+    Check the files of a manifest on disk.
+    Relative paths are resolved against render_dir, or the manifest's output_root.
+    Returns a report dict with 'missing', 'truncated', 'mis_encoded' lists,
+    'incomplete_frames' and timing.
+    """
+    started = time.perf_counter()
+    root = render_dir or manifest.get('output_root') or ""
+    outputs = {output['name']: output for output in manifest['outputs']}
+    resolution = manifest.get('resolution')
+
+    paths = []
+    for item in manifest['files']:
+        path = item['path']
+        if not os.path.isabs(path):
+            path = os.path.join(root, path.replace("/", os.sep))
+        paths.append(os.path.normpath(path))
+
+    # One scandir per directory, spread over the pool
+    directories = sorted({os.path.dirname(path) for path in paths})
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        listing = dict(pool.map(_list_directory, directories))
+
+    missing = []
+    truncated = []
+    to_check = []
+    for item, path in zip(manifest['files'], paths):
+        directory, name = os.path.split(path)
+        size = listing[directory].get(name)
+        if size is None:
+            missing.append(item)
+        elif size < min_size:
+            truncated.append(dict(item, reason=f"{size} bytes"))
+        elif check_headers:
+            to_check.append((item, path))
+
+    mis_encoded = []
+
+    def check(job):
+        item, path = job
+        output = outputs[item['node']]
+        if output['file_format'] in EXR_FORMATS:
+            return item, check_exr(path, output, resolution)
+        if not has_valid_magic(path, output['file_format']):
+            return item, ('mis_encoded', "bad file header")
+        return item, None
+
+    if to_check:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for item, problem in pool.map(check, to_check):
+                if problem is None:
+                    continue
+                kind, reason = problem
+                (truncated if kind == 'truncated' else mis_encoded).append(dict(item, reason=reason))
+
+    bad_frames = {item['frame'] for group in (missing, truncated, mis_encoded) for item in group}
+    return {
+        'files': len(paths),
+        'directories': len(directories),
+        'ok': len(paths) - len(missing) - len(truncated) - len(mis_encoded),
+        'missing': missing,
+        'truncated': truncated,
+        'mis_encoded': mis_encoded,
+        'incomplete_frames': sorted(bad_frames),
+        'seconds': time.perf_counter() - started,
+    }
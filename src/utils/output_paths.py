@@ -0,0 +1,183 @@
+"""
+Resolve the files File Output nodes write for a given frame.
+
+Mirrors Blender's naming: multilayer EXR nodes write one file per frame at
+base_path, other formats write one file per slot at base_path/slot_path.
+A run of '#' in the name is replaced by the zero padded frame number,
+otherwise a 4 digit frame number is appended. Pure Python, no bpy; nodes
+are described by anything with base_path, file_format and slots[*].path
+(OutputSpec, OutputNodePlan).
+"""
+import os
+import re
+
+FILE_EXTENSIONS = {
+    'OPEN_EXR': '.exr',
+    'OPEN_EXR_MULTILAYER': '.exr',
+    'PNG': '.png',
+    'JPEG': '.jpg',
+    'TIFF': '.tif',
+    'BMP': '.bmp',
+    'TARGA': '.tga',
+    'TARGA_RAW': '.tga',
+    'HDR': '.hdr',
+    'JPEG2000': '.jp2',
+    'CINEON': '.cin',
+    'DPX': '.dpx',
+    'WEBP': '.webp',
+}
+
+_HASH_RUN = re.compile(r"#+")
+
+def resolve_blender_path(path, blend_dir=""):
+    """Expand a leading // relative to blend_dir and use native separators"""
+    if path.startswith("//"):
+        path = os.path.join(blend_dir, path[2:])
+    path = path.replace("\\", os.sep).replace("/", os.sep)
+    return os.path.normpath(path) + (os.sep if path.endswith(os.sep) else "")
+
+def frame_path(path, frame, extension="", use_extension=True):
+    """Insert the frame number into path the way Blender does"""
+    head, tail = os.path.split(path)
+    runs = list(_HASH_RUN.finditer(tail))
+    if runs:
+        run = runs[-1]
+        tail = f"{tail[:run.start()]}{frame:0{len(run.group())}d}{tail[run.end():]}"
+    else:
+        tail = f"{tail}{frame:04d}"
+    path = os.path.join(head, tail)
+    if use_extension and extension and not path.lower().endswith(extension):
+        path += extension
+    return path
+
+def node_file_templates(node, blend_dir=""):
+    """
+    Path templates, before frame substitution, of every file a node writes.
+    Returns [(slot_path, template), ...]; multilayer nodes yield a single entry with slot_path None.
+    """
+    base_path = resolve_blender_path(node.base_path, blend_dir)
+    if node.file_format == 'OPEN_EXR_MULTILAYER':
+        return [(None, base_path)] if node.slots else []
+    return [(slot.path, os.path.join(base_path, resolve_blender_path(slot.path)))
+            for slot in node.slots]
+
+def expected_files(node, frame, blend_dir="", use_extension=True):
+    """Absolute paths of the files a node writes for frame"""
+    extension = FILE_EXTENSIONS.get(node.file_format, "")
+    return [frame_path(template, frame, extension, use_extension)
+            for _, template in node_file_templates(node, blend_dir)]
+
+def frame_range(start, end, step=1):
+    """Frames rendered for an inclusive range"""
+    return range(start, end + 1, max(1, step))
+
+class OutputIndex:
+    """
+    Sizes of files that already exist, built lazily with a single os.scandir
+    per directory instead of one stat call per expected file.
+    """
+
+    def __init__(self):
+        self._dirs = {}
+
+    def _scan(self, directory):
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            entries[entry.name] = entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        self._dirs[directory] = entries
+        return entries
+
+    def scan_tree(self, root):
+        """Index every directory below root up front, one os.scandir each"""
+        pending = [os.path.normpath(root)]
+        while pending:
+            directory = pending.pop()
+            entries = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file():
+                                entries[entry.name] = entry.stat().st_size
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            self._dirs[directory] = entries
+        return self
+
+    def file_count(self):
+        """Number of files indexed so far"""
+        return sum(len(entries) for entries in self._dirs.values())
+
+    def size(self, path):
+        """Size of path in bytes, or None if it does not exist"""
+        directory, name = os.path.split(path)
+        entries = self._dirs.get(directory)
+        if entries is None:
+            entries = self._scan(directory)
+        return entries.get(name)
+
+    def add(self, path, size):
+        """Record a file written after the directory was scanned"""
+        directory, name = os.path.split(path)
+        if directory not in self._dirs:
+            self._scan(directory)
+        self._dirs[directory][name] = size
+
+    def forget(self, directory=None):
+        """Drop scanned directories so they are read again"""
+        if directory is None:
+            self._dirs.clear()
+        else:
+            self._dirs.pop(directory, None)
+
+# Leading bytes of the formats File Output nodes usually write
+FILE_MAGIC = {
+    'OPEN_EXR': b"\x76\x2f\x31\x01",
+    'OPEN_EXR_MULTILAYER': b"\x76\x2f\x31\x01",
+    'PNG': b"\x89PNG\r\n\x1a\n",
+    'JPEG': b"\xff\xd8\xff",
+}
+
+def has_valid_magic(path, file_format):
+    """Return True if the file starts with the magic bytes of file_format, or the format has none listed"""
+    magic = FILE_MAGIC.get(file_format)
+    if magic is None:
+        return True
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(magic)) == magic
+    except OSError:
+        return False
+
+def frame_complete(nodes, frame, index, blend_dir="", use_extension=True, min_size=1, check_header=False):
+    """
+    Return True if every file the nodes write for frame exists with at least
+    min_size bytes and, with check_header, starts with the right magic bytes.
+    """
+    for node in nodes:
+        for path in expected_files(node, frame, blend_dir, use_extension):
+            size = index.size(path)
+            if size is None or size < min_size:
+                return False
+            if check_header and not has_valid_magic(path, node.file_format):
+                return False
+    return True
+
+def completed_frames(nodes, frames, blend_dir="", use_extension=True, index=None, min_size=1, check_header=False):
+    """The frames whose expected files all exist, as a set"""
+    if index is None:
+        index = OutputIndex()
+    return {frame for frame in frames
+            if frame_complete(nodes, frame, index, blend_dir, use_extension, min_size, check_header)}
@@ -0,0 +1,89 @@
+"""
+Mark the nodes, frames and node groups the add-on creates.
+
+Every item gets an ID property naming its owner (the base filename of the
+.blend it was wired for) and one naming the run that created or last
+updated it. Cleanup collects tagged items in a single pass over the tree
+and removes them afterwards, instead of matching names or removing nodes
+while iterating. Nodes made before tagging existed are still recognised by
+their names.
+"""
+import uuid
+
+import bpy
+from .connection_planner import GP_OUTPUT_NAME, is_planned_output_name
+from . import tree_index
+
+OWNER_PROP = "auto_node_outputs_owner"
+RUN_PROP = "auto_node_outputs_run"
+
+# Name prefixes of nodes created by older versions without tags
+LEGACY_PREFIXES = ("ViewLayer_", "Output_")
+LEGACY_OUTPUT_SUFFIXES = ("_EXR16_", "_EXR32_", "_EXR16_DATA", "_EXR32_DATA")
+
+def new_run_id():
+    """Short unique ID for one connect run"""
+    return uuid.uuid4().hex[:12]
+
+def tag(item, owner=None, run_id=None):
+    """Mark a node, frame or node group as created by the add-on"""
+    item[OWNER_PROP] = owner or ""
+    if run_id:
+        item[RUN_PROP] = run_id
+
+def is_tagged(item, owner=None, run_id=None):
+    """Return True if item carries the add-on tag, optionally for this owner and run"""
+    value = item.get(OWNER_PROP)
+    if value is None:
+        return False
+    if owner is not None and value != owner:
+        return False
+    return run_id is None or item.get(RUN_PROP) == run_id
+
+def is_legacy_node(node, owner=None):
+    """Untagged node whose name matches what older versions of the add-on created"""
+    if OWNER_PROP in node:
+        return False
+    if node.type == 'R_LAYERS':
+        return node.name.startswith(LEGACY_PREFIXES[0])
+    if node.type == 'OUTPUT_FILE':
+        if node.name.startswith(LEGACY_PREFIXES[1]):
+            return True
+        if owner is None:
+            return node.name == GP_OUTPUT_NAME or node.name.endswith(LEGACY_OUTPUT_SUFFIXES)
+        return is_planned_output_name(node.name, owner)
+    return False
+
+def owned_nodes(tree, owner=None, run_id=None, node_type=None, include_legacy=True):
+    """
+    Nodes of tree created by the add-on, collected in one pass.
+    Legacy nodes are only included when no run_id is given, since they carry none.
+    """
+    legacy = include_legacy and run_id is None
+    found = []
+    for node in tree.nodes:
+        if node_type is not None and node.type != node_type:
+            continue
+        if is_tagged(node, owner, run_id) or (legacy and is_legacy_node(node, owner)):
+            found.append(node)
+    return found
+
+def remove_owned(tree, owner=None, run_id=None, include_legacy=True):
+    """
+    Remove the add-on's nodes and frames from tree in one batch, then the
+    tagged node groups left without users.
+    Returns (nodes_removed, groups_removed).
+    """
+    targets = owned_nodes(tree, owner, run_id, include_legacy=include_legacy)
+    groups = {node.node_tree for node in targets
+              if node.type == 'GROUP' and node.node_tree is not None}
+    for node in targets:
+        tree.nodes.remove(node)
+    tree_index.invalidate(tree)
+
+    removed_groups = 0
+    for group in groups:
+        if group.users == 0 and is_tagged(group, owner, run_id):
+            bpy.data.node_groups.remove(group)
+            removed_groups += 1
+    return len(targets), removed_groups
@@ -0,0 +1,182 @@
+"""
+Rule based routing of render passes to named output buckets.
+
+A rule matches pass names by glob, regular expression or pass type and
+sends them to a bucket; every bucket becomes its own File Output node with
+its own format, codec and bit depth. Rule tables are compiled once into a
+CompiledRouter. Pure Python, no bpy.
+"""
+import fnmatch
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+MATCH_TYPES = ('GLOB', 'REGEX', 'PASS_TYPE')
+
+# Pass types a PASS_TYPE rule can name, checked in this order
+PASS_TYPES = ('CRYPTOMATTE', 'AOV', 'LIGHTGROUP', 'DATA', 'IMAGE', 'LIGHT', 'OTHER')
+
+DATA_PASSES = frozenset((
+    'Depth', 'Position', 'Normal', 'Vector', 'UV', 'Mist', 'IndexOB', 'IndexMA',
+))
+IMAGE_PASSES = frozenset(('Image', 'Alpha', 'Noisy Image', 'Noisy Shadow Catcher'))
+LIGHT_PREFIXES = ('Diff', 'Gloss', 'Trans', 'Volume', 'Emit', 'Env', 'AO', 'Shadow')
+
+# Numbered backreferences and group conditions, which point at the wrong
+# group once a pattern is wrapped into a merged alternation
+_NUMBERED_REFERENCE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Send passes matching pattern to bucket. For PASS_TYPE, pattern lists pass types separated by commas"""
+    match_type: str
+    pattern: str
+    bucket: str
+
+@dataclass(frozen=True)
+class OutputBucket:
+    """A named File Output node setup"""
+    name: str
+    file_format: str = 'OPEN_EXR_MULTILAYER'
+    exr_codec: str = 'ZIP'
+    color_depth: str = '16'
+
+# Reproduces the classic main/secondary split
+DEFAULT_RULES = (
+    RoutingRule('PASS_TYPE', 'CRYPTOMATTE', 'secondary'),
+    RoutingRule('REGEX', 'Depth|Position|Normal|Vector', 'secondary'),
+)
+
+def pass_type(name, aovs=(), lightgroups=()):
+    """Classify a Render Layers output name into one of PASS_TYPES"""
+    if name.startswith('Crypto'):
+        return 'CRYPTOMATTE'
+    if name in aovs:
+        return 'AOV'
+    if name.startswith('Combined_') and name[len('Combined_'):] in lightgroups:
+        return 'LIGHTGROUP'
+    if name in DATA_PASSES or name.startswith('Denoising'):
+        return 'DATA'
+    if name in IMAGE_PASSES:
+        return 'IMAGE'
+    if name.startswith(LIGHT_PREFIXES):
+        return 'LIGHT'
+    return 'OTHER'
+
+def rules_from(items):
+    """Build a tuple of RoutingRule from rule objects or dicts with the same fields"""
+    rules = []
+    for item in items:
+        if isinstance(item, dict):
+            rules.append(RoutingRule(item['match_type'], item['pattern'], item['bucket']))
+        else:
+            rules.append(RoutingRule(item.match_type, item.pattern, item.bucket))
+    return tuple(rules)
+
+def buckets_from(items):
+    """Build a tuple of OutputBucket from bucket objects or dicts with the same fields"""
+    buckets = []
+    for item in items:
+        if isinstance(item, dict):
+            buckets.append(OutputBucket(**item))
+        else:
+            buckets.append(OutputBucket(item.name, item.file_format, item.exr_codec, item.color_depth))
+    return tuple(buckets)
+
+class CompiledRouter:
+    """
+    A rule table compiled for fast matching. Runs of GLOB/REGEX rules are
+    merged into a single alternation regex so one match call finds the first
+    matching rule; runs that cannot be merged, because of numbered
+    backreferences or group names used by more than one rule, keep one
+    pattern per rule. PASS_TYPE rules become set lookups. The first matching
+    rule wins, unmatched passes go to the first bucket. Raises ValueError for
+    an invalid regex or a rule naming a bucket that does not exist.
+    """
+
+    def __init__(self, rules, buckets):
+        if not buckets:
+            raise ValueError("At least one output bucket is required")
+        self.buckets = tuple(buckets)
+        self.bucket_names = tuple(b.name for b in buckets)
+        self.default_bucket = self.bucket_names[0]
+        self._steps = []
+
+        pending = []
+        for rule in rules:
+            if rule.match_type not in MATCH_TYPES:
+                raise ValueError(f"Unknown match type: {rule.match_type}")
+            if rule.bucket not in self.bucket_names:
+                raise ValueError(f"Routing rule {rule.pattern!r} sends passes to unknown bucket {rule.bucket!r}")
+            bucket = rule.bucket
+            if rule.match_type == 'PASS_TYPE':
+                self._flush(pending)
+                pending = []
+                types = frozenset(t.strip().upper() for t in rule.pattern.split(',') if t.strip())
+                self._steps.append(('TYPE', types, bucket))
+            else:
+                pending.append((rule, bucket))
+        self._flush(pending)
+
+    def _flush(self, pending):
+        if not pending:
+            return
+        exprs = []
+        for rule, bucket in pending:
+            if rule.match_type == 'GLOB':
+                expr = fnmatch.translate(rule.pattern)
+            else:
+                try:
+                    re.compile(rule.pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid routing regex {rule.pattern!r}: {e}")
+                expr = rule.pattern
+            exprs.append((expr, bucket))
+
+        if not any(_NUMBERED_REFERENCE.search(expr) for expr, _ in exprs):
+            parts = []
+            buckets = {}
+            for idx, (expr, bucket) in enumerate(exprs):
+                group = f"r{len(self._steps)}_{idx}"
+                parts.append(f"(?P<{group}>(?:{expr}))")
+                buckets[group] = bucket
+            try:
+                self._steps.append(('REGEX', re.compile(r"\A(?:" + "|".join(parts) + r")\Z"), buckets))
+                return
+            except re.error:
+                # Group names repeated across rules, or inline flags past the start
+                pass
+        for expr, bucket in exprs:
+            self._steps.append(('PATTERN', re.compile(r"\A(?:" + expr + r")\Z"), bucket))
+
+    def bucket_for(self, name, aovs=(), lightgroups=()):
+        """Bucket name for a single pass"""
+        kind = None
+        for step in self._steps:
+            if step[0] == 'TYPE':
+                if kind is None:
+                    kind = pass_type(name, aovs, lightgroups)
+                if kind in step[1]:
+                    return step[2]
+            elif step[0] == 'REGEX':
+                match = step[1].match(name)
+                if match is not None:
+                    return step[2][match.lastgroup]
+            elif step[1].match(name) is not None:
+                return step[2]
+        return self.default_bucket
+
+    def route(self, passes, aovs=(), lightgroups=()):
+        """
+        Group pass names by bucket.
+        Returns ((bucket_name, (pass, ...)), ...) in bucket order, skipping empty buckets.
+        """
+        routed = {name: [] for name in self.bucket_names}
+        for name in passes:
+            routed[self.bucket_for(name, aovs, lightgroups)].append(name)
+        return tuple((name, tuple(routed[name])) for name in self.bucket_names if routed[name])
+
+@lru_cache(maxsize=32)
+def compile_router(rules, buckets):
+    """Compile a rule table once per distinct (rules, buckets) pair"""
+    return CompiledRouter(rules, buckets)
@@ -0,0 +1,313 @@
+"""
+Snapshot the scene for the connection planner and materialize its plans.
+"""
+from collections import ChainMap
+from .connection_planner import EXR_FORMATS, LayerSnapshot
+from .ownership import owned_nodes, tag
+from .profiler import NULL_PROFILER
+from . import tree_index
+
+def read_enabled_passes(rl_node):
+    """Names of the enabled outputs of a Render Layers node, in socket order"""
+    return tuple(output.name for output in rl_node.outputs if output.enabled)
+
+# Render Layers outputs enabled by view layer flags, in socket order
+VIEWLAYER_PASS_FLAGS = (
+    ('use_pass_z', ('Depth',)),
+    ('use_pass_mist', ('Mist',)),
+    ('use_pass_position', ('Position',)),
+    ('use_pass_normal', ('Normal',)),
+    ('use_pass_vector', ('Vector',)),
+    ('use_pass_uv', ('UV',)),
+    ('use_pass_object_index', ('IndexOB',)),
+    ('use_pass_material_index', ('IndexMA',)),
+    ('use_pass_diffuse_direct', ('DiffDir',)),
+    ('use_pass_diffuse_indirect', ('DiffInd',)),
+    ('use_pass_diffuse_color', ('DiffCol',)),
+    ('use_pass_glossy_direct', ('GlossDir',)),
+    ('use_pass_glossy_indirect', ('GlossInd',)),
+    ('use_pass_glossy_color', ('GlossCol',)),
+    ('use_pass_transmission_direct', ('TransDir',)),
+    ('use_pass_transmission_indirect', ('TransInd',)),
+    ('use_pass_transmission_color', ('TransCol',)),
+    ('use_pass_emit', ('Emit',)),
+    ('use_pass_environment', ('Env',)),
+    ('use_pass_ambient_occlusion', ('AO',)),
+    ('use_pass_shadow', ('Shadow',)),
+)
+CYCLES_PASS_FLAGS = (
+    ('use_pass_volume_direct', ('VolumeDir',)),
+    ('use_pass_volume_indirect', ('VolumeInd',)),
+    ('use_pass_shadow_catcher', ('Shadow Catcher',)),
+    ('denoising_store_passes', ('Denoising Normal', 'Denoising Albedo', 'Denoising Depth')),
+)
+CRYPTOMATTE_FLAGS = (
+    ('use_pass_cryptomatte_object', 'CryptoObject'),
+    ('use_pass_cryptomatte_material', 'CryptoMaterial'),
+    ('use_pass_cryptomatte_asset', 'CryptoAsset'),
+)
+
+def viewlayer_passes(viewlayer):
+    """
+    Render Layers output names a view layer enables, derived from its pass
+    flags without creating a node. Close to, but not guaranteed to match, the
+    sockets of a real Render Layers node.
+    """
+    passes = ['Image', 'Alpha']
+    for flag, names in VIEWLAYER_PASS_FLAGS:
+        if getattr(viewlayer, flag, False):
+            passes.extend(names)
+    cycles = getattr(viewlayer, "cycles", None)
+    if cycles is not None:
+        for flag, names in CYCLES_PASS_FLAGS:
+            if getattr(cycles, flag, False):
+                passes.extend(names)
+    levels = (getattr(viewlayer, "pass_cryptomatte_depth", 6) + 1) // 2
+    for flag, prefix in CRYPTOMATTE_FLAGS:
+        if getattr(viewlayer, flag, False):
+            passes.extend(f"{prefix}{level:02d}" for level in range(levels))
+    passes.extend(aov.name for aov in viewlayer.aovs)
+    passes.extend(f"Combined_{lg.name}" for lg in getattr(viewlayer, "lightgroups", ()))
+    return tuple(passes)
+
+def layer_snapshot(viewlayer, rl_node=None):
+    """LayerSnapshot of one view layer, with passes read from rl_node or derived from its pass flags"""
+    passes = read_enabled_passes(rl_node) if rl_node is not None else viewlayer_passes(viewlayer)
+    return LayerSnapshot(
+        viewlayer.name,
+        passes,
+        tuple(aov.name for aov in viewlayer.aovs),
+        tuple(lg.name for lg in getattr(viewlayer, "lightgroups", ())),
+    )
+
+def snapshot_layers(scene, tree, probe=True):
+    """
+    Return a LayerSnapshot for every view layer of the scene.
+    Passes are read from the layer's existing Render Layers node when there is
+    one, otherwise from a single temporary probe node that is removed again.
+    With probe=False no node is ever created and passes of layers without a
+    node come from viewlayer_passes instead.
+    """
+    index = tree_index.get_tree_index(tree)
+    snapshots = []
+    probe_node = None
+    try:
+        for viewlayer in scene.view_layers:
+            rl_node = index.rl_node(viewlayer.name)
+            if rl_node is None and probe:
+                if probe_node is None:
+                    probe_node = tree.nodes.new('CompositorNodeRLayers')
+                probe_node.layer = viewlayer.name
+                rl_node = probe_node
+            snapshots.append(layer_snapshot(viewlayer, rl_node))
+    finally:
+        if probe_node is not None:
+            tree.nodes.remove(probe_node)
+            tree_index.invalidate(tree)
+    return tuple(snapshots)
+
+def new_apply_stats():
+    """Counters filled in by apply_plan"""
+    return {'created': 0, 'updated': 0, 'removed': 0, 'slots': 0, 'links': 0}
+
+def ensure_node(tree, bl_idname, name, stats, existing=None):
+    """
+    Return the node called `name` if it exists with the right type,
+    otherwise create it. Counts created nodes in stats.
+    existing is an optional name -> node dict used instead of searching tree.nodes.
+    """
+    node = existing.get(name) if existing is not None else tree.nodes.get(name)
+    if node is not None and node.bl_idname == bl_idname:
+        return node, False
+    if node is not None:
+        tree.nodes.remove(node)
+        stats['removed'] += 1
+    node = tree.nodes.new(bl_idname)
+    node.name = name
+    stats['created'] += 1
+    return node, True
+
+def set_if_changed(obj, attr, value):
+    """Assign obj.attr only when it differs, returns True if it changed"""
+    if getattr(obj, attr) != value:
+        setattr(obj, attr, value)
+        return True
+    return False
+
+def apply_output_format(node, file_format, codec, bitdepth):
+    """Set file format and, for EXR formats, codec and bit depth. Returns True if changed"""
+    changed = set_if_changed(node.format, "file_format", file_format)
+    if file_format in EXR_FORMATS:
+        changed |= set_if_changed(node.format, "exr_codec", codec)
+        changed |= set_if_changed(node.format, "color_depth", bitdepth)
+    return changed
+
+def incoming_links(tree):
+    """to_socket -> from_socket for every link of the tree, in one pass over tree.links"""
+    return {link.to_socket: link.from_socket for link in tree.links}
+
+def size_file_slots(output_node, paths, stats=None):
+    """
+    Give output_node exactly the file slots in paths, in one step: surplus
+    slots are dropped from the end, existing ones renamed in place and only
+    the missing ones created. Always keeps at least one slot.
+    Returns the number of slots touched.
+    """
+    slots = output_node.file_slots
+    count = len(slots)
+    touched = 0
+
+    surplus = count - max(1, len(paths))
+    if surplus > 0:
+        inputs = output_node.inputs
+        for _ in range(surplus):
+            slots.remove(inputs[-1])
+        count -= surplus
+        touched += surplus
+
+    for slot, path in zip(slots, paths):
+        if slot.path != path:
+            slot.path = path
+            touched += 1
+
+    for path in paths[count:]:
+        slots.new(path)
+        touched += 1
+
+    if stats is not None:
+        stats['slots'] += touched
+    return touched
+
+def link_file_slots(tree, output_node, sockets, incoming, stats=None):
+    """
+    Link sockets to the inputs of output_node in order, skipping inputs that
+    incoming (from incoming_links) already shows fed by the right socket.
+    Returns the number of links created.
+    """
+    new_link = tree.links.new
+    created = 0
+    for target, socket in zip(list(output_node.inputs), sockets):
+        if incoming.get(target) != socket:
+            new_link(socket, target)
+            created += 1
+    if stats is not None:
+        stats['links'] += created
+    return created
+
+def sync_output_slots(tree, output_node, sources, stats, incoming=None):
+    """
+    Make the file slots of output_node match sources, a list of
+    (slot_path, socket) pairs, touching only the slots and links that differ.
+    incoming is an optional incoming_links dict shared across nodes; without
+    it the node's current links are read from the tree.
+    Returns True if anything changed.
+    """
+    if incoming is None:
+        incoming = {link.to_socket: link.from_socket for link in tree.links if link.to_node == output_node}
+    changed = size_file_slots(output_node, [path for path, _ in sources], stats) > 0
+    changed |= link_file_slots(tree, output_node, [socket for _, socket in sources], incoming, stats) > 0
+    return changed
+
+def resolve_slot_sources(rl_nodes, slots):
+    """Turn SlotPlan entries into (slot_path, socket) pairs using the given RL nodes by name"""
+    sources = []
+    for slot in slots:
+        rl_node = rl_nodes.get(slot.source_node)
+        if rl_node is None:
+            continue
+        socket = rl_node.outputs.get(slot.source_socket)
+        if socket is not None:
+            sources.append((slot.path, socket))
+    return sources
+
+def apply_plan(tree, plan, mode='REBUILD', progress=None, run_id=None, existing=None, prune=True,
+               profiler=NULL_PROFILER):
+    """
+    Materialize a ConnectionPlan in the tree.
+
+    REBUILD creates every planned node from scratch. RECONCILE reuses nodes by
+    name, only writes properties, slots and links that differ, keeps existing
+    node locations and removes add-on nodes the plan no longer contains.
+    With prune=False nothing is removed, so a plan covering only some layers
+    can be applied; existing is then a name -> node dict of the planned nodes
+    and the Render Layers nodes their slots read from, used instead of the
+    tree index.
+    Every planned node is tagged with plan.base_filename, but run_id is only
+    stamped on nodes this run created or changed (properties, slots or
+    links), so clearing the last run leaves untouched nodes in place. The
+    time spent on nodes, slots and links is added to profiler.
+    Returns the stats dict from new_apply_stats.
+    """
+    stats = new_apply_stats()
+    reconcile = mode == 'RECONCILE'
+    if reconcile and existing is None:
+        existing = tree_index.get_tree_index(tree).nodes_by_name
+    rl_nodes = {}
+    # Fresh nodes start unlinked, so only reconciling needs the current links
+    with profiler.phase('links'):
+        incoming = incoming_links(tree) if reconcile else {}
+
+    for idx, planned in enumerate(plan.render_layers):
+        if progress is not None:
+            progress(idx)
+        with profiler.phase('nodes'):
+            if reconcile:
+                rl_node, created = ensure_node(tree, 'CompositorNodeRLayers', planned.name, stats, existing)
+            else:
+                rl_node = tree.nodes.new('CompositorNodeRLayers')
+                rl_node.name = planned.name
+                created = True
+                stats['created'] += 1
+            if created:
+                rl_node.location = planned.location
+            changed = set_if_changed(rl_node, "label", planned.label)
+            changed |= set_if_changed(rl_node, "layer", planned.layer)
+            tag(rl_node, plan.base_filename, run_id if created or changed else None)
+        if changed and not created:
+            stats['updated'] += 1
+        rl_nodes[planned.name] = rl_node
+
+    for planned in plan.outputs:
+        with profiler.phase('nodes'):
+            if reconcile:
+                node, created = ensure_node(tree, 'CompositorNodeOutputFile', planned.name, stats, existing)
+            else:
+                node = tree.nodes.new('CompositorNodeOutputFile')
+                node.name = planned.name
+                created = True
+                stats['created'] += 1
+            if created:
+                node.location = planned.location
+            changed = set_if_changed(node, "label", planned.label)
+            changed |= set_if_changed(node, "base_path", planned.base_path)
+            changed |= apply_output_format(node, planned.file_format, planned.exr_codec, planned.color_depth)
+        # Same as sync_output_slots, split so slots and links are timed apart
+        with profiler.phase('slots'):
+            sources = resolve_slot_sources(ChainMap(rl_nodes, existing) if reconcile else rl_nodes, planned.slots)
+            changed |= size_file_slots(node, [path for path, _ in sources], stats) > 0
+        with profiler.phase('links'):
+            changed |= link_file_slots(tree, node, [socket for _, socket in sources], incoming, stats) > 0
+        tag(node, plan.base_filename, run_id if created or changed else None)
+        if changed and not created:
+            stats['updated'] += 1
+
+    if reconcile and prune:
+        with profiler.phase('nodes'):
+            stats['removed'] += remove_stale_nodes(tree, plan)
+
+    profiler.count(**stats)
+    tree_index.invalidate(tree)
+    return stats
+
+def remove_stale_nodes(tree, plan):
+    """Remove add-on nodes for plan.base_filename that the plan does not contain"""
+    wanted = plan.node_names()
+    stale = [node for node in owned_nodes(tree, plan.base_filename)
+             if node.name not in wanted and node.type in ('R_LAYERS', 'OUTPUT_FILE')]
+    for node in stale:
+        tree.nodes.remove(node)
+    return len(stale)
+
+def owned_output_nodes(tree, base_filename):
+    """File Output nodes created by the add-on for base_filename"""
+    return owned_nodes(tree, base_filename, node_type='OUTPUT_FILE')
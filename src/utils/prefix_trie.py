@@ -0,0 +1,105 @@
+"""
+Multi-level grouping of names by shared prefixes, and grid packing of boxes.
+
+Names are split into tokens on a set of separator characters and inserted
+into a trie. Groups are the trie nodes down to a maximum depth, with chains
+of single children merged so "EP01_SQ010_SH0010" and "EP01_SQ010_SH0020"
+share one "EP01_SQ010" group instead of two nested ones. Pure Python, no bpy.
+"""
+import math
+import re
+
+DEFAULT_SEPARATORS = "_.- "
+
+class PrefixGroup:
+    """A trie node: its full token prefix, the items ending here and its child groups"""
+
+    __slots__ = ('tokens', 'items', 'children')
+
+    def __init__(self, tokens=()):
+        self.tokens = tokens
+        self.items = []
+        self.children = {}
+
+    @property
+    def label(self):
+        return "_".join(self.tokens)
+
+    def count(self):
+        """Items in this group and all its subgroups"""
+        return len(self.items) + sum(child.count() for child in self.children.values())
+
+    def walk(self):
+        """Every item below this group, depth first"""
+        yield from self.items
+        for child in self.children.values():
+            yield from child.walk()
+
+def split_tokens(name, separators=DEFAULT_SEPARATORS):
+    """Split name on any of the separator characters, dropping empty tokens"""
+    if not separators:
+        return [name]
+    tokens = re.split("[" + re.escape(separators) + "]+", name)
+    return [token for token in tokens if token] or [name]
+
+def build_trie(named_items, separators=DEFAULT_SEPARATORS, depth=2):
+    """
+    Group (name, item) pairs by up to depth leading tokens.
+    The last token of a name never becomes a group of its own, so every
+    item sits in a group shared with its siblings. Returns the root PrefixGroup.
+    """
+    root = PrefixGroup()
+    for name, item in named_items:
+        tokens = split_tokens(name, separators)[:-1][:max(0, depth)]
+        group = root
+        for token in tokens:
+            child = group.children.get(token)
+            if child is None:
+                child = PrefixGroup(group.tokens + (token,))
+                group.children[token] = child
+            group = child
+        group.items.append(item)
+    return root
+
+def compress(group, min_size=1):
+    """
+    Merge chains of groups that hold nothing but a single subgroup, and fold
+    subgroups smaller than min_size into their parent. Returns group.
+    """
+    for key, child in list(group.children.items()):
+        compress(child, min_size)
+        if child.count() < min_size:
+            group.items.extend(child.walk())
+            del group.children[key]
+    while group.tokens and not group.items and len(group.children) == 1:
+        (child,) = group.children.values()
+        group.tokens = child.tokens
+        group.items = child.items
+        group.children = child.children
+    return group
+
+def pack_grid(sizes, columns=0, gap=40.0):
+    """
+    Pack boxes into columns, each box going into the currently shortest one.
+    sizes is a list of (width, height); columns=0 picks about sqrt(n).
+    Returns a list of (x, top) in the same order, with top growing downwards.
+    """
+    if not sizes:
+        return []
+    columns = columns or max(1, math.ceil(math.sqrt(len(sizes))))
+    columns = min(columns, len(sizes))
+    heights = [0.0] * columns
+    widths = [0.0] * columns
+    placed = []
+    for width, height in sizes:
+        column = min(range(columns), key=heights.__getitem__)
+        placed.append((column, heights[column]))
+        heights[column] += height + gap
+        widths[column] = max(widths[column], width)
+
+    xs = []
+    x = 0.0
+    for width in widths:
+        xs.append(x)
+        x += width + gap
+    return [(xs[column], top) for column, top in placed]
@@ -0,0 +1,154 @@
+"""
+Phase timing and logging for the add-on's operators.
+
+A Profiler times named phases (layer classification, node creation, slot
+creation, linking, framing, arranging) with time.perf_counter_ns and keeps
+counts next to them. When disabled every phase is a shared no-op context,
+so operators can be instrumented unconditionally. Results go to the
+"auto_node_outputs" logger, a one-line summary for the operator report and
+an optional JSON dump, with an optional cProfile capture to a .prof file.
+Pure Python, no bpy.
+"""
+import cProfile
+import json
+import logging
+import os
+import time
+from contextlib import nullcontext
+
+logger = logging.getLogger("auto_node_outputs")
+
+# Phases in the order they run, so summaries read the same for every operator
+PHASES = ('classify', 'nodes', 'slots', 'links', 'framing', 'arranging')
+
+_NULL_PHASE = nullcontext()
+
+def configure_logging(level=logging.INFO):
+    """Send the add-on's log records to stderr once, as Blender installs no handler of its own"""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("Auto Node Outputs %(levelname)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+def format_ns(ns):
+    """Human readable duration"""
+    if ns >= 1_000_000_000:
+        return f"{ns / 1e9:.2f} s"
+    if ns >= 1_000_000:
+        return f"{ns / 1e6:.1f} ms"
+    return f"{ns / 1e3:.0f} us"
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.started)
+        return False
+
+class Profiler:
+    """Accumulated time and call count per phase, plus free-form counts, for one operator run"""
+
+    def __init__(self, operator, enabled=True, capture_path=None, json_path=None):
+        self.operator = operator
+        self.enabled = enabled
+        self.capture_path = capture_path if enabled else None
+        self.json_path = json_path if enabled else None
+        self.phases = {}   # name -> [nanoseconds, calls]
+        self.counts = {}
+        self._started = None
+        self._total = 0
+        self._profile = None
+
+    def __enter__(self):
+        if self.enabled:
+            self._started = time.perf_counter_ns()
+            if self.capture_path:
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self._profile is not None:
+            self._profile.disable()
+            try:
+                os.makedirs(os.path.dirname(self.capture_path) or ".", exist_ok=True)
+                self._profile.dump_stats(self.capture_path)
+            except OSError as e:
+                logger.warning("could not write cProfile capture %s: %s", self.capture_path, e)
+            self._profile = None
+        if self._started is not None:
+            self._total = time.perf_counter_ns() - self._started
+            self.log()
+        if self.json_path:
+            try:
+                self.write_json(self.json_path)
+            except OSError as e:
+                logger.warning("could not write profile %s: %s", self.json_path, e)
+        return False
+
+    def phase(self, name):
+        """Context manager timing one pass through a phase"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add(self, name, ns, calls=1):
+        entry = self.phases.setdefault(name, [0, 0])
+        entry[0] += ns
+        entry[1] += calls
+
+    def count(self, **counts):
+        """Add to named counters, such as nodes or links created"""
+        if self.enabled:
+            for key, value in counts.items():
+                self.counts[key] = self.counts.get(key, 0) + value
+
+    def ordered_phases(self):
+        known = [name for name in PHASES if name in self.phases]
+        return known + sorted(name for name in self.phases if name not in PHASES)
+
+    def as_dict(self):
+        """JSON-ready timings in milliseconds and counts"""
+        return {
+            'operator': self.operator,
+            'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'total_ms': self._total / 1e6,
+            'phases': {name: {'ms': self.phases[name][0] / 1e6, 'calls': self.phases[name][1]}
+                       for name in self.ordered_phases()},
+            'counts': dict(self.counts),
+            'cprofile': self.capture_path,
+            'json': self.json_path,
+        }
+
+    def summary(self):
+        """One line for the operator report"""
+        parts = [f"{name} {format_ns(self.phases[name][0])}" for name in self.ordered_phases()]
+        return f"{self.operator} {format_ns(self._total)}: " + ", ".join(parts)
+
+    def log(self):
+        logger.info(self.summary())
+        for name in self.ordered_phases():
+            ns, calls = self.phases[name]
+            logger.debug("  %s: %s in %d calls", name, format_ns(ns), calls)
+        if self.counts:
+            logger.info("  counts: %s", ", ".join(f"{key}={value}" for key, value in self.counts.items()))
+
+    def write_json(self, path):
+        """Write as_dict() to path, creating its directory"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return path
+
+# Default for functions that accept a profiler but were called without one
+NULL_PROFILER = Profiler("", enabled=False)
@@ -0,0 +1,221 @@
+"""
+Render-time I/O instrumentation for the add-on's File Output nodes.
+
+Handlers time each frame (render, compositing and the main image save) and
+stat the files every add-on File Output node was expected to write, logging
+one record per frame as JSONL or CSV next to the renders and keeping a
+rolling summary for the panel. File Output nodes write while the compositor
+runs, before any handler is called, so their write time is taken from the
+modification time of the last file they wrote for the frame, relative to
+the start of compositing. Everything is skipped unless the scene enables
+use_io_instrumentation.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import bpy
+from bpy.app.handlers import persistent
+from .output_estimator import specs_from_tree
+from .output_paths import expected_files
+from .plan_applier import owned_output_nodes
+from .profiler import logger
+
+LOG_BASENAME = "_render_io_log"
+CSV_FIELDS = ('frame', 'scene', 'render_seconds', 'composite_seconds', 'output_write_seconds',
+              'image_save_seconds', 'bytes', 'files', 'missing', 'time')
+
+# Last frames recorded in this session, newest last
+RECENT = deque(maxlen=200)
+
+_state = {'specs': [], 'blend_dir': "", 'log_path': None, 'use_extension': True}
+_timers = {}
+
+def _enabled(scene):
+    settings = getattr(scene, "viewlayer_connector_settings", None)
+    return settings is not None and settings.use_io_instrumentation
+
+def log_path(scene):
+    """Log file path for the scene, inside the output directory"""
+    settings = scene.viewlayer_connector_settings
+    directory = bpy.path.abspath(settings.custom_output_path)
+    extension = ".csv" if settings.io_log_format == 'CSV' else ".jsonl"
+    return os.path.join(directory, LOG_BASENAME + extension)
+
+def stat_outputs(specs, frame, blend_dir, use_extension=True):
+    """
+    Stat the files each spec writes for frame.
+    Returns (per-node dict of {'bytes', 'files', 'missing', 'mtime'}, total bytes, total files,
+    total missing); 'mtime' is the latest modification time of the node's files, or None.
+    """
+    per_node = {}
+    total_bytes = total_files = total_missing = 0
+    for spec in specs:
+        node_bytes = node_files = node_missing = 0
+        node_mtime = None
+        for path in expected_files(spec, frame, blend_dir, use_extension):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                node_missing += 1
+                continue
+            node_bytes += stat.st_size
+            node_files += 1
+            node_mtime = stat.st_mtime if node_mtime is None else max(node_mtime, stat.st_mtime)
+        per_node[spec.name] = {'bytes': node_bytes, 'files': node_files, 'missing': node_missing,
+                               'mtime': node_mtime}
+        total_bytes += node_bytes
+        total_files += node_files
+        total_missing += node_missing
+    return per_node, total_bytes, total_files, total_missing
+
+def output_write_seconds(per_node, started):
+    """
+    Seconds from started (a time.time() stamp taken when compositing began)
+    until the last File Output file of the frame was written, or None when
+    no file was written after started
+    """
+    mtimes = [stats['mtime'] for stats in per_node.values() if stats['mtime'] is not None]
+    if not mtimes or max(mtimes) < started:
+        return None
+    return max(mtimes) - started
+
+def write_record(path, record, log_format):
+    """Append one frame record to the JSONL or CSV log"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if log_format == 'CSV':
+        new_file = not os.path.exists(path)
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            writer.writerow(record)
+    else:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+
+def summary():
+    """Rolling averages over RECENT, or None when nothing was recorded"""
+    if not RECENT:
+        return None
+    count = len(RECENT)
+
+    def average(key):
+        values = [r[key] for r in RECENT if r.get(key) is not None]
+        return sum(values) / len(values) if values else None
+
+    return {
+        'frames': count,
+        'render_seconds': average('render_seconds'),
+        'composite_seconds': average('composite_seconds'),
+        'output_write_seconds': average('output_write_seconds'),
+        'image_save_seconds': average('image_save_seconds'),
+        'bytes': average('bytes'),
+        'files': average('files'),
+        'missing': sum(r['missing'] for r in RECENT),
+    }
+
+@persistent
+def _on_render_init(scene, *args):
+    if not _enabled(scene) or scene.node_tree is None:
+        _state['specs'] = []
+        return
+    # Resolve the add-on's nodes once per render job, not per frame. Staging's
+    # render_init runs first, so staged nodes are read at their scratch path,
+    # where the files are when render_write stats them
+    base_filename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0]
+    names = {node.name for node in owned_output_nodes(scene.node_tree, base_filename)}
+    _state['specs'] = [s for s in specs_from_tree(scene.node_tree) if s.name in names]
+    _state['blend_dir'] = os.path.dirname(bpy.data.filepath)
+    _state['log_path'] = log_path(scene)
+    _state['use_extension'] = scene.render.use_file_extension
+
+@persistent
+def _on_render_pre(scene, *args):
+    if _state['specs']:
+        _timers.clear()
+        _timers['pre'] = time.perf_counter()
+        # Wall clock, compared with file modification times. composite_pre moves
+        # it to the start of compositing where Blender has that handler
+        _timers['composite_started'] = time.time()
+
+@persistent
+def _on_composite_pre(scene, *args):
+    if _state['specs']:
+        _timers['composite_pre'] = time.perf_counter()
+        _timers['composite_started'] = time.time()
+
+@persistent
+def _on_composite_post(scene, *args):
+    if _state['specs']:
+        _timers['composite_post'] = time.perf_counter()
+
+@persistent
+def _on_render_post(scene, *args):
+    if _state['specs']:
+        _timers['post'] = time.perf_counter()
+
+@persistent
+def _on_render_write(scene, *args):
+    if not _state['specs'] or 'pre' not in _timers:
+        return
+    now = time.perf_counter()
+    frame = scene.frame_current
+    per_node, total_bytes, total_files, total_missing = stat_outputs(
+        _state['specs'], frame, _state['blend_dir'], _state['use_extension'])
+
+    composite = None
+    if 'composite_pre' in _timers and 'composite_post' in _timers:
+        composite = _timers['composite_post'] - _timers['composite_pre']
+    record = {
+        'frame': frame,
+        'scene': scene.name,
+        'render_seconds': _timers.get('post', now) - _timers['pre'],
+        'composite_seconds': composite,
+        'output_write_seconds': output_write_seconds(per_node, _timers['composite_started']),
+        'image_save_seconds': now - _timers['post'] if 'post' in _timers else None,
+        'bytes': total_bytes,
+        'files': total_files,
+        'missing': total_missing,
+        'time': time.time(),
+        'nodes': per_node,
+    }
+    RECENT.append(record)
+    try:
+        write_record(_state['log_path'], record, scene.viewlayer_connector_settings.io_log_format)
+    except OSError as e:
+        logger.warning("could not write I/O log %s: %s", _state['log_path'], e)
+    _timers.clear()
+
+@persistent
+def _on_render_done(scene, *args):
+    _state['specs'] = []
+    _timers.clear()
+
+def _handlers():
+    handlers = bpy.app.handlers
+    pairs = [
+        (handlers.render_init, _on_render_init),
+        (handlers.render_pre, _on_render_pre),
+        (handlers.render_post, _on_render_post),
+        (handlers.render_write, _on_render_write),
+        (handlers.render_complete, _on_render_done),
+        (handlers.render_cancel, _on_render_done),
+    ]
+    # Compositing handlers only exist in newer Blender versions
+    if hasattr(handlers, "composite_pre"):
+        pairs.append((handlers.composite_pre, _on_composite_pre))
+        pairs.append((handlers.composite_post, _on_composite_post))
+    return pairs
+
+def register():
+    for handlers, func in _handlers():
+        if func not in handlers:
+            handlers.append(func)
+
+def unregister():
+    for handlers, func in _handlers():
+        if func in handlers:
+            handlers.remove(func)
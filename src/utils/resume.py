@@ -0,0 +1,128 @@
+"""
+Resume mode: don't rewrite frames whose outputs are already on disk.
+
+At render start the output directory is indexed once with os.scandir. A
+frame_change_pre handler then mutes the add-on's File Output nodes for
+every frame whose expected files all exist and are non-empty (optionally
+above a minimum size or with a valid file header), and unmutes them
+otherwise. Original mute states are restored when the render ends.
+"""
+import os
+from dataclasses import replace
+
+import bpy
+from bpy.app.handlers import persistent
+from .output_estimator import specs_from_tree
+from .output_paths import OutputIndex, completed_frames, frame_complete, frame_range
+from .plan_applier import owned_output_nodes
+from .profiler import logger
+from .staging import FINAL_PATH_PROP
+
+_state = {'active': False, 'nodes': {}, 'specs': [], 'index': None, 'muted_frames': 0}
+
+def resume_options(settings):
+    """(min_size, check_header) for the scene's resume check"""
+    min_size = settings.resume_min_size if settings.resume_check in ('SIZE', 'HEADER') else 1
+    return max(1, min_size), settings.resume_check == 'HEADER'
+
+def owned_specs(scene):
+    """
+    The add-on's File Output nodes in the scene's tree and their OutputSpecs.
+    Nodes staging pointed at the scratch disk are checked at their final path.
+    """
+    tree = scene.node_tree
+    base_filename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] or "untitled"
+    nodes = owned_output_nodes(tree, base_filename)
+    final_paths = {node.name: node[FINAL_PATH_PROP] for node in nodes if FINAL_PATH_PROP in node}
+    names = {node.name for node in nodes}
+    return nodes, [replace(spec, base_path=final_paths[spec.name]) if spec.name in final_paths else spec
+                   for spec in specs_from_tree(tree) if spec.name in names]
+
+def build_context(scene):
+    """Owned nodes, their specs and a fresh index of the output directory"""
+    nodes, specs = owned_specs(scene)
+    root = bpy.path.abspath(scene.viewlayer_connector_settings.custom_output_path)
+    return nodes, specs, OutputIndex().scan_tree(root)
+
+def missing_runs(scene):
+    """
+    Consecutive runs of frames in the scene range that still need rendering.
+    Returns ([(start, end), ...], number_of_complete_frames).
+    """
+    settings = scene.viewlayer_connector_settings
+    _, specs, index = build_context(scene)
+    frames = list(frame_range(scene.frame_start, scene.frame_end, scene.frame_step))
+    if not specs:
+        return [(scene.frame_start, scene.frame_end)] if frames else [], 0
+    min_size, check_header = resume_options(settings)
+    done = completed_frames(specs, frames, os.path.dirname(bpy.data.filepath),
+                            scene.render.use_file_extension, index, min_size, check_header)
+    runs = []
+    for frame in frames:
+        if frame in done:
+            continue
+        if runs and runs[-1][1] + scene.frame_step == frame:
+            runs[-1][1] = frame
+        else:
+            runs.append([frame, frame])
+    return [tuple(run) for run in runs], len(done)
+
+@persistent
+def _on_render_init(scene, *args):
+    settings = getattr(scene, "viewlayer_connector_settings", None)
+    if settings is None or not settings.use_resume or scene.node_tree is None:
+        return
+    nodes, specs, index = build_context(scene)
+    # Remember mute states by name so they can be restored after the render
+    _state.update(active=True, specs=specs, index=index, muted_frames=0,
+                  nodes={node.name: node.mute for node in nodes},
+                  blend_dir=os.path.dirname(bpy.data.filepath),
+                  use_extension=scene.render.use_file_extension,
+                  options=resume_options(settings))
+    logger.info("resume: indexed %d existing files", index.file_count())
+
+@persistent
+def _on_frame_change_pre(scene, *args):
+    if not _state['active']:
+        return
+    min_size, check_header = _state['options']
+    done = frame_complete(_state['specs'], scene.frame_current, _state['index'],
+                          _state['blend_dir'], _state['use_extension'], min_size, check_header)
+    tree = scene.node_tree
+    for name, was_muted in _state['nodes'].items():
+        node = tree.nodes.get(name)
+        if node is not None:
+            node.mute = True if done else was_muted
+    if done:
+        _state['muted_frames'] += 1
+        logger.info("resume: frame %d already written, File Outputs muted", scene.frame_current)
+
+@persistent
+def _on_render_done(scene, *args):
+    if not _state['active']:
+        return
+    tree = scene.node_tree
+    for name, was_muted in _state['nodes'].items():
+        node = tree.nodes.get(name) if tree is not None else None
+        if node is not None:
+            node.mute = was_muted
+    _state.update(active=False, nodes={}, specs=[], index=None)
+
+def _handlers():
+    handlers = bpy.app.handlers
+    return [
+        (handlers.render_init, _on_render_init),
+        (handlers.frame_change_pre, _on_frame_change_pre),
+        (handlers.render_complete, _on_render_done),
+        (handlers.render_cancel, _on_render_done),
+    ]
+
+def register():
+    for handlers, func in _handlers():
+        if func not in handlers:
+            handlers.append(func)
+
+def unregister():
+    for handlers, func in _handlers():
+        if func in handlers:
+            handlers.remove(func)
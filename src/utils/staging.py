@@ -0,0 +1,158 @@
+"""
+Stage File Output writes on a local scratch disk.
+
+When a render starts, the base_path of every add-on File Output node that
+writes inside custom_output_path is pointed at the same relative location
+under scratch_path. After each frame its files are handed to a
+TransferQueue that copies or moves them to the real output layout in the
+background, so the render never waits on network storage. Everything is
+flushed and the original base paths are restored when the render
+completes or is cancelled.
+"""
+import os
+
+import bpy
+from bpy.app.handlers import persistent
+from .output_estimator import specs_from_tree
+from .output_paths import expected_files, resolve_blender_path
+from .plan_applier import owned_output_nodes
+from .profiler import logger
+from .transfer_queue import TransferQueue, staged_path
+
+# Stored on redirected nodes so an interrupted session can put the path back
+FINAL_PATH_PROP = "auto_node_outputs_final_base_path"
+
+_state = {'queue': None, 'specs': [], 'queued': set(), 'rendered': set(), 'last': None}
+
+def _enabled(scene):
+    settings = getattr(scene, "viewlayer_connector_settings", None)
+    return settings is not None and settings.use_staging and bool(settings.scratch_path)
+
+def restore_paths(tree):
+    """Put back every base path that staging redirected, including ones left by a crash"""
+    for node in tree.nodes:
+        if node.type == 'OUTPUT_FILE' and FINAL_PATH_PROP in node:
+            node.base_path = node[FINAL_PATH_PROP]
+            del node[FINAL_PATH_PROP]
+
+def redirect_paths(tree, nodes, final_root, scratch_root, blend_dir):
+    """
+    Point the nodes writing inside final_root at scratch_root.
+    Returns the names of the redirected nodes.
+    """
+    redirected = []
+    for node in nodes:
+        resolved = resolve_blender_path(node.base_path, blend_dir)
+        try:
+            scratch = staged_path(resolved, final_root, scratch_root)
+        except ValueError:
+            continue
+        if resolved.endswith(os.sep):
+            scratch += os.sep
+        node[FINAL_PATH_PROP] = node.base_path
+        node.base_path = scratch
+        redirected.append(node.name)
+    return redirected
+
+def staged_specs(tree, names):
+    """OutputSpec of the redirected nodes, read once after their paths point at the scratch disk"""
+    names = set(names)
+    return [spec for spec in specs_from_tree(tree) if spec.name in names]
+
+def queue_frame(scene, frame):
+    """Hand the staged files of a frame to the transfer queue"""
+    if frame in _state['queued']:
+        return
+    _state['queued'].add(frame)
+    for spec in _state['specs']:
+        for source in expected_files(spec, frame, _state['blend_dir'], _state['use_extension']):
+            if not os.path.exists(source):
+                continue
+            destination = os.path.join(_state['final_root'], os.path.relpath(source, _state['scratch_root']))
+            _state['queue'].submit(source, destination)
+
+def status():
+    """Transfer counts of the current or last staged render, or None"""
+    if _state['queue'] is not None:
+        return _state['queue'].summary()
+    return _state['last']
+
+@persistent
+def _on_render_init(scene, *args):
+    if not _enabled(scene) or scene.node_tree is None:
+        return
+    settings = scene.viewlayer_connector_settings
+    tree = scene.node_tree
+    restore_paths(tree)
+
+    blend_dir = os.path.dirname(bpy.data.filepath)
+    base_filename = os.path.splitext(bpy.path.basename(bpy.data.filepath))[0] or "untitled"
+    final_root = os.path.normpath(bpy.path.abspath(settings.custom_output_path))
+    scratch_root = os.path.normpath(bpy.path.abspath(settings.scratch_path))
+    names = redirect_paths(tree, owned_output_nodes(tree, base_filename), final_root, scratch_root, blend_dir)
+
+    _state.update(
+        queue=TransferQueue(settings.staging_workers, settings.staging_max_pending,
+                            move=settings.staging_mode == 'MOVE', verify=settings.staging_verify),
+        specs=staged_specs(tree, names), queued=set(), rendered=set(),
+        final_root=final_root, scratch_root=scratch_root, blend_dir=blend_dir,
+        use_extension=scene.render.use_file_extension,
+    )
+    logger.info("staging: %d File Output nodes writing to %s", len(names), scratch_root)
+
+@persistent
+def _on_render_post(scene, *args):
+    if _state['queue'] is not None:
+        _state['rendered'].add(scene.frame_current)
+
+@persistent
+def _on_render_write(scene, *args):
+    if _state['queue'] is not None:
+        queue_frame(scene, scene.frame_current)
+
+@persistent
+def _on_render_done(scene, *args):
+    transfers = _state['queue']
+    if transfers is None:
+        return
+    # Frames rendered without a main output write were not queued yet
+    for frame in sorted(_state['rendered'] - _state['queued']):
+        queue_frame(scene, frame)
+    transfers.close()
+    if scene.node_tree is not None:
+        restore_paths(scene.node_tree)
+
+    result = transfers.summary()
+    _state.update(queue=None, specs=[], queued=set(), rendered=set(), last=result)
+    logger.info("staging: transferred %d files, %d failed, waited %.2fs on a full queue",
+                result['transferred'], len(result['failed']), result['blocked_seconds'])
+    for failure in result['failed']:
+        logger.error("staging: %s: %s", failure['source'], failure['error'])
+
+def _handlers():
+    handlers = bpy.app.handlers
+    return [
+        (handlers.render_init, _on_render_init),
+        (handlers.render_post, _on_render_post),
+        (handlers.render_write, _on_render_write),
+        (handlers.render_complete, _on_render_done),
+        (handlers.render_cancel, _on_render_done),
+    ]
+
+def register():
+    for handlers, func in _handlers():
+        if func in handlers:
+            continue
+        # Redirect before any other render_init handler snapshots the File Output
+        # paths, so render_stats and resume see where the files are really written.
+        # The other handlers run after those of the modules registered earlier,
+        # so render_stats stats a frame's files before they are queued for a move.
+        if func is _on_render_init:
+            handlers.insert(0, func)
+        else:
+            handlers.append(func)
+
+def unregister():
+    for handlers, func in _handlers():
+        if func in handlers:
+            handlers.remove(func)
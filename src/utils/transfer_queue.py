@@ -0,0 +1,133 @@
+"""
+Copy or move finished files from a local scratch directory to their final
+location in the background.
+
+TransferQueue runs a fixed number of worker threads. submit() blocks once
+max_pending transfers are waiting, so a slow destination slows the
+producer down instead of letting the queue grow without bound. Each file
+is hashed while it is copied to a temporary name next to the destination,
+optionally re-read and compared, then renamed into place; moves delete the
+source only after that. Pure Python, no bpy.
+"""
+import hashlib
+import os
+import queue
+import threading
+import time
+
+CHUNK_SIZE = 4 * 1024 * 1024
+PART_SUFFIX = ".part"
+
+def file_digest(path):
+    """blake2b hex digest of a file"""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def transfer_file(source, destination, move=True, verify=True):
+    """
+    Copy source to destination through a temporary file and a checksum.
+    Returns (bytes, digest); raises OSError on failure or checksum mismatch.
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temporary = destination + PART_SUFFIX
+    digest = hashlib.blake2b()
+    size = 0
+    try:
+        with open(source, 'rb') as src, open(temporary, 'wb') as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+            dst.flush()
+            os.fsync(dst.fileno())
+        if verify and file_digest(temporary) != digest.hexdigest():
+            raise OSError(f"Checksum mismatch copying {source} to {destination}")
+        os.replace(temporary, destination)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+    if move:
+        os.remove(source)
+    return size, digest.hexdigest()
+
+def staged_path(path, final_root, scratch_root):
+    """Where path, inside final_root, lives under scratch_root"""
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(final_root))
+    if rel.startswith(os.pardir):
+        raise ValueError(f"{path} is not inside {final_root}")
+    return os.path.join(scratch_root, rel)
+
+class TransferQueue:
+    """Bounded background transfers with per-file results"""
+
+    def __init__(self, workers=2, max_pending=64, move=True, verify=True):
+        self.move = move
+        self.verify = verify
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._lock = threading.Lock()
+        self.done = []
+        self.failed = []
+        self.bytes = 0
+        self.blocked_seconds = 0.0
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                source, destination = job
+                try:
+                    size, digest = transfer_file(source, destination, self.move, self.verify)
+                except OSError as e:
+                    with self._lock:
+                        self.failed.append({'source': source, 'destination': destination, 'error': str(e)})
+                else:
+                    with self._lock:
+                        self.done.append({'source': source, 'destination': destination,
+                                          'bytes': size, 'blake2b': digest})
+                        self.bytes += size
+            finally:
+                self._queue.task_done()
+
+    def submit(self, source, destination):
+        """Queue a transfer, waiting while the queue is full"""
+        started = time.perf_counter()
+        self._queue.put((source, destination))
+        self.blocked_seconds += time.perf_counter() - started
+
+    def pending(self):
+        """Transfers queued but not yet started"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Wait until every submitted transfer has finished"""
+        self._queue.join()
+
+    def close(self):
+        """Flush, then stop the workers"""
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def summary(self):
+        """Counts so far, for logs and the panel"""
+        with self._lock:
+            return {
+                'transferred': len(self.done),
+                'failed': list(self.failed),
+                'bytes': self.bytes,
+                'pending': self.pending(),
+                'blocked_seconds': self.blocked_seconds,
+            }
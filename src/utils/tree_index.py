@@ -0,0 +1,168 @@
+"""
+Cached structural index of compositor trees.
+
+Answers "which RL node renders layer X and what is wired to it" without
+filtering tree.nodes or walking links each time. Indexes are rebuilt lazily
+after being invalidated by depsgraph updates, msgbus notifications, undo or
+file loads, or explicitly by code that edits the tree.
+"""
+import bpy
+from bpy.app.handlers import persistent
+from .connection_planner import GP_OUTPUT_NAME, is_secondary_pass
+from .link_index import LinkIndex
+
+# tree pointer -> TreeIndex, and pointers of trees whose index is stale
+_indexes = {}
+_dirty = set()
+_msgbus_owner = object()
+# Bumped when every index goes stale, and per tree pointer when one tree's
+# does, so derived caches know to rebuild
+_generation = 0
+_tree_generations = {}
+
+class TreeIndex:
+    """View layer, Render Layers and File Output relations of one tree"""
+
+    def __init__(self, tree):
+        self.nodes_by_name = {}
+        self.rl_by_layer = {}      # view layer name -> RL node
+        self.outputs_by_rl = {}    # RL node name -> {'main': [...], 'secondary': [...], 'gp': [...]}
+        self.slots_by_output = {}  # output node name -> [slot path, ...]
+        self.layer_by_output = {}  # output node name -> [view layer name, ...]
+
+        links = LinkIndex.from_tree(tree)
+
+        for node in tree.nodes:
+            self.nodes_by_name[node.name] = node
+            if node.type == 'R_LAYERS':
+                self.rl_by_layer.setdefault(node.layer, node)
+            elif node.type == 'OUTPUT_FILE':
+                self.slots_by_output[node.name] = [slot.path for slot in node.file_slots]
+
+        for layer_name, rl_node in self.rl_by_layer.items():
+            roles = {'main': [], 'secondary': [], 'gp': []}
+            for output in rl_node.outputs:
+                for link in links.output_links(output):
+                    out_node = link.to_node
+                    if out_node.type != 'OUTPUT_FILE':
+                        continue
+                    role = self.output_role(out_node, links)
+                    if out_node not in roles[role]:
+                        roles[role].append(out_node)
+                        self.layer_by_output.setdefault(out_node.name, []).append(layer_name)
+            self.outputs_by_rl[rl_node.name] = roles
+
+    @staticmethod
+    def output_role(out_node, links):
+        """'gp' for the shared grease pencil node, 'secondary' if it only holds secondary passes"""
+        if out_node.name == GP_OUTPUT_NAME:
+            return 'gp'
+        sources = [link.from_socket.name for socket in out_node.inputs
+                   for link in links.input_links(socket)]
+        if sources and all(is_secondary_pass(name) for name in sources):
+            return 'secondary'
+        return 'main'
+
+    def rl_node(self, layer_name):
+        """Render Layers node showing layer_name, or None"""
+        return self.rl_by_layer.get(layer_name)
+
+    def outputs_for_layer(self, layer_name):
+        """Output nodes fed by the layer's RL node, grouped by 'main', 'secondary' and 'gp'"""
+        rl_node = self.rl_by_layer.get(layer_name)
+        if rl_node is None:
+            return {'main': [], 'secondary': [], 'gp': []}
+        return self.outputs_by_rl.get(rl_node.name, {'main': [], 'secondary': [], 'gp': []})
+
+    def is_wired(self, layer_name):
+        """Return True if any File Output node is fed by the layer"""
+        return any(self.outputs_for_layer(layer_name).values())
+
+    def slots(self, output_name):
+        """Slot paths of an output node"""
+        return self.slots_by_output.get(output_name, [])
+
+def get_tree_index(tree):
+    """Return the index of tree, rebuilding it only if it is missing or stale"""
+    key = tree.as_pointer()
+    index = _indexes.get(key)
+    if index is None or key in _dirty:
+        index = TreeIndex(tree)
+        _indexes[key] = index
+        _dirty.discard(key)
+    return index
+
+def generation(tree=None):
+    """
+    Counter that changes whenever tree may have changed, or with no tree,
+    only when every tree was invalidated at once
+    """
+    if tree is None:
+        return _generation
+    # Both counters only grow, so their sum changes whenever either does
+    return _generation + _tree_generations.get(tree.as_pointer(), 0)
+
+def invalidate(tree=None):
+    """Mark the index of tree, or of every tree, as stale"""
+    global _generation
+    if tree is None:
+        _generation += 1
+        _dirty.update(_indexes.keys())
+    else:
+        key = tree.as_pointer()
+        _tree_generations[key] = _tree_generations.get(key, 0) + 1
+        _dirty.add(key)
+
+def clear():
+    """Drop every cached index, used when the file changes"""
+    global _generation
+    _generation += 1
+    _indexes.clear()
+    _dirty.clear()
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    # Only node edits change an index; plain scene updates (frame changes,
+    # property edits) fire constantly and leave every tree as it was
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.NodeTree):
+            invalidate(update.id.original)
+
+@persistent
+def _on_undo_redo(*args):
+    # Undo replaces the RNA data the index points to
+    clear()
+
+@persistent
+def _on_load_post(*args):
+    clear()
+    subscribe_msgbus()
+
+def _on_msgbus_notify():
+    invalidate()
+
+def subscribe_msgbus():
+    """Invalidate on renames of view layers and nodes, which do not always reach the depsgraph"""
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for key in ((bpy.types.ViewLayer, "name"), (bpy.types.Node, "name"), (bpy.types.NodeOutputFileSlotFile, "path")):
+        bpy.msgbus.subscribe_rna(key=key, owner=_msgbus_owner, args=(), notify=_on_msgbus_notify)
+
+_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+    (bpy.app.handlers.undo_post, _on_undo_redo),
+    (bpy.app.handlers.redo_post, _on_undo_redo),
+    (bpy.app.handlers.load_post, _on_load_post),
+)
+
+def register():
+    for handlers, func in _HANDLERS:
+        if func not in handlers:
+            handlers.append(func)
+    subscribe_msgbus()
+
+def unregister():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for handlers, func in _HANDLERS:
+        if func in handlers:
+            handlers.remove(func)
+    clear()
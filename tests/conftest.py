@@ -0,0 +1,37 @@
+"""
+Test setup: put src on sys.path so the add-on's utils import as a package,
+and stand in a minimal bpy when the tests run outside Blender. Only the
+module level names the utils touch at import time are provided; tests
+drive the code with their own fake trees and nodes.
+"""
+import importlib.util
+import os
+import sys
+import types
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+def _fake_bpy():
+    module = types.ModuleType("bpy")
+    app = types.ModuleType("bpy.app")
+    handlers = types.ModuleType("bpy.app.handlers")
+    for name in ("depsgraph_update_post", "undo_post", "redo_post", "load_post", "save_post",
+                 "render_init", "render_pre", "render_post", "render_write",
+                 "render_complete", "render_cancel", "frame_change_pre"):
+        setattr(handlers, name, [])
+    handlers.persistent = lambda func: func
+    app.handlers = handlers
+    app.is_job_running = lambda job: False
+    module.app = app
+    module.types = types.SimpleNamespace(**{name: type(name, (), {}) for name in (
+        "NodeTree", "Scene", "ViewLayer", "Node", "NodeOutputFileSlotFile", "CompositorNodeTree")})
+    module.data = types.SimpleNamespace(filepath="", is_saved=False, node_groups=[], scenes=[])
+    module.path = types.SimpleNamespace(abspath=lambda path: path, basename=os.path.basename)
+    module.msgbus = types.SimpleNamespace(clear_by_owner=lambda owner: None,
+                                       subscribe_rna=lambda **kwargs: None)
+    sys.modules.update({"bpy": module, "bpy.app": app, "bpy.app.handlers": handlers})
+
+if importlib.util.find_spec("bpy") is None:
+    _fake_bpy()
@@ -0,0 +1,123 @@
+"""Stand-ins for the few bpy compositor objects the utils read and write"""
+
+BL_IDNAMES = {
+    'R_LAYERS': 'CompositorNodeRLayers',
+    'OUTPUT_FILE': 'CompositorNodeOutputFile',
+    'FRAME': 'NodeFrame',
+}
+
+class Socket:
+    def __init__(self, name, type='RGBA', node=None):
+        self.name = name
+        self.type = type
+        self.node = node
+        self.enabled = True
+
+class Sockets(list):
+    def get(self, name):
+        return next((socket for socket in self if socket.name == name), None)
+
+class Slot:
+    def __init__(self, path):
+        self.path = path
+
+class FileSlots(list):
+    """File slots of a File Output node, kept in step with its inputs"""
+
+    def __init__(self, node, paths):
+        super().__init__(Slot(path) for path in paths)
+        self.node = node
+
+    def new(self, path):
+        self.append(Slot(path))
+        self.node.inputs.append(Socket(path, node=self.node))
+
+    def remove(self, socket):
+        position = self.node.inputs.index(socket)
+        del self[position]
+        del self.node.inputs[position]
+
+class Format:
+    def __init__(self, file_format='OPEN_EXR_MULTILAYER', exr_codec='ZIP', color_depth='16'):
+        self.file_format = file_format
+        self.exr_codec = exr_codec
+        self.color_depth = color_depth
+
+class Node:
+    """Render Layers or File Output node, with ID properties kept in a dict"""
+
+    def __init__(self, name, type, layer="", base_path="", outputs=(), slots=(), inputs=(),
+                 **format_options):
+        self.name = name
+        self.type = type
+        self.bl_idname = BL_IDNAMES.get(type, "")
+        self.label = ""
+        self.location = (0, 0)
+        self.layer = layer
+        self.base_path = base_path
+        self.parent = None
+        self.mute = False
+        self.outputs = Sockets(Socket(output, node=self) for output in outputs)
+        self.file_slots = FileSlots(self, slots)
+        self.inputs = Sockets(Socket(name, node=self) for name in (inputs or slots))
+        self.format = Format(**format_options)
+        self.props = {}
+
+    def __contains__(self, key):
+        return key in self.props
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+    def __getitem__(self, key):
+        return self.props[key]
+
+    def __setitem__(self, key, value):
+        self.props[key] = value
+
+    def __delitem__(self, key):
+        del self.props[key]
+
+class Link:
+    def __init__(self, from_node, from_socket, to_node, to_socket):
+        self.from_node = from_node
+        self.from_socket = from_socket
+        self.to_node = to_node
+        self.to_socket = to_socket
+
+class Nodes(list):
+    def __init__(self, nodes, tree):
+        super().__init__(nodes)
+        self.tree = tree
+
+    def get(self, name):
+        return next((node for node in self if node.name == name), None)
+
+    def new(self, bl_idname):
+        node_type = next(key for key, value in BL_IDNAMES.items() if value == bl_idname)
+        node = Node(bl_idname, node_type)
+        self.append(node)
+        return node
+
+    def remove(self, node):
+        self.tree.links[:] = [link for link in self.tree.links if node not in (link.from_node, link.to_node)]
+        super().remove(node)
+
+class Links(list):
+    def new(self, from_socket, to_socket):
+        # An input takes a single link, a new one replaces it
+        self[:] = [link for link in self if link.to_socket is not to_socket]
+        link = Link(from_socket.node, from_socket, to_socket.node, to_socket)
+        self.append(link)
+        return link
+
+class Tree:
+    def __init__(self, nodes=()):
+        self.nodes = Nodes(nodes, self)
+        self.links = Links()
+
+    def as_pointer(self):
+        return id(self)
+
+    def link(self, from_node, output, to_node, input):
+        return self.links.new(from_node.outputs[output], to_node.inputs[input])
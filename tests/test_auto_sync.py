@@ -0,0 +1,92 @@
+import itertools
+from dataclasses import asdict
+from types import SimpleNamespace
+
+import bpy
+from fakes import Node, Socket, Tree
+from utils import auto_sync
+from utils.connection_planner import SettingsSnapshot
+
+_pointers = itertools.count(100)
+
+def viewlayer(name):
+    pointer = next(_pointers)
+    return SimpleNamespace(name=name, use=True, aovs=[], lightgroups=[], as_pointer=lambda: pointer)
+
+def synced_scene(monkeypatch, names=("Main", "BG", "FG")):
+    monkeypatch.setattr(bpy.data, "filepath", "/shots/shot.blend")
+    monkeypatch.setattr(bpy.data, "is_saved", True)
+    monkeypatch.setattr(auto_sync, "_states", {})
+    monkeypatch.setattr(auto_sync, "subscribe_msgbus", lambda: None)
+    tree = Tree([Node(f"ViewLayer_{name}", 'R_LAYERS', layer=name, outputs=["Image", "Alpha"]) for name in names])
+    settings = SimpleNamespace(use_auto_sync=True, **asdict(SettingsSnapshot()))
+    scene = SimpleNamespace(name="Scene", use_nodes=False, node_tree=tree, viewlayer_connector_settings=settings,
+                            view_layers=[viewlayer(name) for name in names], as_pointer=lambda: 1)
+    auto_sync.start(scene)
+    return scene
+
+def snapshot_calls(monkeypatch):
+    calls = []
+    snapshot = auto_sync.layer_snapshot
+
+    def counted(viewlayer, rl_node=None):
+        calls.append(viewlayer.name)
+        return snapshot(viewlayer, rl_node)
+    monkeypatch.setattr(auto_sync, "layer_snapshot", counted)
+    return calls
+
+def test_sync_snapshots_and_reconciles_only_the_changed_layer(monkeypatch):
+    scene = synced_scene(monkeypatch)
+    tree = scene.node_tree
+    assert [node.name for node in tree.nodes if node.type == 'OUTPUT_FILE'] == [
+        "shot_Main_EXR16_", "shot_BG_EXR16_", "shot_FG_EXR16_"]
+    calls = snapshot_calls(monkeypatch)
+
+    rl = tree.nodes.get("ViewLayer_BG")
+    rl.outputs.append(Socket("Depth", node=rl))
+    stats = auto_sync.sync(scene, {scene.view_layers[1].as_pointer()})
+
+    assert calls == ["BG"]
+    assert (stats['created'], stats['updated'], stats['removed']) == (1, 0, 0)
+    secondary = tree.nodes.get("shot_BG_EXR32_")
+    assert [link.from_socket.name for link in tree.links if link.to_node is secondary] == ["Depth"]
+
+def test_sync_without_plan_changes_does_nothing(monkeypatch):
+    scene = synced_scene(monkeypatch)
+    calls = snapshot_calls(monkeypatch)
+    assert auto_sync.sync(scene, {scene.view_layers[0].as_pointer()}) is None
+    assert calls == ["Main"]
+
+def test_removed_layers_lose_their_nodes(monkeypatch):
+    scene = synced_scene(monkeypatch)
+    tree = scene.node_tree
+    hand_made = Node("Preview", 'OUTPUT_FILE', slots=["Image"])
+    tree.nodes.append(hand_made)
+    tree.link(tree.nodes.get("ViewLayer_FG"), 0, hand_made, 0)
+    calls = snapshot_calls(monkeypatch)
+
+    del scene.view_layers[1]
+    stats = auto_sync.sync(scene, set(), structural=True)
+    assert calls == []
+    assert stats['removed'] == 2
+    assert tree.nodes.get("ViewLayer_BG") is None and tree.nodes.get("shot_BG_EXR16_") is None
+    assert tree.nodes.get("shot_FG_EXR16_") is not None and tree.nodes.get("Preview") is hand_made
+
+def test_added_and_renamed_layers_are_snapshotted(monkeypatch):
+    scene = synced_scene(monkeypatch)
+    tree = scene.node_tree
+    calls = snapshot_calls(monkeypatch)
+
+    scene.view_layers.append(viewlayer("Ink"))
+    scene.view_layers[0].name = "Hero"
+    stats = auto_sync.sync(scene, set(), structural=True)
+    assert sorted(calls) == ["Hero", "Ink"]
+    assert tree.nodes.get("ViewLayer_Ink").layer == "Ink"
+    assert tree.nodes.get("shot_Hero_EXR16_") is not None and tree.nodes.get("shot_Main_EXR16_") is None
+    assert (stats['created'], stats['removed']) == (4, 2)
+
+def test_unsaved_files_are_not_synced(monkeypatch):
+    scene = synced_scene(monkeypatch)
+    monkeypatch.setattr(bpy.data, "is_saved", False)
+    scene.node_tree.nodes.get("ViewLayer_BG").outputs.append(Socket("Depth"))
+    assert auto_sync.sync(scene, {scene.view_layers[1].as_pointer()}) is None
@@ -0,0 +1,65 @@
+import json
+import os
+import stat
+import sys
+
+from cli import batch_driver
+from cli.process_pool import RESULT_MARKER, blender_command, parse_results, run_blender, run_pool
+
+FAKE_BLENDER = f"""#!{sys.executable}
+import json, sys, time
+blend_file = sys.argv[2]
+if "slow" in blend_file:
+    time.sleep(5)
+if "bad" in blend_file:
+    print("Traceback: boom", file=sys.stderr)
+    sys.exit(1)
+print("Blender noise")
+print({RESULT_MARKER!r} + json.dumps({{'file': blend_file, 'args': sys.argv[sys.argv.index('--') + 1:]}}))
+"""
+
+def fake_blender(tmp_path):
+    path = tmp_path / "blender"
+    path.write_text(FAKE_BLENDER)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+def test_blender_command_puts_script_args_after_the_separator():
+    assert blender_command("blender", "shot.blend", "run.py", ["--profile", "p.json"], ["-t", "4"]) == [
+        "blender", "-b", "shot.blend", "-t", "4", "--python-exit-code", "1", "--python", "run.py",
+        "--", "--profile", "p.json"]
+
+def test_parse_results_skips_other_output_and_bad_json():
+    stdout = "\n".join(["Read blend", RESULT_MARKER + '{"a": 1}', RESULT_MARKER + "{broken", RESULT_MARKER + "[2]"])
+    assert parse_results(stdout) == [{'a': 1}, [2]]
+
+def test_run_pool_keeps_input_order_and_reports_failures(tmp_path):
+    blender = fake_blender(tmp_path)
+    commands = [(name, blender_command(blender, name, "connect.py", ["--no-save"]))
+                for name in ("a.blend", "bad.blend", "c.blend")]
+    done = []
+    summaries = run_pool(commands, 2, on_done=lambda summary: done.append(summary['label']))
+
+    assert [s['label'] for s in summaries] == ["a.blend", "bad.blend", "c.blend"]
+    assert sorted(done) == ["a.blend", "bad.blend", "c.blend"]
+    assert [s['ok'] for s in summaries] == [True, False, True]
+    assert summaries[0]['result'] == {'file': "a.blend", 'args': ["--no-save"]}
+    assert summaries[1]['result'] is None and "boom" in summaries[1]['stderr']
+
+def test_timeout_and_missing_executable_are_failures(tmp_path):
+    slow = run_blender(blender_command(fake_blender(tmp_path), "slow.blend", "connect.py"), timeout=0.5)
+    assert not slow['ok'] and slow['returncode'] is None and "Timed out" in slow['stderr']
+    missing = run_blender([str(tmp_path / "no-blender"), "-b"])
+    assert not missing['ok'] and missing['returncode'] is None
+
+def test_driver_writes_a_summary_and_fails_on_any_failed_file(tmp_path, capsys):
+    summary_path = str(tmp_path / "summary.json")
+    code = batch_driver.main(["--blender", fake_blender(tmp_path), "--jobs", "2", "--no-save",
+                              "--summary", summary_path, "a.blend", "bad.blend"])
+    assert code == 1
+    with open(summary_path, encoding='utf-8') as f:
+        summary = json.load(f)
+    assert (summary['files'], summary['failed'], summary['jobs']) == (2, ["bad.blend"], 2)
+    assert summary['results'][0]['result']['args'] == ["--no-save"]
+    assert os.path.basename(summary['results'][0]['command'][6]) == "batch_connect.py"
+    assert "1 failed" in capsys.readouterr().out
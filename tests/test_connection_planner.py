@@ -0,0 +1,90 @@
+from dataclasses import replace
+
+from utils.connection_planner import (
+    GP_OUTPUT_NAME,
+    LayerSnapshot,
+    RoutingCache,
+    SettingsSnapshot,
+    SlotPlan,
+    diff_plans,
+    plan_connections,
+    route_passes,
+)
+
+LAYERS = (
+    LayerSnapshot("Main", ("Image", "Alpha", "Depth", "Normal", "CryptoObject00")),
+    LayerSnapshot("BG.vl", ("Image", "Alpha")),
+    LayerSnapshot("Ink.gp.vl", ("Image",)),
+)
+
+def outputs_by_name(plan):
+    return {node.name: node for node in plan.outputs}
+
+def test_plan_splits_main_and_secondary_passes():
+    plan = plan_connections(LAYERS, SettingsSnapshot(), "shot", cache=None)
+    assert [node.name for node in plan.render_layers] == ["ViewLayer_Ink.gp.vl", "ViewLayer_Main", "ViewLayer_BG.vl"]
+    outputs = outputs_by_name(plan)
+    # BG has no secondary passes, so no secondary node
+    assert set(outputs) == {GP_OUTPUT_NAME, "shot_Main_EXR16_", "shot_Main_EXR32_", "shot_BG_EXR16_"}
+    assert [slot.path for slot in outputs["shot_Main_EXR16_"].slots] == ["Image", "Alpha"]
+    assert outputs["shot_Main_EXR32_"].slots == (
+        SlotPlan("Depth", "ViewLayer_Main", "Depth"),
+        SlotPlan("Normal", "ViewLayer_Main", "Normal"),
+        SlotPlan("CryptoObject00", "ViewLayer_Main", "CryptoObject00"),
+    )
+    assert outputs[GP_OUTPUT_NAME].slots == (SlotPlan("Ink", "ViewLayer_Ink.gp.vl", "Image"),)
+    assert (plan.gp_layer_count, plan.regular_layer_count) == (1, 2)
+
+def test_secondary_passes_stay_on_the_main_node_without_a_secondary_output():
+    plan = plan_connections(LAYERS[:1], SettingsSnapshot(use_secondary_output=False), "shot", cache=None)
+    assert [(node.name, len(node.slots)) for node in plan.outputs] == [("shot_Main_EXR16_", 5)]
+
+def test_matching_bit_depths_give_the_secondary_node_a_data_suffix():
+    settings = SettingsSnapshot(main_exr_bitdepth='32')
+    plan = plan_connections(LAYERS[:1], settings, "shot", cache=None)
+    assert [node.name for node in plan.outputs] == ["shot_Main_EXR32_", "shot_Main_EXR32_DATA"]
+    assert len({node.base_path for node in plan.outputs}) == 2
+
+def test_consolidated_outputs_prefix_slots_with_the_layer_name():
+    settings = SettingsSnapshot(consolidate_outputs=True)
+    plan = plan_connections(LAYERS[:2], settings, "shot", cache=None)
+    main = outputs_by_name(plan)["shot_CONSOLIDATED_main_00_EXR16_"]
+    assert [slot.path for slot in main.slots] == ["Main_Image", "Main_Alpha", "BG_Image", "BG_Alpha"]
+
+def test_routing_cache_computes_each_pass_signature_once():
+    cache = RoutingCache(maxsize=2)
+    layers = [LayerSnapshot(f"Layer{idx}", ("Image", "Depth")) for idx in range(4)]
+    plan_connections(layers, SettingsSnapshot(), "shot", cache=cache)
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+def test_routing_cache_evicts_the_least_recently_used_signature():
+    cache = RoutingCache(maxsize=2)
+    route_passes(("Image",), True, cache)
+    route_passes(("Depth",), True, cache)
+    route_passes(("Image",), True, cache)
+    route_passes(("Normal",), True, cache)
+    assert route_passes(("Image",), True, cache) == (("Image",), ())
+    assert cache.stats()['misses'] == 3
+    route_passes(("Depth",), True, cache)
+    assert cache.stats()['misses'] == 4
+
+def test_diff_plans_reports_added_removed_and_changed_nodes():
+    old = plan_connections(LAYERS[:2], SettingsSnapshot(), "shot", cache=None)
+    layers = (replace(LAYERS[0], passes=("Image", "Depth")), LayerSnapshot("FG", ("Image",)))
+    new = plan_connections(layers, SettingsSnapshot(), "shot", cache=None)
+    assert diff_plans(old, new) == {
+        'added': ["ViewLayer_FG", "shot_FG_EXR16_"],
+        'removed': ["ViewLayer_BG.vl", "shot_BG_EXR16_"],
+        'changed': ["shot_Main_EXR16_", "shot_Main_EXR32_"],
+    }
+
+def test_diff_plans_ignores_locations():
+    plan = plan_connections(LAYERS, SettingsSnapshot(), "shot", cache=None)
+    moved = replace(plan, outputs=tuple(replace(node, location=(0, 0)) for node in plan.outputs))
+    assert diff_plans(plan, moved) == {'added': [], 'removed': [], 'changed': []}
+
+def test_diff_plans_can_ignore_slot_order():
+    plan = plan_connections(LAYERS[:1], SettingsSnapshot(), "shot", cache=None)
+    reordered = replace(plan, outputs=tuple(replace(node, slots=node.slots[::-1]) for node in plan.outputs))
+    assert diff_plans(plan, reordered)['changed'] == ["shot_Main_EXR16_", "shot_Main_EXR32_"]
+    assert diff_plans(plan, reordered, ordered=False)['changed'] == []
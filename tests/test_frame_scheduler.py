@@ -0,0 +1,61 @@
+import os
+import threading
+from types import SimpleNamespace
+
+from cli.frame_scheduler import ChunkScheduler, load_state, split_chunks
+from utils.output_paths import OutputIndex, completed_frames
+
+def test_split_chunks_breaks_on_size_and_gaps():
+    assert split_chunks([1, 2, 3, 4, 5, 8, 9], 2) == [(1, 2), (3, 4), (5, 5), (8, 9)]
+    assert split_chunks([1, 3, 5, 9], 10, step=2) == [(1, 5), (9, 9)]
+    assert split_chunks([], 10) == []
+
+def test_load_state_falls_back_to_empty(tmp_path):
+    broken = tmp_path / "shot.frames.json"
+    broken.write_text("{not json")
+    assert load_state(str(broken)) == {'done': [], 'failed': []}
+    assert load_state(str(tmp_path / "missing.json")) == {'done': [], 'failed': []}
+
+def flaky(failures):
+    """run_chunk that fails each chunk the given number of times before it succeeds"""
+    attempts = {}
+    lock = threading.Lock()
+
+    def run_chunk(chunk):
+        with lock:
+            attempts[chunk] = attempts.get(chunk, 0) + 1
+            ok = attempts[chunk] > failures.get(chunk, 0)
+        return {'ok': ok}
+    return run_chunk, attempts
+
+def test_failed_chunks_are_requeued_until_they_succeed():
+    run_chunk, attempts = flaky({(1, 10): 2})
+    done = []
+    scheduler = ChunkScheduler([(1, 10), (11, 20)], 2, run_chunk, on_done=done.append)
+    results = scheduler.run(2)
+
+    assert attempts == {(1, 10): 3, (11, 20): 1}
+    assert scheduler.failed == []
+    assert sorted((r['chunk'], r['attempt'], r['ok']) for r in results) == [
+        ([1, 10], 1, False), ([1, 10], 2, False), ([1, 10], 3, True), ([11, 20], 1, True)]
+    assert len(done) == 4
+
+def test_chunks_fail_after_the_last_retry():
+    run_chunk, attempts = flaky({(1, 10): 5})
+    scheduler = ChunkScheduler([(1, 10), (11, 20)], 1, run_chunk)
+    scheduler.run(3)
+    assert attempts[(1, 10)] == 2
+    assert scheduler.failed == [[1, 10]]
+
+def test_completed_frames_need_every_file_non_empty(tmp_path):
+    node = SimpleNamespace(name="Main", base_path=str(tmp_path / "Main_"), file_format='OPEN_EXR_MULTILAYER',
+                           slots=[SimpleNamespace(path="Image")])
+    for frame, data in ((1, b"exr"), (2, b""), (4, b"exr")):
+        (tmp_path / f"Main_{frame:04d}.exr").write_bytes(data)
+    index = OutputIndex()
+    assert completed_frames([node], range(1, 5), index=index) == {1, 4}
+    # The directory was scanned once and later answers come from the index
+    os.remove(tmp_path / "Main_0001.exr")
+    assert completed_frames([node], range(1, 5), index=index) == {1, 4}
+    index.forget()
+    assert completed_frames([node], range(1, 5), index=index) == {4}
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from fakes import Node, Tree
+from utils import layer_summary, tree_index
+
+def viewlayer(name, use=True):
+    return SimpleNamespace(name=name, use=use, aovs=[], lightgroups=[], use_pass_z=True)
+
+def summary_scene():
+    rl = Node("ViewLayer_Main", 'R_LAYERS', layer="Main", outputs=["Image", "Alpha", "Depth"])
+    main = Node("shot_Main_EXR16_", 'OUTPUT_FILE', slots=["Image", "Alpha"], exr_codec='DWAB')
+    data = Node("shot_Main_EXR32_", 'OUTPUT_FILE', slots=["Depth"], color_depth='32')
+    tree = Tree([rl, main, data])
+    tree.link(rl, 0, main, 0)
+    tree.link(rl, 1, main, 1)
+    tree.link(rl, 2, data, 0)
+    render = SimpleNamespace(resolution_x=1920, resolution_y=1080, resolution_percentage=100)
+    return SimpleNamespace(node_tree=tree, use_nodes=True, render=render,
+                           view_layers=[viewlayer("Main"), viewlayer("BG", use=False)],
+                           as_pointer=lambda: 1)
+
+def counting_builds(monkeypatch):
+    builds = []
+    build = layer_summary.build_summary
+
+    def counted(scene):
+        builds.append(scene)
+        return build(scene)
+    layer_summary.clear()
+    monkeypatch.setattr(layer_summary, "build_summary", counted)
+    return builds
+
+def test_summary_counts_layers_outputs_and_formats():
+    summary = layer_summary.build_summary(summary_scene())
+    assert (summary.layer_count, summary.enabled_count, summary.wired_count) == (2, 1, 1)
+    main, bg = summary.layers["Main"], summary.layers["BG"]
+    assert (main.passes, main.outputs, main.formats) == (3, 2, ("EXR_ML 16 DWAB", "EXR_ML 32 ZIP"))
+    assert main.bytes_per_frame > 0 and summary.bytes_per_frame == main.bytes_per_frame
+    # Without a Render Layers node the passes come from the view layer flags
+    assert (bg.enabled, bg.passes, bg.outputs, bg.bytes_per_frame) == (False, 3, 0, 0)
+
+def test_summary_is_reused_until_something_it_reads_changes(monkeypatch):
+    builds = counting_builds(monkeypatch)
+    scene = summary_scene()
+    first = layer_summary.get_summary(scene)
+    assert layer_summary.get_summary(scene) is first
+    assert len(builds) == 1
+
+    tree_index.invalidate(scene.node_tree)
+    layer_summary.get_summary(scene)
+    layer_summary.invalidate()
+    layer_summary.get_summary(scene)
+    scene.render.resolution_percentage = 50
+    layer_summary.get_summary(scene)
+    scene.view_layers.append(viewlayer("FG"))
+    assert layer_summary.get_summary(scene).layer_count == 3
+    assert len(builds) == 5
+    assert layer_summary.get_summary(scene) is layer_summary.get_summary(scene)
+    assert len(builds) == 5
+
+def test_edits_to_other_trees_keep_the_summary(monkeypatch):
+    builds = counting_builds(monkeypatch)
+    scene = summary_scene()
+    layer_summary.get_summary(scene)
+    tree_index.invalidate(Tree())
+    layer_summary.get_summary(scene)
+    assert len(builds) == 1
+
+def test_turning_nodes_off_drops_the_outputs(monkeypatch):
+    counting_builds(monkeypatch)
+    scene = summary_scene()
+    layer_summary.get_summary(scene)
+    scene.use_nodes = False
+    summary = layer_summary.get_summary(scene)
+    assert summary.wired_count == 0 and summary.bytes_per_frame == 0
@@ -0,0 +1,38 @@
+from fakes import Node, Tree
+from utils.link_index import LinkIndex
+from utils.output_estimator import specs_from_tree
+
+def linked_tree():
+    """Render Layers feeding two File Outputs, plus an unrelated Composite"""
+    rl = Node("RL_Main", 'R_LAYERS', layer="Main", outputs=["Image", "Alpha", "Depth"])
+    main = Node("Main", 'OUTPUT_FILE', slots=["Image", "Depth"])
+    alpha = Node("Main_Alpha", 'OUTPUT_FILE', slots=["Alpha"])
+    composite = Node("Composite", 'COMPOSITE', inputs=["Image"])
+    tree = Tree([rl, main, alpha, composite])
+    tree.link(rl, 0, main, 0)
+    tree.link(rl, 2, main, 1)
+    tree.link(rl, 1, alpha, 0)
+    return tree
+
+def test_downstream_and_upstream_follow_links():
+    tree = linked_tree()
+    index = LinkIndex.from_tree(tree)
+    rl, main = tree.nodes.get("RL_Main"), tree.nodes.get("Main")
+    assert index.downstream(rl) == [main, tree.nodes.get("Main_Alpha")]
+    assert index.upstream(main) == [rl]
+    assert index.upstream(tree.nodes.get("Composite")) == []
+
+def test_connected_outputs_lists_each_file_output_once():
+    tree = linked_tree()
+    index = LinkIndex.from_tree(tree)
+    assert index.connected_outputs(tree.nodes.get("RL_Main")) == [
+        tree.nodes.get("Main"), tree.nodes.get("Main_Alpha")]
+
+def test_input_links_of_unlinked_socket_is_empty():
+    tree = linked_tree()
+    index = LinkIndex.from_tree(tree)
+    assert not index.input_links(tree.nodes.get("Composite").inputs[0])
+
+def test_specs_take_the_layer_of_the_feeding_node():
+    specs = {spec.name: spec for spec in specs_from_tree(linked_tree())}
+    assert [(slot.path, slot.layer) for slot in specs["Main"].slots] == [("Image", "Main"), ("Depth", "Main")]
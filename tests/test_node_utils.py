@@ -0,0 +1,49 @@
+from fakes import Node, Tree
+from utils.node_utils import _frame_by_prefix, layout_items
+from utils.ownership import is_tagged, tag
+
+def test_layout_items_leave_hand_placed_nodes_alone():
+    rl = Node("ViewLayer_Main", 'R_LAYERS', layer="Main", outputs=["Image"])
+    output = Node("shot_Main_EXR16_", 'OUTPUT_FILE', slots=["Image"])
+    hand_output = Node("Preview", 'OUTPUT_FILE', slots=["Image"])
+    hand_node = Node("Glare", 'GLARE', outputs=["Image"])
+    hand_frame = Node("Notes", 'FRAME')
+    framed_rl = Node("ViewLayer_BG", 'R_LAYERS', layer="BG", outputs=["Image"])
+    framed_rl.parent = hand_frame
+    for node in (rl, output, framed_rl):
+        tag(node, "shot")
+    tree = Tree([rl, output, hand_output, hand_node, hand_frame, framed_rl])
+    tree.link(rl, 0, output, 0)
+    # A hand-made output fed by the add-on's Render Layers node is laid out with it
+    tree.link(rl, 0, hand_output, 0)
+
+    assert layout_items(tree) == [rl, output, hand_output]
+
+def test_layout_items_move_add_on_frames_as_a_whole():
+    frame = Node("Frame_EP01", 'FRAME')
+    rl = Node("ViewLayer_EP01_A", 'R_LAYERS', layer="EP01_A", outputs=["Image"])
+    rl.parent = frame
+    tag(frame, "shot")
+    tag(rl, "shot")
+    assert layout_items(Tree([frame, rl])) == [frame]
+
+def test_prefix_frames_nest_layers_with_their_outputs():
+    layers = ["EP01_SQ010_A", "EP01_SQ010_B", "EP01_SQ020_A", "BG"]
+    rls = [Node(f"ViewLayer_{name}", 'R_LAYERS', layer=name, outputs=["Image"]) for name in layers]
+    outputs = [Node(f"shot_{name}_EXR16_", 'OUTPUT_FILE', slots=["Image"]) for name in layers]
+    shared = Node("GP_Output", 'OUTPUT_FILE', slots=["A", "B"])
+    tree = Tree(rls + outputs + [shared])
+    for rl, output in zip(rls, outputs):
+        tree.link(rl, 0, output, 0)
+    tree.link(rls[0], 0, shared, 0)
+    tree.link(rls[1], 0, shared, 1)
+
+    top_level, frames = _frame_by_prefix(tree, None, "shot", "run1", 2, "_")
+    by_name = {frame.name: frame for frame in frames}
+    assert list(by_name) == ["Frame_EP01", "Frame_EP01_SQ010", "Frame_EP01_SQ020"]
+    assert by_name["Frame_EP01_SQ010"].parent is by_name["Frame_EP01"]
+    assert all(is_tagged(frame, "shot", "run1") for frame in frames)
+    assert rls[1].parent is outputs[1].parent is by_name["Frame_EP01_SQ010"]
+    # A shared output goes with the first layer that feeds it
+    assert shared.parent is by_name["Frame_EP01_SQ010"]
+    assert top_level == [rls[3], outputs[3], by_name["Frame_EP01"]]
@@ -0,0 +1,23 @@
+import pytest
+
+from utils.output_estimator import OutputSpec, SlotSpec, estimate_outputs, format_seconds, write_seconds
+
+SPEC = OutputSpec(name="shot_Main_EXR16_", file_format='PNG', exr_codec='NONE', color_depth='8',
+                  slots=(SlotSpec("Image", 4, "Main"),), base_path="/renders/Main/")
+
+def test_write_time_divides_the_estimated_bytes_by_the_throughput():
+    estimate = estimate_outputs([SPEC], 1024, 1024, 10, throughput_mb=2.0)
+    seconds = estimate['bytes_per_frame'] / (2 * 1024 * 1024)
+    assert seconds > 0
+    assert estimate['write_seconds_per_frame'] == pytest.approx(seconds)
+    assert estimate['write_seconds_total'] == pytest.approx(10 * seconds)
+
+def test_write_time_is_skipped_without_a_throughput():
+    estimate = estimate_outputs([SPEC], 1024, 1024, 10)
+    assert estimate['write_seconds_per_frame'] is None
+    assert write_seconds(1024, 0.0) is None
+
+def test_format_seconds():
+    assert format_seconds(2.04) == "2.0 s"
+    assert format_seconds(200) == "3m 20s"
+    assert format_seconds(7500) == "2h 05m"
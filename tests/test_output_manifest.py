@@ -0,0 +1,104 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from utils.exr_header import COMPRESSION_NAMES, ExrError, TruncatedExr, parse_exr_header
+from utils.output_manifest import build_manifest, load_manifest, verify_manifest, write_manifest
+
+def attribute(name, kind, value):
+    return name.encode() + b"\0" + kind.encode() + b"\0" + struct.pack('<i', len(value)) + value
+
+def exr_bytes(channels=("Image.R", "Image.G", "Depth.V"), compression='ZIP', width=4, height=4, offsets=None):
+    """A single part scanline EXR with one chunk of 16 scanlines per ZIP block"""
+    chlist = b"".join(name.encode() + b"\0" + struct.pack('<iB3xii', 1, 0, 1, 1) for name in channels) + b"\0"
+    header = (struct.pack('<ii', 20000630, 2)
+              + attribute("channels", "chlist", chlist)
+              + attribute("compression", "compression", bytes([COMPRESSION_NAMES.index(compression)]))
+              + attribute("dataWindow", "box2i", struct.pack('<4i', 0, 0, width - 1, height - 1))
+              + b"\0")
+    chunks = (height + 15) // 16
+    table_end = len(header) + chunks * 8
+    data = b"\0" * 32
+    chunk = struct.pack('<ii', 0, len(data)) + data
+    if offsets is None:
+        offsets = [table_end + i * len(chunk) for i in range(chunks)]
+    return header + struct.pack(f'<{chunks}Q', *offsets) + chunk * chunks
+
+def spec(name, base_path, slots, file_format='OPEN_EXR_MULTILAYER', exr_codec='ZIP'):
+    return SimpleNamespace(name=name, base_path=base_path, file_format=file_format, exr_codec=exr_codec,
+                           color_depth='16', slots=[SimpleNamespace(path=path) for path in slots])
+
+def test_parse_header_reads_channels_compression_and_window():
+    header = parse_exr_header(exr_bytes(compression='PXR24', width=8, height=2))
+    assert header['channels'] == [("Image.R", 'HALF'), ("Image.G", 'HALF'), ("Depth.V", 'HALF')]
+    assert header['compression'] == 'PXR24'
+    assert header['data_window'] == (0, 0, 7, 1)
+
+def test_parse_header_rejects_truncated_and_foreign_files():
+    data = exr_bytes()
+    with pytest.raises(TruncatedExr, match="Last chunk"):
+        parse_exr_header(data[:-4])
+    with pytest.raises(TruncatedExr):
+        parse_exr_header(data[:40])
+    with pytest.raises(ExrError, match="magic"):
+        parse_exr_header(b"\x89PNG\r\n\x1a\n" + data[8:])
+
+def test_parse_header_rejects_a_bad_offset_table():
+    with pytest.raises(TruncatedExr, match="outside the file"):
+        parse_exr_header(exr_bytes(offsets=[1 << 40]))
+    # An offset back into the header is as wrong as one past the end
+    with pytest.raises(TruncatedExr, match="outside the file"):
+        parse_exr_header(exr_bytes(offsets=[8]))
+
+def test_manifest_paths_are_relative_to_the_output_root(tmp_path):
+    specs = [spec("Main", str(tmp_path / "Main" / "Main_"), ["Image", "Depth"]),
+             spec("Depth", str(tmp_path / "Main") + "/", ["Depth_"], file_format='OPEN_EXR')]
+    manifest = build_manifest(specs, [1, 2], output_root=str(tmp_path), resolution=(4, 4))
+    assert [item['path'] for item in manifest['files']] == [
+        "Main/Main_0001.exr", "Main/Main_0002.exr", "Main/Depth_0001.exr", "Main/Depth_0002.exr"]
+
+    path = str(tmp_path / "shot.manifest.json")
+    write_manifest(manifest, path)
+    assert load_manifest(path)['files'] == manifest['files']
+    write_manifest(dict(manifest, version=99), path)
+    with pytest.raises(ValueError):
+        load_manifest(path)
+
+def test_verify_sorts_files_into_missing_truncated_and_mis_encoded(tmp_path):
+    render_dir = tmp_path / "renders"
+    (render_dir / "Main").mkdir(parents=True)
+    specs = [spec("Main", str(tmp_path / "out" / "Main" / "Main_"), ["Image", "Depth"]),
+             spec("Preview", str(tmp_path / "out" / "Main") + "/", ["preview_"], file_format='PNG')]
+    manifest = build_manifest(specs, range(1, 8), output_root=str(tmp_path / "out"), resolution=(4, 4))
+    files = {
+        "Main_0001.exr": exr_bytes(),
+        "Main_0002.exr": exr_bytes()[:-4],
+        "Main_0003.exr": exr_bytes(offsets=[1 << 40]),
+        "Main_0004.exr": exr_bytes(compression='PIZ'),
+        "Main_0005.exr": exr_bytes(channels=("Image.R",)),
+        "Main_0006.exr": b"",
+        "Main_0007.exr": exr_bytes(width=8),
+    }
+    for frame in range(1, 8):
+        files[f"preview_{frame:04d}.png"] = b"\x89PNG\r\n\x1a\n" if frame != 7 else b"GIF89a"
+    del files["preview_0005.png"]
+    for name, data in files.items():
+        (render_dir / "Main" / name).write_bytes(data)
+
+    report = verify_manifest(manifest, str(render_dir), workers=4)
+    assert [item['path'] for item in report['missing']] == ["Main/preview_0005.png"]
+    assert sorted(item['frame'] for item in report['truncated']) == [2, 3, 6]
+    reasons = {item['path']: item['reason'] for item in report['mis_encoded']}
+    assert reasons["Main/Main_0004.exr"] == "compression PIZ, expected ZIP"
+    assert reasons["Main/Main_0005.exr"] == "missing layers Depth"
+    assert reasons["Main/Main_0007.exr"] == "data window 8x4, expected 4x4"
+    assert reasons["Main/preview_0007.png"] == "bad file header"
+    assert report['incomplete_frames'] == [2, 3, 4, 5, 6, 7]
+    assert report['ok'] == 6
+
+def test_verify_without_headers_only_checks_presence_and_size(tmp_path):
+    manifest = build_manifest([spec("Main", str(tmp_path / "Main_"), ["Image"])], [1, 2], output_root=str(tmp_path))
+    (tmp_path / "Main_0001.exr").write_bytes(b"not an exr")
+    report = verify_manifest(manifest, check_headers=False)
+    assert report['ok'] == 1 and report['incomplete_frames'] == [2]
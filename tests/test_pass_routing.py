@@ -0,0 +1,40 @@
+import pytest
+
+from utils.pass_routing import DEFAULT_RULES, OutputBucket, RoutingRule, compile_router
+
+BUCKETS = (OutputBucket('main'), OutputBucket('light'), OutputBucket('data', color_depth='32'))
+
+def router(*rules):
+    return compile_router(tuple(RoutingRule(*rule) for rule in rules), BUCKETS)
+
+def test_first_matching_rule_wins_and_unmatched_passes_go_to_the_first_bucket():
+    routed = router(('GLOB', 'Diff*', 'light'), ('REGEX', 'Depth|Normal', 'data'),
+                    ('PASS_TYPE', 'LIGHT, DATA', 'data'))
+    assert routed.route(('Image', 'DiffDir', 'Depth', 'GlossDir', 'UV')) == (
+        ('main', ('Image',)), ('light', ('DiffDir',)), ('data', ('Depth', 'GlossDir', 'UV')))
+
+def test_group_names_repeated_across_rules_fall_back_to_one_pattern_per_rule():
+    routed = router(('REGEX', '(?P<x>Diff.*)', 'light'), ('REGEX', '(?P<x>Gloss.*)', 'data'))
+    assert routed.bucket_for('DiffCol') == 'light'
+    assert routed.bucket_for('GlossCol') == 'data'
+    assert routed.bucket_for('Image') == 'main'
+
+def test_numbered_backreferences_keep_their_meaning():
+    routed = router(('GLOB', 'Emit', 'light'), ('REGEX', r'(A)(O)\2?', 'data'))
+    assert routed.bucket_for('AOO') == 'data'
+    assert routed.bucket_for('AO') == 'data'
+    assert routed.bucket_for('AOA') == 'main'
+    assert routed.bucket_for('Emit') == 'light'
+
+def test_invalid_regex_raises_value_error():
+    with pytest.raises(ValueError, match="Invalid routing regex"):
+        router(('REGEX', 'Diff(', 'light'))
+
+def test_unknown_bucket_raises_value_error():
+    with pytest.raises(ValueError, match="unknown bucket 'lights'"):
+        router(('GLOB', 'Diff*', 'lights'))
+
+def test_default_rules_reproduce_the_main_secondary_split():
+    routed = compile_router(DEFAULT_RULES, (OutputBucket('main'), OutputBucket('secondary')))
+    assert routed.route(('Image', 'Depth', 'CryptoObject00', 'DiffDir')) == (
+        ('main', ('Image', 'DiffDir')), ('secondary', ('Depth', 'CryptoObject00')))
@@ -0,0 +1,126 @@
+from fakes import Node, Tree
+from utils.connection_planner import LayerSnapshot, SettingsSnapshot, plan_connections
+from utils.ownership import RUN_PROP, is_tagged
+from utils.plan_applier import (
+    apply_plan,
+    incoming_links,
+    link_file_slots,
+    new_apply_stats,
+    size_file_slots,
+    sync_output_slots,
+)
+
+LAYERS = (
+    LayerSnapshot("Main", ("Image", "Alpha", "Depth")),
+    LayerSnapshot("BG", ("Image", "Alpha")),
+)
+
+def layer_tree(layers=LAYERS):
+    """A tree holding the Render Layers node of every layer, as the planner names them"""
+    return Tree([Node(f"ViewLayer_{layer.name}", 'R_LAYERS', layer=layer.name, outputs=layer.passes)
+                 for layer in layers])
+
+def plan(layers=LAYERS, **settings):
+    return plan_connections(layers, SettingsSnapshot(**settings), "shot", cache=None)
+
+def test_unchanged_second_reconcile_touches_nothing():
+    tree = layer_tree()
+    first = apply_plan(tree, plan(), 'RECONCILE', run_id="run1")
+    assert first['created'] == 3 and first['links'] == 5
+    nodes, links = list(tree.nodes), [(link.from_socket, link.to_socket) for link in tree.links]
+
+    second = apply_plan(tree, plan(), 'RECONCILE', run_id="run2")
+    assert second == {'created': 0, 'updated': 0, 'removed': 0, 'slots': 0, 'links': 0}
+    assert list(tree.nodes) == nodes
+    assert [(link.from_socket, link.to_socket) for link in tree.links] == links
+    # Untouched nodes keep the run that last changed them
+    assert all(node[RUN_PROP] == "run1" for node in tree.nodes if RUN_PROP in node)
+
+def test_reconcile_only_updates_what_changed_and_keeps_locations():
+    tree = layer_tree()
+    apply_plan(tree, plan(), 'RECONCILE', run_id="run1")
+    output = tree.nodes.get("shot_Main_EXR16_")
+    output.location = (123, 456)
+
+    stats = apply_plan(tree, plan(main_exr_codec='DWAA'), 'RECONCILE', run_id="run2")
+    assert (stats['created'], stats['updated'], stats['removed']) == (0, 2, 0)
+    assert output.format.exr_codec == 'DWAA'
+    assert output.location == (123, 456)
+    assert output[RUN_PROP] == "run2"
+    assert tree.nodes.get("shot_Main_EXR32_")[RUN_PROP] == "run1"
+
+def test_reconcile_removes_nodes_of_dropped_layers_only():
+    tree = layer_tree()
+    apply_plan(tree, plan(), 'RECONCILE')
+    hand_made = Node("Preview", 'OUTPUT_FILE', slots=["Image"])
+    tree.nodes.append(hand_made)
+
+    stats = apply_plan(tree, plan(LAYERS[:1]), 'RECONCILE')
+    assert stats['removed'] == 2
+    assert tree.nodes.get("ViewLayer_BG") is None and tree.nodes.get("shot_BG_EXR16_") is None
+    assert tree.nodes.get("Preview") is hand_made
+    assert not any(link.from_node.name == "ViewLayer_BG" for link in tree.links)
+
+def test_reconcile_resizes_slots_in_place():
+    tree = layer_tree()
+    apply_plan(tree, plan(), 'RECONCILE')
+    output = tree.nodes.get("shot_Main_EXR16_")
+
+    stats = apply_plan(tree, plan(use_secondary_output=False), 'RECONCILE')
+    assert [slot.path for slot in output.file_slots] == ["Image", "Alpha", "Depth"]
+    assert [link.from_socket.name for link in tree.links if link.to_node is output] == ["Image", "Alpha", "Depth"]
+    assert stats['removed'] == 1 and tree.nodes.get("shot_Main_EXR32_") is None
+
+def test_rebuild_creates_and_tags_every_node():
+    tree = Tree()
+    stats = apply_plan(tree, plan(), 'REBUILD', run_id="run1")
+    assert stats['created'] == 5
+    assert all(is_tagged(node, "shot", "run1") for node in tree.nodes)
+
+def slot_paths(node):
+    return [slot.path for slot in node.file_slots]
+
+def test_size_file_slots_renames_in_place_and_only_creates_the_rest():
+    output = Node("Out", 'OUTPUT_FILE', slots=["Image", "Alpha", "Depth"])
+    first_input = output.inputs[0]
+    stats = new_apply_stats()
+
+    assert size_file_slots(output, ["Image", "Normal"], stats) == 2
+    assert slot_paths(output) == ["Image", "Normal"] and len(output.inputs) == 2
+    # Existing slots are reused, not recreated
+    assert output.inputs[0] is first_input
+    assert size_file_slots(output, ["Image", "Normal", "Mist", "AO"], stats) == 2
+    assert slot_paths(output) == ["Image", "Normal", "Mist", "AO"]
+    assert size_file_slots(output, ["Image", "Normal", "Mist", "AO"], stats) == 0
+    assert stats['slots'] == 4
+
+def test_size_file_slots_keeps_one_slot():
+    output = Node("Out", 'OUTPUT_FILE', slots=["Image", "Alpha"])
+    assert size_file_slots(output, []) == 1
+    assert slot_paths(output) == ["Image"]
+
+def test_link_file_slots_skips_inputs_already_fed_by_the_right_socket():
+    rl = Node("RL", 'R_LAYERS', outputs=["Image", "Alpha", "Depth"])
+    output = Node("Out", 'OUTPUT_FILE', slots=["Image", "Alpha", "Depth"])
+    tree = Tree([rl, output])
+    tree.link(rl, 0, output, 0)
+    tree.link(rl, 0, output, 1)
+    stats = new_apply_stats()
+
+    assert link_file_slots(tree, output, rl.outputs, incoming_links(tree), stats) == 2
+    assert [(link.from_socket.name, link.to_socket.name) for link in tree.links] == [
+        ("Image", "Image"), ("Alpha", "Alpha"), ("Depth", "Depth")]
+    assert link_file_slots(tree, output, rl.outputs, incoming_links(tree), stats) == 0
+    assert stats['links'] == 2
+
+def test_sync_output_slots_reports_whether_anything_changed():
+    rl = Node("RL", 'R_LAYERS', outputs=["Image", "Alpha"])
+    output = Node("Out", 'OUTPUT_FILE', slots=["Image"])
+    tree = Tree([rl, output])
+    sources = [("Image", rl.outputs[0]), ("Alpha", rl.outputs[1])]
+    stats = new_apply_stats()
+
+    assert sync_output_slots(tree, output, sources, stats)
+    assert slot_paths(output) == ["Image", "Alpha"] and len(tree.links) == 2
+    assert not sync_output_slots(tree, output, sources, stats)
+    assert (stats['slots'], stats['links']) == (1, 2)
@@ -0,0 +1,41 @@
+from utils.prefix_trie import build_trie, compress, pack_grid, split_tokens
+
+NAMES = ["EP01_SQ010_SH0010", "EP01_SQ010_SH0020", "EP01_SQ020_SH0010", "EP02_SQ010_SH0010", "BG"]
+
+def trie(names=NAMES, depth=2, min_size=1):
+    return compress(build_trie(((name, name) for name in names), depth=depth), min_size)
+
+def layout(group):
+    """(label, items, children) of a group and its subgroups"""
+    return (group.label, group.items, [layout(child) for child in group.children.values()])
+
+def test_split_tokens_on_any_separator():
+    assert split_tokens("EP01-SQ010.SH 0010__v2") == ["EP01", "SQ010", "SH", "0010", "v2"]
+    assert split_tokens("Main", "") == ["Main"]
+    assert split_tokens("__", "_") == ["__"]
+
+def test_groups_nest_up_to_depth_and_last_tokens_stay_items():
+    assert layout(trie()) == ("", ["BG"], [
+        ("EP01", [], [
+            ("EP01_SQ010", ["EP01_SQ010_SH0010", "EP01_SQ010_SH0020"], []),
+            ("EP01_SQ020", ["EP01_SQ020_SH0010"], []),
+        ]),
+        ("EP02_SQ010", ["EP02_SQ010_SH0010"], []),
+    ])
+    assert [child.label for child in trie(depth=1).children.values()] == ["EP01", "EP02"]
+
+def test_small_groups_fold_into_their_parent():
+    root = trie(min_size=2)
+    assert sorted(root.items) == ["BG", "EP02_SQ010_SH0010"]
+    (episode,) = root.children.values()
+    assert layout(episode) == ("EP01", ["EP01_SQ020_SH0010"], [
+        ("EP01_SQ010", ["EP01_SQ010_SH0010", "EP01_SQ010_SH0020"], [])])
+    assert episode.count() == 3
+
+def test_pack_grid_fills_the_shortest_column():
+    sizes = [(100, 300), (200, 100), (150, 100), (100, 50)]
+    assert pack_grid(sizes, columns=2, gap=10) == [(0.0, 0.0), (110.0, 0.0), (110.0, 110.0), (110.0, 220.0)]
+    # About sqrt(n) columns by default, never more than boxes
+    assert len({x for x, _ in pack_grid([(10, 10)] * 9)}) == 3
+    assert pack_grid([(10, 10)], columns=4) == [(0.0, 0.0)]
+    assert pack_grid([]) == []
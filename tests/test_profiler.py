@@ -0,0 +1,57 @@
+import json
+import logging
+
+from utils.profiler import NULL_PROFILER, Profiler, format_ns
+
+def test_phases_accumulate_time_and_calls():
+    profiler = Profiler("connect")
+    for _ in range(3):
+        with profiler.phase('links'):
+            pass
+    profiler.add('links', 1_000_000)
+    profiler.add('nodes', 5_000_000, calls=2)
+    ns, calls = profiler.phases['links']
+    assert calls == 4 and ns >= 1_000_000
+    assert profiler.phases['nodes'] == [5_000_000, 2]
+
+def test_phases_are_ordered_by_when_they_run():
+    profiler = Profiler("connect")
+    for name in ('zz_custom', 'arranging', 'nodes', 'classify', 'aa_custom'):
+        profiler.add(name, 1)
+    assert profiler.ordered_phases() == ['classify', 'nodes', 'arranging', 'aa_custom', 'zz_custom']
+
+def test_disabled_profiler_records_nothing():
+    with NULL_PROFILER as profiler:
+        with profiler.phase('nodes'):
+            pass
+        profiler.count(nodes=3)
+    assert NULL_PROFILER.phases == {} and NULL_PROFILER.counts == {}
+
+def test_json_holds_phase_totals_and_counts(tmp_path, caplog):
+    path = str(tmp_path / "profiles" / "connect.json")
+    with caplog.at_level(logging.INFO, logger="auto_node_outputs"):
+        with Profiler("connect", json_path=path) as profiler:
+            profiler.add('nodes', 2_500_000)
+            profiler.add('links', 500_000, calls=3)
+            profiler.count(created=4, links=3)
+            profiler.count(created=1)
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['operator'] == "connect"
+    assert data['phases'] == {'nodes': {'ms': 2.5, 'calls': 1}, 'links': {'ms': 0.5, 'calls': 3}}
+    assert list(data['phases']) == ['nodes', 'links']
+    assert data['counts'] == {'created': 5, 'links': 3}
+    assert data['total_ms'] > 0 and data['json'] == path and data['cprofile'] is None
+    assert any(record.getMessage().startswith("connect ") for record in caplog.records)
+
+def test_cprofile_capture_is_written(tmp_path):
+    path = str(tmp_path / "connect.prof")
+    with Profiler("connect", capture_path=path):
+        sum(range(1000))
+    assert (tmp_path / "connect.prof").stat().st_size > 0
+
+def test_format_ns_picks_a_unit():
+    assert format_ns(1_500_000_000) == "1.50 s"
+    assert format_ns(2_340_000) == "2.3 ms"
+    assert format_ns(12_000) == "12 us"
@@ -0,0 +1,65 @@
+import json
+import stat
+import sys
+
+from cli import render_orchestrator
+from cli.process_pool import RESULT_MARKER
+from cli.render_orchestrator import layer_weight, plan_jobs
+
+def layer(name, unit=None, gp=False):
+    return {'name': name, 'cleaned': name.replace(".gp.vl", ""), 'gp': gp, 'unit': unit or name}
+
+LAYERS = [
+    layer("FG"),
+    layer("Ink.gp.vl", unit="gp", gp=True),
+    layer("Lines.gp.vl", unit="gp", gp=True),
+    layer("BG"),
+]
+
+def test_gp_layers_are_light_unless_weighted():
+    assert layer_weight(LAYERS[1], {}) == render_orchestrator.GP_LAYER_WEIGHT
+    assert layer_weight(LAYERS[0], {}) == 1.0
+    assert layer_weight(LAYERS[1], {"Ink.gp.vl": 3}) == 3.0
+
+def test_layers_of_a_unit_share_a_job_and_heavy_jobs_come_first():
+    jobs = plan_jobs(LAYERS, weights={"BG": 4})
+    assert [job['layers'] for job in jobs] == [["BG"], ["FG"], ["Ink.gp.vl", "Lines.gp.vl"]]
+    assert [job['weight'] for job in jobs] == [4.0, 1.0, 0.5]
+    assert jobs[2]['label'] == "Ink,Lines"
+
+def test_layers_per_job_packs_units():
+    jobs = plan_jobs(LAYERS, layers_per_job=2)
+    assert sorted(len(job['layers']) for job in jobs) == [2, 2]
+    assert all({"Ink.gp.vl", "Lines.gp.vl"} <= set(job['layers']) or
+               not {"Ink.gp.vl", "Lines.gp.vl"} & set(job['layers']) for job in jobs)
+    assert plan_jobs([]) == []
+
+FAKE_BLENDER = f"""#!{sys.executable}
+import json, sys
+script = sys.argv[sys.argv.index("--python") + 1]
+args = sys.argv[sys.argv.index("--") + 1:]
+if script.endswith("inspect_layers.py"):
+    result = {{'layers': json.loads({json.dumps(LAYERS)!r})}}
+else:
+    layers = json.loads(args[args.index("--layers") + 1])
+    if "BG" in layers:
+        sys.exit(1)
+    result = {{'layers': layers, 'frames': [1, 2], 'threads': sys.argv[sys.argv.index("-t") + 1]}}
+print({RESULT_MARKER!r} + json.dumps(result))
+"""
+
+def test_orchestrator_runs_one_worker_per_job(tmp_path):
+    blender = tmp_path / "blender"
+    blender.write_text(FAKE_BLENDER)
+    blender.chmod(blender.stat().st_mode | stat.S_IEXEC)
+    summary_path = tmp_path / "summary.json"
+
+    code = render_orchestrator.main([str(tmp_path / "shot.blend"), "--blender", str(blender), "--workers", "2",
+                                     "--threads", "3", "--main-output", str(tmp_path / "main"),
+                                     "--summary", str(summary_path)])
+    assert code == 1
+    summary = json.loads(summary_path.read_text())
+    assert (summary['jobs'], summary['threads'], summary['failed']) == (3, 3, ["BG"])
+    worked = {tuple(r['result']['layers']) for r in summary['results'] if r['ok']}
+    assert worked == {("FG",), ("Ink.gp.vl", "Lines.gp.vl")}
+    assert all(r['result']['threads'] == "3" for r in summary['results'] if r['ok'])
@@ -0,0 +1,53 @@
+import os
+import types
+
+from fakes import Node, Tree
+from utils import render_stats
+from utils.output_estimator import specs_from_tree
+
+def output_tree(root):
+    rl = Node("RL_Main", 'R_LAYERS', layer="Main", outputs=["Image", "Depth"])
+    main = Node("Main", 'OUTPUT_FILE', base_path=os.path.join(root, "Main_"), slots=["Image", "Depth"])
+    tree = Tree([rl, main])
+    tree.link(rl, 0, main, 0)
+    tree.link(rl, 1, main, 1)
+    return tree
+
+def write(path, data, mtime):
+    with open(path, 'wb') as f:
+        f.write(data)
+    os.utime(path, (mtime, mtime))
+
+def test_stat_outputs_reports_the_last_write(tmp_path):
+    specs = specs_from_tree(output_tree(str(tmp_path)))
+    write(str(tmp_path / "Main_0001.exr"), b"x" * 10, 1000.0)
+    per_node, total_bytes, total_files, total_missing = render_stats.stat_outputs(specs, 1, "")
+    assert per_node["Main"] == {'bytes': 10, 'files': 1, 'missing': 0, 'mtime': 1000.0}
+    assert (total_bytes, total_files, total_missing) == (10, 1, 0)
+
+    per_node = render_stats.stat_outputs(specs, 2, "")[0]
+    assert per_node["Main"]['missing'] == 1 and per_node["Main"]['mtime'] is None
+
+def test_output_write_seconds_counts_from_compositing_start():
+    per_node = {'Main': {'mtime': 1003.5}, 'Main_Depth': {'mtime': 1001.0}, 'Missing': {'mtime': None}}
+    assert render_stats.output_write_seconds(per_node, 1000.0) == 3.5
+    # Files left over from an earlier render were not written by this frame
+    assert render_stats.output_write_seconds(per_node, 1005.0) is None
+    assert render_stats.output_write_seconds({'Missing': {'mtime': None}}, 1000.0) is None
+
+def test_frame_record_separates_output_writes_from_the_image_save(tmp_path, monkeypatch):
+    specs = specs_from_tree(output_tree(str(tmp_path)))
+    write(str(tmp_path / "Main_0001.exr"), b"x", 1002.0)
+    monkeypatch.setattr(render_stats, "_state", dict(specs=specs, blend_dir="", log_path=str(tmp_path / "log.jsonl"),
+                                                    use_extension=True))
+    monkeypatch.setattr(render_stats, "_timers", {'pre': 0.0, 'composite_started': 1000.0, 'post': 0.0})
+    monkeypatch.setattr(render_stats, "RECENT", render_stats.deque(maxlen=10))
+    scene = types.SimpleNamespace(frame_current=1, name="Scene",
+                                  viewlayer_connector_settings=types.SimpleNamespace(io_log_format='JSONL'))
+
+    render_stats._on_render_write(scene)
+    record = render_stats.RECENT[-1]
+    assert record['output_write_seconds'] == 2.0
+    assert record['image_save_seconds'] >= 0.0
+    assert 'write_seconds' not in record
+    assert render_stats.summary()['output_write_seconds'] == 2.0
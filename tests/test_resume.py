@@ -0,0 +1,88 @@
+import os
+from types import SimpleNamespace
+
+import bpy
+from fakes import Node, Tree
+from utils import resume
+from utils.ownership import tag
+from utils.staging import FINAL_PATH_PROP
+
+def resume_scene(tmp_path, monkeypatch, check='EXISTS', min_size=1):
+    monkeypatch.setattr(bpy.data, "filepath", str(tmp_path / "shot.blend"))
+    monkeypatch.setattr(resume, "_state", dict(resume._state))
+    rl = Node("ViewLayer_Main", 'R_LAYERS', layer="Main", outputs=["Image", "Depth"])
+    main = Node("shot_Main_EXR16_", 'OUTPUT_FILE', base_path=str(tmp_path / "out" / "Main_"), slots=["Image"])
+    depth = Node("shot_Main_EXR32_", 'OUTPUT_FILE', base_path=str(tmp_path / "out" / "Depth_"), slots=["Depth"])
+    depth.mute = True
+    preview = Node("Preview", 'OUTPUT_FILE', base_path=str(tmp_path / "preview_"), slots=["Image"])
+    for node in (rl, main, depth):
+        tag(node, "shot")
+    tree = Tree([rl, main, depth, preview])
+    tree.link(rl, 0, main, 0)
+    tree.link(rl, 1, depth, 0)
+    tree.link(rl, 0, preview, 0)
+    settings = SimpleNamespace(custom_output_path=str(tmp_path / "out"), use_resume=True,
+                               resume_check=check, resume_min_size=min_size)
+    return SimpleNamespace(node_tree=tree, viewlayer_connector_settings=settings,
+                           frame_start=1, frame_end=6, frame_step=1, frame_current=1,
+                           render=SimpleNamespace(use_file_extension=True))
+
+def write_frame(tmp_path, frame, data=b"\x76\x2f\x31\x01exr", passes=("Main", "Depth")):
+    os.makedirs(tmp_path / "out", exist_ok=True)
+    for name in passes:
+        (tmp_path / "out" / f"{name}_{frame:04d}.exr").write_bytes(data)
+
+def test_missing_runs_group_frames_still_to_render(tmp_path, monkeypatch):
+    scene = resume_scene(tmp_path, monkeypatch)
+    for frame in (1, 2, 5):
+        write_frame(tmp_path, frame)
+    write_frame(tmp_path, 3, passes=("Main",))
+    write_frame(tmp_path, 4, data=b"")
+    assert resume.missing_runs(scene) == ([(3, 4), (6, 6)], 3)
+
+def test_header_check_rejects_files_that_are_not_exr(tmp_path, monkeypatch):
+    scene = resume_scene(tmp_path, monkeypatch, check='HEADER')
+    write_frame(tmp_path, 1)
+    write_frame(tmp_path, 2, data=b"not an exr")
+    runs, done = resume.missing_runs(scene)
+    assert done == 1 and runs[0] == (2, 6)
+
+def test_staged_nodes_are_checked_at_their_final_path(tmp_path, monkeypatch):
+    scene = resume_scene(tmp_path, monkeypatch)
+    main = scene.node_tree.nodes.get("shot_Main_EXR16_")
+    main[FINAL_PATH_PROP] = main.base_path
+    main.base_path = str(tmp_path / "scratch" / "Main_")
+    nodes, specs = resume.owned_specs(scene)
+    assert [node.name for node in nodes] == ["shot_Main_EXR16_", "shot_Main_EXR32_"]
+    assert {spec.name: spec.base_path for spec in specs}["shot_Main_EXR16_"] == str(tmp_path / "out" / "Main_")
+
+def test_written_frames_mute_outputs_and_render_end_restores_them(tmp_path, monkeypatch):
+    scene = resume_scene(tmp_path, monkeypatch)
+    write_frame(tmp_path, 1)
+    nodes = scene.node_tree.nodes
+    resume._on_render_init(scene)
+
+    resume._on_frame_change_pre(scene)
+    assert nodes.get("shot_Main_EXR16_").mute and nodes.get("shot_Main_EXR32_").mute
+    assert not nodes.get("Preview").mute
+
+    scene.frame_current = 2
+    resume._on_frame_change_pre(scene)
+    assert not nodes.get("shot_Main_EXR16_").mute
+    # A node muted by hand stays muted on frames that need rendering
+    assert nodes.get("shot_Main_EXR32_").mute
+    assert resume._state['muted_frames'] == 1
+
+    scene.frame_current = 1
+    resume._on_frame_change_pre(scene)
+    resume._on_render_done(scene)
+    assert not nodes.get("shot_Main_EXR16_").mute and nodes.get("shot_Main_EXR32_").mute
+    assert not resume._state['active']
+
+def test_handlers_do_nothing_without_resume(tmp_path, monkeypatch):
+    scene = resume_scene(tmp_path, monkeypatch)
+    scene.viewlayer_connector_settings.use_resume = False
+    write_frame(tmp_path, 1)
+    resume._on_render_init(scene)
+    resume._on_frame_change_pre(scene)
+    assert not scene.node_tree.nodes.get("shot_Main_EXR16_").mute
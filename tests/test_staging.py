@@ -0,0 +1,191 @@
+import os
+import threading
+import types
+
+import pytest
+
+from fakes import Node, Tree
+from utils import staging, transfer_queue
+from utils.transfer_queue import PART_SUFFIX, TransferQueue, file_digest
+
+class RecordingQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, source, destination):
+        self.submitted.append((source, destination))
+
+def staged_tree(final_root):
+    rl = Node("RL_Main", 'R_LAYERS', layer="Main", outputs=["Image", "Depth"])
+    multilayer = Node("Main", 'OUTPUT_FILE', base_path=os.path.join(final_root, "Main", "Main_"),
+                      slots=["Image"])
+    single = Node("Main_Depth", 'OUTPUT_FILE', base_path=os.path.join(final_root, "Main") + os.sep,
+                  slots=["Depth_"], file_format='OPEN_EXR')
+    elsewhere = Node("Preview", 'OUTPUT_FILE', base_path="/elsewhere/preview_", slots=["Image"])
+    tree = Tree([rl, multilayer, single, elsewhere])
+    tree.link(rl, 0, multilayer, 0)
+    tree.link(rl, 1, single, 0)
+    tree.link(rl, 0, elsewhere, 0)
+    return tree
+
+def start_staging(tree, final_root, scratch_root, monkeypatch, queue=None):
+    outputs = [node for node in tree.nodes if node.type == 'OUTPUT_FILE']
+    names = staging.redirect_paths(tree, outputs, final_root, scratch_root, "")
+    queue = queue or RecordingQueue()
+    monkeypatch.setattr(staging, "_state", dict(
+        queue=queue, specs=staging.staged_specs(tree, names), queued=set(), rendered=set(), last=None,
+        final_root=final_root, scratch_root=scratch_root, blend_dir="", use_extension=True,
+    ))
+    return queue
+
+def touch(path, data=b""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def test_redirect_only_touches_nodes_inside_final_root(tmp_path):
+    final_root, scratch_root = str(tmp_path / "final"), str(tmp_path / "scratch")
+    tree = staged_tree(final_root)
+    names = staging.redirect_paths(tree, tree.nodes[1:], final_root, scratch_root, "")
+    assert names == ["Main", "Main_Depth"]
+    assert tree.nodes.get("Main").base_path == os.path.join(scratch_root, "Main", "Main_")
+    assert tree.nodes.get("Main_Depth").base_path == os.path.join(scratch_root, "Main") + os.sep
+    assert tree.nodes.get("Preview").base_path == "/elsewhere/preview_"
+
+    staging.restore_paths(tree)
+    assert tree.nodes.get("Main").base_path == os.path.join(final_root, "Main", "Main_")
+    assert staging.FINAL_PATH_PROP not in tree.nodes.get("Main")
+
+def test_queue_frame_submits_staged_files(tmp_path, monkeypatch):
+    final_root, scratch_root = str(tmp_path / "final"), str(tmp_path / "scratch")
+    tree = staged_tree(final_root)
+    queue = start_staging(tree, final_root, scratch_root, monkeypatch)
+    touch(os.path.join(scratch_root, "Main", "Main_0001.exr"))
+    touch(os.path.join(scratch_root, "Main", "Depth_0001.exr"))
+
+    staging.queue_frame(None, 1)
+    assert sorted(queue.submitted) == [
+        (os.path.join(scratch_root, "Main", "Depth_0001.exr"), os.path.join(final_root, "Main", "Depth_0001.exr")),
+        (os.path.join(scratch_root, "Main", "Main_0001.exr"), os.path.join(final_root, "Main", "Main_0001.exr")),
+    ]
+
+def test_queue_frame_runs_once_per_frame_and_skips_missing_files(tmp_path, monkeypatch):
+    final_root, scratch_root = str(tmp_path / "final"), str(tmp_path / "scratch")
+    tree = staged_tree(final_root)
+    queue = start_staging(tree, final_root, scratch_root, monkeypatch)
+    touch(os.path.join(scratch_root, "Main", "Main_0002.exr"))
+
+    staging.queue_frame(None, 2)
+    staging.queue_frame(None, 2)
+    staging.queue_frame(None, 3)
+    assert queue.submitted == [
+        (os.path.join(scratch_root, "Main", "Main_0002.exr"), os.path.join(final_root, "Main", "Main_0002.exr")),
+    ]
+
+def scratch_file(tmp_path, name="Main_0001.exr", data=b"exr" * 1000):
+    source = str(tmp_path / "scratch" / "Main" / name)
+    touch(source, data)
+    return source, str(tmp_path / "final" / "Main" / name)
+
+@pytest.mark.parametrize("move", [True, False])
+def test_transfer_is_checksum_verified_and_moves_or_copies(tmp_path, move):
+    source, destination = scratch_file(tmp_path)
+    transfers = TransferQueue(workers=1, move=move)
+    transfers.submit(source, destination)
+    transfers.close()
+
+    result = transfers.summary()
+    assert result['transferred'] == 1 and result['failed'] == []
+    assert transfers.done[0]['blake2b'] == file_digest(destination)
+    with open(destination, 'rb') as f:
+        assert f.read() == b"exr" * 1000
+    assert os.path.exists(source) is not move
+    assert not os.path.exists(destination + PART_SUFFIX)
+
+def test_checksum_mismatch_fails_and_keeps_the_source(tmp_path, monkeypatch):
+    source, destination = scratch_file(tmp_path)
+    monkeypatch.setattr(transfer_queue, "file_digest", lambda path: "0" * 128)
+    transfers = TransferQueue(workers=1, move=True)
+    transfers.submit(source, destination)
+    transfers.close()
+
+    failed = transfers.summary()['failed']
+    assert [f['source'] for f in failed] == [source]
+    assert "Checksum mismatch" in failed[0]['error']
+    assert os.path.exists(source)
+    assert not os.path.exists(destination)
+    assert not os.path.exists(destination + PART_SUFFIX)
+
+def test_failed_write_leaves_no_part_file(tmp_path, monkeypatch):
+    source, destination = scratch_file(tmp_path)
+
+    def full_disk(fd):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(transfer_queue.os, "fsync", full_disk)
+    transfers = TransferQueue(workers=1, move=True)
+    transfers.submit(source, destination)
+    transfers.close()
+
+    assert transfers.summary()['transferred'] == 0
+    assert len(transfers.failed) == 1
+    assert os.listdir(os.path.dirname(destination)) == []
+    assert os.path.exists(source)
+
+def test_full_queue_blocks_the_producer(tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_transfer(source, destination, move, verify):
+        started.set()
+        release.wait(5)
+        return 0, ""
+    monkeypatch.setattr(transfer_queue, "transfer_file", slow_transfer)
+    transfers = TransferQueue(workers=1, max_pending=1)
+    transfers.submit("a", "A")
+    assert started.wait(5)
+    # The worker is busy and the one pending slot fills up
+    transfers.submit("b", "B")
+    producer = threading.Thread(target=transfers.submit, args=("c", "C"))
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()
+
+    release.set()
+    producer.join(5)
+    assert not producer.is_alive()
+    transfers.close()
+    assert transfers.summary()['transferred'] == 3
+    assert transfers.blocked_seconds >= 0.2
+
+def test_render_complete_drains_the_queue_and_restores_paths(tmp_path, monkeypatch):
+    final_root, scratch_root = str(tmp_path / "final"), str(tmp_path / "scratch")
+    tree = staged_tree(final_root)
+    start_staging(tree, final_root, scratch_root, monkeypatch, queue=TransferQueue(workers=2, move=True))
+    for frame in (1, 2):
+        touch(os.path.join(scratch_root, "Main", f"Main_000{frame}.exr"), b"main")
+        touch(os.path.join(scratch_root, "Main", f"Depth_000{frame}.exr"), b"depth")
+    # Frame 1 was queued on render_write, frame 2 rendered without a main output write
+    staging.queue_frame(None, 1)
+    staging._state['rendered'].update({1, 2})
+
+    staging._on_render_done(types.SimpleNamespace(node_tree=tree))
+    assert staging._state['queue'] is None
+    assert staging.status()['transferred'] == 4
+    assert sorted(os.listdir(os.path.join(final_root, "Main"))) == [
+        "Depth_0001.exr", "Depth_0002.exr", "Main_0001.exr", "Main_0002.exr"]
+    assert os.listdir(os.path.join(scratch_root, "Main")) == []
+    assert tree.nodes.get("Main").base_path == os.path.join(final_root, "Main", "Main_")
+
+def test_render_init_redirects_before_other_handlers():
+    import bpy
+    from utils import render_stats, resume
+    handlers = bpy.app.handlers
+    for module in (render_stats, resume, staging):
+        module.register()
+    try:
+        assert handlers.render_init[0] is staging._on_render_init
+        # Stats are taken before the frame's files are queued for transfer
+        assert handlers.render_write.index(render_stats._on_render_write) < \
+            handlers.render_write.index(staging._on_render_write)
+    finally:
+        for module in (staging, resume, render_stats):
+            module.unregister()
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import bpy
+from fakes import Node, Tree
+from utils import tree_index
+
+class NodeTree(Tree, bpy.types.NodeTree):
+    def __init__(self, pointer, nodes=()):
+        super().__init__(nodes)
+        self.pointer = pointer
+        self.original = self
+
+    def as_pointer(self):
+        return self.pointer
+
+def depsgraph(*ids):
+    return SimpleNamespace(updates=[SimpleNamespace(id=updated) for updated in ids])
+
+def test_node_tree_update_only_invalidates_that_tree():
+    tree_index.clear()
+    edited = NodeTree(1, [Node("RL_A", 'R_LAYERS', layer="A")])
+    other = NodeTree(2, [Node("RL_B", 'R_LAYERS', layer="B")])
+    other_index = tree_index.get_tree_index(other)
+    tree_index.get_tree_index(edited)
+    edited_generation, other_generation = tree_index.generation(edited), tree_index.generation(other)
+
+    edited.nodes.append(Node("RL_C", 'R_LAYERS', layer="C"))
+    tree_index._on_depsgraph_update(None, depsgraph(edited))
+
+    assert tree_index.generation(edited) != edited_generation
+    assert tree_index.generation(other) == other_generation
+    assert tree_index.get_tree_index(edited).rl_node("C") is not None
+    assert tree_index.get_tree_index(other) is other_index
+
+def test_scene_update_keeps_every_index():
+    tree_index.clear()
+    tree = NodeTree(3)
+    index = tree_index.get_tree_index(tree)
+    generation = tree_index.generation(tree)
+
+    tree_index._on_depsgraph_update(None, depsgraph(bpy.types.Scene()))
+
+    assert tree_index.generation(tree) == generation
+    assert tree_index.get_tree_index(tree) is index